@@ -0,0 +1,323 @@
+import hashlib
+import os
+import shutil
+import tempfile
+import threading
+import time
+import uuid
+from typing import Any, Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+from app.core.config import settings
+from app.models.user import User
+
+# Part of every artifact digest; bump it when the layout of generated
+# reports changes, so files rendered by older code are no longer served
+ARTIFACT_FORMAT_VERSION = 1
+
+# Concurrent misses on keys sharing a stripe render one at a time
+LOCK_STRIPES = 64
+
+
+class Artifact(NamedTuple):
+    """
+    A generated file ready to be sent.
+    """
+
+    path: str
+    # Served from the cache instead of being generated
+    hit: bool
+    # Not kept by the cache; the caller removes it once sent
+    temporary: bool
+
+
+class ArtifactCache:
+    """
+    Size-bounded LRU cache of generated report files on local disk.
+
+    Files are named after a digest of the request that produced them,
+    "u<user_id>-<sha256>.<kind>", where the digest covers the user's data
+    version, the kind of report and its parameters. Identical requests
+    find the same file, and a write that bumps the data version makes all
+    of a user's older files unreachable.
+
+    The directory itself is the index, so every worker sharing it sees the
+    files the others wrote: lookups check the file exists and touch its
+    mtime, and each store scans the directory and removes the least
+    recently used files past max_bytes. The hit/miss counters are per
+    process. A max_bytes of 0 disables the cache: files are generated to
+    temporary paths on every request.
+    """
+
+    def __init__(self, directory: str, max_bytes: int) -> None:
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._stripes = [threading.Lock() for _ in range(LOCK_STRIPES)]
+        self._reset_counters()
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_bytes > 0
+
+    @staticmethod
+    def make_key(user_id: int, data_version: int, kind: str, params: Tuple[Any, ...]) -> str:
+        """
+        Build the file name of an artifact; kind doubles as its extension.
+        """
+        digest = hashlib.sha256(
+            repr((ARTIFACT_FORMAT_VERSION, data_version, kind, params)).encode("utf-8")
+        ).hexdigest()
+        return f"u{user_id}-{digest}.{kind}"
+
+    def path(self, key: str) -> str:
+        return os.path.join(self.directory, key)
+
+    def get(self, key: str) -> Optional[str]:
+        """
+        Return the path of a cached artifact, or None on a miss.
+        """
+        path = self._lookup(key)
+        self._count("hits" if path else "misses")
+        return path
+
+    def get_or_create(self, key: str, produce: Callable[[str], None]) -> Artifact:
+        """
+        Return a cached artifact, producing and storing it on a miss.
+
+        Concurrent misses on the same key in this process wait for the one
+        producing it instead of rendering the same report again.
+
+        Args:
+            key: Key from make_key
+            produce: Writes the artifact to the path it is given
+
+        Returns:
+            The artifact; temporary when the cache is disabled or the file
+            is larger than the whole cache
+        """
+        if not self.enabled:
+            fd, path = tempfile.mkstemp(prefix="expense_report_", suffix=os.path.splitext(key)[1])
+            os.close(fd)
+            self._produce(produce, path)
+            return Artifact(path, hit=False, temporary=True)
+
+        path = self.get(key)
+        if path:
+            return Artifact(path, hit=True, temporary=False)
+        with self._stripes[hash(key) % LOCK_STRIPES]:
+            path = self._lookup(key)
+            if path:
+                self._count("waits")
+                return Artifact(path, hit=True, temporary=False)
+            partial = self._partial_path(key)
+            self._produce(produce, partial)
+            if os.path.getsize(partial) > self.max_bytes:
+                return Artifact(partial, hit=False, temporary=True)
+            return Artifact(self.put(key, partial), hit=False, temporary=False)
+
+    def tee(self, key: str, chunks: Iterable[bytes], complete: Callable[[], bool] = lambda: True) -> Iterator[bytes]:
+        """
+        Pass streamed chunks through, storing them as an artifact.
+
+        The file is only stored if every chunk was consumed and complete()
+        returns True afterwards; a client disconnecting or a failed export
+        leaves the cache unchanged.
+        """
+        if not self.enabled:
+            yield from chunks
+            return
+        partial = self._partial_path(key)
+        try:
+            with open(partial, "wb") as file:
+                for chunk in chunks:
+                    file.write(chunk)
+                    yield chunk
+            if complete() and os.path.getsize(partial) <= self.max_bytes:
+                self.put(key, partial)
+        finally:
+            if os.path.exists(partial):
+                os.remove(partial)
+
+    def put(self, key: str, source: str) -> str:
+        """
+        Move a finished file into the cache under key, evicting the least
+        recently used files past max_bytes.
+
+        Returns:
+            Path of the cached file
+        """
+        path = self.path(key)
+        os.replace(source, path)
+        _touch(path)
+        self._count("stores")
+        self._evict(keep=key)
+        return path
+
+    def store_copy(self, key: str, source: str) -> None:
+        """
+        Add a copy of a file generated elsewhere, hard-linked when possible.
+        """
+        if not self.enabled or os.path.getsize(source) > self.max_bytes:
+            return
+        partial = self._partial_path(key)
+        try:
+            link_or_copy(source, partial)
+            self.put(key, partial)
+        finally:
+            if os.path.exists(partial):
+                os.remove(partial)
+
+    def invalidate_user(self, user_id: int) -> int:
+        """
+        Delete a user's artifacts, whichever worker wrote them.
+
+        Returns:
+            Number of files removed
+        """
+        prefix = f"u{user_id}-"
+        removed = sum(
+            self._remove(name) for name, _, _ in self._scan() if name.startswith(prefix)
+        )
+        with self._lock:
+            self._counters["invalidations"] += removed
+        return removed
+
+    def clear(self) -> None:
+        """
+        Delete every cached file and reset the counters.
+        """
+        for name, _, _ in self._scan():
+            self._remove(name)
+        self._reset_counters()
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get the hit/miss counters of this process and the cache's usage.
+        """
+        with self._lock:
+            counters = dict(self._counters)
+        files = self._scan()
+        lookups = counters["hits"] + counters["misses"]
+        return {
+            "enabled": self.enabled,
+            **counters,
+            "hit_rate": counters["hits"] / lookups if lookups else 0.0,
+            "entries": len(files),
+            "bytes": sum(size for _, _, size in files),
+            "max_bytes": self.max_bytes,
+        }
+
+    def _lookup(self, key: str) -> Optional[str]:
+        if not self.enabled:
+            return None
+        path = self.path(key)
+        try:
+            _touch(path)
+        except FileNotFoundError:
+            return None
+        return path
+
+    def _scan(self) -> List[Tuple[str, int, int]]:
+        """
+        List the artifacts in the directory as (name, mtime in ns, size),
+        least recently used first.
+        """
+        files = []
+        try:
+            entries = list(os.scandir(self.directory))
+        except FileNotFoundError:
+            return files
+        for entry in entries:
+            if not _is_artifact(entry.name):
+                continue
+            try:
+                stat = entry.stat()
+            except FileNotFoundError:
+                # Removed by another worker since the listing
+                continue
+            files.append((entry.name, stat.st_mtime_ns, stat.st_size))
+        files.sort(key=lambda file: file[1])
+        return files
+
+    def _evict(self, keep: str) -> None:
+        """
+        Remove the least recently used files until the directory fits in
+        max_bytes, never removing keep.
+        """
+        files = self._scan()
+        total = sum(size for _, _, size in files)
+        for name, _, size in files:
+            if total <= self.max_bytes:
+                break
+            if name == keep:
+                continue
+            total -= size
+            if self._remove(name):
+                self._count("evictions")
+
+    def _partial_path(self, key: str) -> str:
+        os.makedirs(self.directory, exist_ok=True)
+        return f"{self.path(key)}.{uuid.uuid4().hex}.part"
+
+    def _produce(self, produce: Callable[[str], None], path: str) -> None:
+        try:
+            produce(path)
+        except BaseException:
+            if os.path.exists(path):
+                os.remove(path)
+            raise
+
+    def _remove(self, key: str) -> bool:
+        try:
+            os.remove(self.path(key))
+        except FileNotFoundError:
+            return False
+        return True
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self._counters[name] += 1
+
+    def _reset_counters(self) -> None:
+        with self._lock:
+            self._counters = {
+                "hits": 0, "misses": 0, "waits": 0, "stores": 0, "evictions": 0, "invalidations": 0,
+            }
+
+
+def _is_artifact(name: str) -> bool:
+    return name.startswith("u") and not name.endswith(".part")
+
+
+def _touch(path: str) -> None:
+    """
+    Mark a file as just used; its mtime is the LRU order of the cache.
+
+    Set explicitly in nanoseconds, since the filesystem's own timestamps
+    are too coarse to order files used in quick succession.
+    """
+    now = time.time_ns()
+    os.utime(path, ns=(now, now))
+
+
+def link_or_copy(source: str, destination: str) -> None:
+    """
+    Hard-link a file, copying it when the filesystem does not allow links.
+
+    Artifacts are never modified in place, so linked copies stay identical.
+    """
+    try:
+        os.link(source, destination)
+    except OSError:
+        shutil.copyfile(source, destination)
+
+
+def artifact_key(user: User, kind: str, params: Tuple[Any, ...]) -> str:
+    """
+    Build the artifact key of a report for the user's current data version.
+    """
+    return ArtifactCache.make_key(user.id, user.data_version or 0, kind, params)
+
+
+# Generated CSV and PDF reports, shared by the report routes and report jobs
+artifact_cache = ArtifactCache(settings.ARTIFACT_CACHE_DIR, settings.ARTIFACT_CACHE_MAX_BYTES)
@@ -0,0 +1,551 @@
+import json
+import logging
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+from app.core.config import settings
+from app.models.user import User
+
+# msgpack, orjson and redis are optional; see get_serializer and create_backend
+try:
+    import msgpack
+except ImportError:  # pragma: no cover - depends on the environment
+    msgpack = None
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depends on the environment
+    orjson = None
+
+try:
+    import redis
+except ImportError:  # pragma: no cover - depends on the environment
+    redis = None
+
+logger = logging.getLogger(__name__)
+
+# Prefix of every key the shared backend writes
+KEY_PREFIX = "expense-tracker:summary:"
+
+
+def estimate_size(value: Any) -> int:
+    """
+    Approximate the memory cost of a cached value by its JSON size.
+    """
+    return len(json.dumps(value, default=str, separators=(",", ":")))
+
+
+def _encode_value(value: Any) -> Any:
+    """
+    Encode values the binary serializers do not handle natively.
+
+    Dates become ISO strings; the response models parse them back.
+    """
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, (set, frozenset, tuple)):
+        return list(value)
+    raise TypeError(f"Object of type {type(value).__name__} cannot be cached")
+
+
+def get_serializer(name: str) -> Tuple[str, Callable[[Any], bytes], Callable[[bytes], Any]]:
+    """
+    Get the (name, dumps, loads) triple used to store values in a shared backend.
+
+    "msgpack" falls back to "json" (orjson, or the stdlib encoder), with a
+    warning, when msgpack is not installed.
+
+    Args:
+        name: Serializer name, "msgpack" or "json"
+
+    Returns:
+        Name actually used, dumps and loads functions
+    """
+    if name == "msgpack":
+        if msgpack is not None:
+            return (
+                "msgpack",
+                lambda value: msgpack.packb(value, default=_encode_value, use_bin_type=True),
+                lambda data: msgpack.unpackb(data, raw=False, strict_map_key=False),
+            )
+        logger.warning("msgpack is not installed, the summary cache stores values as JSON")
+    if orjson is not None:
+        return (
+            "json",
+            lambda value: orjson.dumps(value, default=_encode_value, option=orjson.OPT_NON_STR_KEYS),
+            orjson.loads,
+        )
+    return (
+        "json",
+        lambda value: json.dumps(value, default=_encode_value, separators=(",", ":")).encode("utf-8"),
+        json.loads,
+    )
+
+
+class LRUCache:
+    """
+    Thread-safe in-process cache bounded by entry count, total size and age.
+
+    Entries past their TTL count as misses; when the cache is over either
+    limit, the least recently used entries are evicted.
+    """
+
+    def __init__(self, max_entries: int, max_bytes: int, ttl_seconds: float) -> None:
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        # key -> (expires_at, size, value)
+        self._entries: "OrderedDict[Hashable, Tuple[float, int, Any]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0 and self.max_bytes > 0 and self.ttl_seconds > 0
+
+    def get(self, key: Hashable) -> Tuple[bool, Any]:
+        """
+        Look up a key.
+
+        Returns:
+            (found, value) tuple
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return False, None
+            if entry[0] <= time.monotonic():
+                self._remove(key)
+                self.expirations += 1
+                self.misses += 1
+                return False, None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return True, entry[2]
+
+    def set(self, key: Hashable, value: Any, size: Optional[int] = None) -> None:
+        """
+        Store a value, evicting least recently used entries to stay in bounds.
+
+        Values larger than the whole cache are not stored.
+        """
+        if not self.enabled:
+            return
+        size = estimate_size(value) if size is None else size
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, size, value)
+            self._bytes += size
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self.evictions += 1
+
+    def invalidate(self, predicate: Callable[[Hashable], bool]) -> int:
+        """
+        Drop every entry whose key matches predicate.
+
+        Returns:
+            Number of entries dropped
+        """
+        with self._lock:
+            keys = [key for key in self._entries if predicate(key)]
+            for key in keys:
+                self._remove(key)
+            self.invalidations += len(keys)
+            return len(keys)
+
+    def clear(self) -> None:
+        """
+        Drop all entries and reset the counters.
+        """
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            self.hits = self.misses = self.evictions = 0
+            self.expirations = self.invalidations = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get the cache counters and current usage.
+        """
+        with self._lock:
+            return {
+                "enabled": self.enabled,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "invalidations": self.invalidations,
+            }
+
+    def _remove(self, key: Hashable) -> None:
+        _, size, _ = self._entries.pop(key)
+        self._bytes -= size
+
+
+class CacheBackend:
+    """
+    Storage behind SummaryCache.
+
+    Keys are strings starting with "u<user_id>:"; values are JSON-like
+    Python data. Backends must never raise on get/set: an unavailable
+    store behaves like an empty one.
+    """
+
+    name = "none"
+
+    @property
+    def enabled(self) -> bool:
+        return True
+
+    def get(self, key: str) -> Tuple[bool, Any]:
+        raise NotImplementedError
+
+    def set(self, key: str, value: Any) -> None:
+        raise NotImplementedError
+
+    def acquire(self, lock_key: str, timeout: float) -> Optional[str]:
+        """
+        Try to take a short-lived lock.
+
+        Returns:
+            A token to release the lock with, or None if it is held
+        """
+        raise NotImplementedError
+
+    def release(self, lock_key: str, token: str) -> None:
+        raise NotImplementedError
+
+    def invalidate_user(self, user_id: int) -> int:
+        raise NotImplementedError
+
+    def clear(self) -> None:
+        raise NotImplementedError
+
+    def stats(self) -> Dict[str, Any]:
+        return {}
+
+
+class MemoryBackend(CacheBackend):
+    """
+    Per-process backend over LRUCache; values are stored as live objects.
+    """
+
+    name = "memory"
+
+    def __init__(self, max_entries: int, max_bytes: int, ttl_seconds: float) -> None:
+        self.cache = LRUCache(max_entries, max_bytes, ttl_seconds)
+        self._locks: Dict[str, Tuple[str, float]] = {}
+        self._locks_guard = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.cache.enabled
+
+    def get(self, key: str) -> Tuple[bool, Any]:
+        return self.cache.get(key)
+
+    def set(self, key: str, value: Any) -> None:
+        self.cache.set(key, value)
+
+    def acquire(self, lock_key: str, timeout: float) -> Optional[str]:
+        now = time.monotonic()
+        with self._locks_guard:
+            held = self._locks.get(lock_key)
+            if held is not None and held[1] > now:
+                return None
+            token = uuid.uuid4().hex
+            self._locks[lock_key] = (token, now + timeout)
+            return token
+
+    def release(self, lock_key: str, token: str) -> None:
+        with self._locks_guard:
+            held = self._locks.get(lock_key)
+            if held is not None and held[0] == token:
+                del self._locks[lock_key]
+
+    def invalidate_user(self, user_id: int) -> int:
+        prefix = f"u{user_id}:"
+        return self.cache.invalidate(lambda key: key.startswith(prefix))
+
+    def clear(self) -> None:
+        self.cache.clear()
+        with self._locks_guard:
+            self._locks.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        stats = self.cache.stats()
+        # Hit/miss counting is done by SummaryCache, which sees every lookup
+        stats.pop("hits")
+        stats.pop("misses")
+        return stats
+
+
+class RedisBackend(CacheBackend):
+    """
+    Backend shared by all workers, on any server speaking the Redis protocol.
+
+    Values are serialized with get_serializer() and expire after the TTL.
+    Stale versions of a user's entries are never read again and simply
+    expire, so invalidation needs no key scans.
+    """
+
+    name = "redis"
+
+    def __init__(self, client: Any, ttl_seconds: float, serializer: str = "msgpack") -> None:
+        self.client = client
+        self.ttl_seconds = ttl_seconds
+        self.serializer, self._dumps, self._loads = get_serializer(serializer)
+        self.errors = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl_seconds > 0
+
+    def get(self, key: str) -> Tuple[bool, Any]:
+        try:
+            data = self.client.get(KEY_PREFIX + key)
+        except Exception as e:
+            self._failed("get", e)
+            return False, None
+        if data is None:
+            return False, None
+        try:
+            return True, self._loads(data)
+        except Exception as e:
+            # Corrupt, or written with another serializer; recompute it
+            self._failed("decode", e)
+            try:
+                self.client.delete(KEY_PREFIX + key)
+            except Exception as e:
+                self._failed("delete", e)
+            return False, None
+
+    def set(self, key: str, value: Any) -> None:
+        try:
+            self.client.set(KEY_PREFIX + key, self._dumps(value), px=int(self.ttl_seconds * 1000))
+        except Exception as e:
+            self._failed("set", e)
+
+    def acquire(self, lock_key: str, timeout: float) -> Optional[str]:
+        token = uuid.uuid4().hex
+        try:
+            taken = self.client.set(KEY_PREFIX + lock_key, token, nx=True, px=int(timeout * 1000))
+        except Exception as e:
+            self._failed("lock", e)
+            # Without the store there is nothing to wait for
+            return token
+        return token if taken else None
+
+    def release(self, lock_key: str, token: str) -> None:
+        # Check-then-delete is not atomic, but the lock expires on its own
+        # and only guards against duplicate work, not correctness
+        try:
+            held = self.client.get(KEY_PREFIX + lock_key)
+            if held is not None and (held.decode() if isinstance(held, bytes) else held) == token:
+                self.client.delete(KEY_PREFIX + lock_key)
+        except Exception as e:
+            self._failed("unlock", e)
+
+    def invalidate_user(self, user_id: int) -> int:
+        return 0
+
+    def clear(self) -> None:
+        try:
+            keys = list(self.client.scan_iter(match=KEY_PREFIX + "*"))
+            if keys:
+                self.client.delete(*keys)
+        except Exception as e:
+            self._failed("clear", e)
+        self.errors = 0
+
+    def stats(self) -> Dict[str, Any]:
+        return {"enabled": self.enabled, "ttl_seconds": self.ttl_seconds,
+                "serializer": self.serializer, "errors": self.errors}
+
+    def _failed(self, operation: str, error: Exception) -> None:
+        self.errors += 1
+        logger.warning("Summary cache %s failed: %s", operation, error)
+
+
+def create_backend() -> CacheBackend:
+    """
+    Build the backend selected by SUMMARY_CACHE_BACKEND.
+
+    An unreachable Redis server is logged and treated as an empty cache
+    until it comes back.
+
+    Raises:
+        RuntimeError: If "redis" is selected but the redis package is not installed
+    """
+    if settings.SUMMARY_CACHE_BACKEND == "redis":
+        if redis is None:
+            raise RuntimeError(
+                "SUMMARY_CACHE_BACKEND is 'redis' but the redis package is not installed"
+            )
+        client = redis.Redis.from_url(settings.SUMMARY_CACHE_REDIS_URL)
+        try:
+            client.ping()
+        except Exception as e:
+            logger.warning(
+                "Redis at %s is unreachable, summary cache lookups will miss: %s",
+                settings.SUMMARY_CACHE_REDIS_URL, e,
+            )
+        return RedisBackend(
+            client,
+            ttl_seconds=settings.SUMMARY_CACHE_TTL_SECONDS,
+            serializer=settings.SUMMARY_CACHE_SERIALIZER,
+        )
+    return MemoryBackend(
+        max_entries=settings.SUMMARY_CACHE_MAX_ENTRIES,
+        max_bytes=settings.SUMMARY_CACHE_MAX_BYTES,
+        ttl_seconds=settings.SUMMARY_CACHE_TTL_SECONDS,
+    )
+
+
+class SummaryCache:
+    """
+    Per-user cache of computed results with stampede protection.
+
+    Keys live in versioned per-user namespaces, "u<user_id>:v<data_version>:",
+    so a write that bumps the version retires all of a user's entries at
+    once. On a miss only one caller per key computes the value; concurrent
+    callers wait for it, up to lock_timeout, instead of all hitting the
+    database.
+    """
+
+    def __init__(self, backend: CacheBackend, lock_timeout: float, poll_interval: float = 0.02) -> None:
+        self.backend = backend
+        self.lock_timeout = lock_timeout
+        self.poll_interval = poll_interval
+        self._counter_lock = threading.Lock()
+        self._reset_counters()
+
+    def get_or_compute(self, key: str, compute: Callable[[], Any]) -> Any:
+        """
+        Return the cached value of key, computing and storing it on a miss.
+        """
+        if not self.backend.enabled:
+            return compute()
+        found, value = self.backend.get(key)
+        if found:
+            self._count("hits")
+            return value
+        self._count("misses")
+
+        lock_key = "lock:" + key
+        token = self.backend.acquire(lock_key, self.lock_timeout)
+        if token is None:
+            # Another worker or thread is computing this key
+            self._count("waits")
+            deadline = time.monotonic() + self.lock_timeout
+            while time.monotonic() < deadline:
+                time.sleep(self.poll_interval)
+                found, value = self.backend.get(key)
+                if found:
+                    return value
+            self._count("lock_timeouts")
+            token = self.backend.acquire(lock_key, self.lock_timeout)
+        try:
+            value = compute()
+            self.backend.set(key, value)
+            return value
+        finally:
+            if token is not None:
+                self.backend.release(lock_key, token)
+
+    def invalidate_user(self, user_id: int) -> int:
+        return self.backend.invalidate_user(user_id)
+
+    def clear(self) -> None:
+        """
+        Drop all entries and reset the counters.
+        """
+        self.backend.clear()
+        self._reset_counters()
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get the hit/miss counters of this process plus the backend's usage.
+        """
+        with self._counter_lock:
+            counters = dict(self._counters)
+        return {"backend": self.backend.name, **counters, **self.backend.stats()}
+
+    def _count(self, name: str) -> None:
+        with self._counter_lock:
+            self._counters[name] += 1
+
+    def _reset_counters(self) -> None:
+        with self._counter_lock:
+            self._counters = {"hits": 0, "misses": 0, "waits": 0, "lock_timeouts": 0}
+
+
+# Per-user summaries, budget overviews and category lists
+summary_cache = SummaryCache(create_backend(), lock_timeout=settings.SUMMARY_CACHE_LOCK_TIMEOUT_SECONDS)
+
+
+def make_key(user_id: int, data_version: int, endpoint: str, params: Tuple[Any, ...]) -> str:
+    """
+    Build a cache key in the user's namespace for their current data version.
+    """
+    return f"u{user_id}:v{data_version}:{endpoint}:{params!r}"
+
+
+def cached_for_user(
+    user: User, endpoint: str, params: Tuple[Any, ...], compute: Callable[[], Any]
+) -> Any:
+    """
+    Return a per-user result from the summary cache, computing it on a miss.
+
+    The key includes the user's data version, so any write that bumps it
+    makes older entries unreachable, in this process and in every other
+    worker. Values must be JSON-like data (dicts, lists, scalars, dates);
+    they are shared between requests and must not be mutated by callers.
+
+    Args:
+        user: Current user, with its data_version loaded
+        endpoint: Name identifying the cached computation
+        params: Parameters of the computation, with a stable repr
+        compute: Produces the value on a miss
+
+    Returns:
+        The cached or freshly computed value
+    """
+    key = make_key(user.id, user.data_version or 0, endpoint, params)
+    return summary_cache.get_or_compute(key, compute)
+
+
+def invalidate_user(user_id: int) -> int:
+    """
+    Drop a user's cached entries from this process after a write.
+
+    Shared backends keep them until they expire; the version bump already
+    makes them unreachable.
+
+    Returns:
+        Number of entries dropped
+    """
+    return summary_cache.invalidate_user(user_id)
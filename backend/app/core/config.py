@@ -26,6 +26,7 @@ except ImportError:
 from pydantic_settings import BaseSettings, SettingsConfigDict
 import json
 import os
+import tempfile
 
 
 class Settings(BaseSettings):
@@ -103,6 +104,59 @@ class Settings(BaseSettings):
     
     # Frontend URL for links in emails - use str instead of URL types for compatibility
     FRONTEND_URL: str = "https://expense-tracker-tan-sigma.vercel.app"
+    
+    # JSON encoder for API responses: "orjson" (falls back to "json" if not installed) or "json"
+    JSON_RESPONSE_ENCODER: str = "orjson"
+    
+    # Maximum number of items accepted by one bulk expense request
+    EXPENSE_BULK_MAX_ITEMS: int = 1000
+    
+    # In-process cache of per-user summaries and budget overviews (per worker).
+    # Size is measured as the JSON size of cached values; 0 disables the cache.
+    SUMMARY_CACHE_MAX_ENTRIES: int = 2048
+    SUMMARY_CACHE_MAX_BYTES: int = 16 * 1024 * 1024
+    SUMMARY_CACHE_TTL_SECONDS: float = 300
+    # "memory" (per worker) or "redis" (shared by all workers; requires the
+    # redis package)
+    SUMMARY_CACHE_BACKEND: str = "memory"
+    SUMMARY_CACHE_REDIS_URL: str = "redis://localhost:6379/0"
+    # Value format in the shared backend: "msgpack" (falls back to "json", with
+    # a warning, if not installed) or "json"
+    SUMMARY_CACHE_SERIALIZER: str = "msgpack"
+    # How long concurrent requests wait for another one computing the same entry
+    SUMMARY_CACHE_LOCK_TIMEOUT_SECONDS: float = 5
+    
+    # Threads (and so database connections) shared by concurrent dashboard sections
+    DASHBOARD_MAX_WORKERS: int = 8
+    
+    # Rows fetched per round trip by exports (and sent per chunk by the CSV export)
+    EXPORT_BATCH_SIZE: int = 1000
+    # Expenses listed in a PDF report; older ones are summarized per month in
+    # an appendix. 0 lists every expense.
+    PDF_MAX_DETAIL_ROWS: int = 10000
+    
+    # Worker processes rendering reports outside the API process (0 renders in
+    # the request thread), and how long one report may take
+    RENDER_MAX_WORKERS: int = 2
+    RENDER_TIMEOUT_SECONDS: float = 120
+    # multiprocessing start method of the render workers
+    RENDER_START_METHOD: str = "spawn"
+    
+    # Background report jobs: threads running them, where finished files are
+    # written, and how long finished jobs and their files are kept
+    REPORT_JOB_WORKERS: int = 2
+    REPORT_JOB_DIR: str = "./report_files"
+    REPORT_JOB_RETENTION_HOURS: float = 24
+    # A running job whose heartbeat is older than this is restarted at
+    # startup; longer than RENDER_TIMEOUT_SECONDS, since PDF layout does not
+    # refresh it
+    REPORT_JOB_LEASE_SECONDS: float = 600
+    
+    # On-disk cache of generated CSV and PDF reports, keyed by user, data
+    # version and parameters; least recently used files are removed past
+    # the size limit. 0 disables the cache.
+    ARTIFACT_CACHE_DIR: str = "./report_cache"
+    ARTIFACT_CACHE_MAX_BYTES: int = 512 * 1024 * 1024
 
     # Update from Config class to SettingsConfigDict
     model_config = SettingsConfigDict(
@@ -148,6 +202,41 @@ class TestSettings(BaseSettings):
     # Add a list of allowed CORS origins for testing
     BACKEND_CORS_ORIGINS: List[str] = ["http://localhost:3000", "http://localhost:8000"]
     
+    # Same response encoder as production
+    JSON_RESPONSE_ENCODER: str = "orjson"
+    
+    # Small enough for tests to exceed it
+    EXPENSE_BULK_MAX_ITEMS: int = 50
+    
+    # Small summary cache so tests can exercise eviction
+    SUMMARY_CACHE_MAX_ENTRIES: int = 16
+    SUMMARY_CACHE_MAX_BYTES: int = 64 * 1024
+    SUMMARY_CACHE_TTL_SECONDS: float = 60
+    SUMMARY_CACHE_BACKEND: str = "memory"
+    SUMMARY_CACHE_REDIS_URL: str = "redis://localhost:6379/15"
+    SUMMARY_CACHE_SERIALIZER: str = "msgpack"
+    SUMMARY_CACHE_LOCK_TIMEOUT_SECONDS: float = 1
+    
+    DASHBOARD_MAX_WORKERS: int = 4
+    
+    # Small batches so tests stream several chunks
+    EXPORT_BATCH_SIZE: int = 10
+    PDF_MAX_DETAIL_ROWS: int = 20
+    
+    # Render in the request thread; tests of the pool start their own
+    RENDER_MAX_WORKERS: int = 0
+    RENDER_TIMEOUT_SECONDS: float = 10
+    RENDER_START_METHOD: str = "spawn"
+    
+    REPORT_JOB_WORKERS: int = 2
+    REPORT_JOB_DIR: str = os.path.join(tempfile.gettempdir(), "expense_tracker_test_reports")
+    REPORT_JOB_RETENTION_HOURS: float = 24
+    REPORT_JOB_LEASE_SECONDS: float = 600
+    
+    # Small artifact cache so tests can exercise eviction
+    ARTIFACT_CACHE_DIR: str = os.path.join(tempfile.gettempdir(), "expense_tracker_test_artifacts")
+    ARTIFACT_CACHE_MAX_BYTES: int = 256 * 1024
+    
     # Configuration for TestSettings
     model_config = SettingsConfigDict(
         env_file=None,  # Don't load from .env for tests
@@ -83,8 +83,21 @@ def init_db():
     """
     # Import all the models here so that they are registered with SQLAlchemy Base
     # This import is here to avoid circular imports
-    from app.models import user, expense, category, budget
+    from app.models import user, expense, category, budget, expense_rollup, report_job
+    
+    from sqlalchemy import inspect
+    from app.services.rollup import rebuild_rollups
+    from app.services.search import ensure_search_index
+    
+    had_rollups = inspect(engine).has_table("expense_rollups")
     
     # Create tables
     print(f"Creating database tables (if they don't exist) using engine: {engine}")
-    Base.metadata.create_all(bind=engine) 
\ No newline at end of file
+    Base.metadata.create_all(bind=engine)
+    
+    # Fill a newly created rollup table from any existing expenses
+    if not had_rollups:
+        rebuild_rollups(engine)
+    
+    # Full-text search index over expense descriptions and notes
+    ensure_search_index(engine) 
\ No newline at end of file
@@ -0,0 +1,76 @@
+import hashlib
+from datetime import date
+from typing import Dict, Optional
+
+from fastapi import Depends, HTTPException, Request, Response, status
+
+from app.core.deps import get_current_active_user
+from app.models.user import User
+
+# Clients may reuse the response but must revalidate it every time
+CACHE_CONTROL = "private, no-cache"
+
+
+def make_etag(user_id: int, data_version: int, request: Request) -> str:
+    """
+    Build the strong ETag of a per-user GET response.
+
+    The tag covers the user's data version, the path and the query
+    parameters, plus the current date because some summaries are relative
+    to today.
+
+    Args:
+        user_id: Current user ID
+        data_version: Current user's data version
+        request: Incoming request
+
+    Returns:
+        Quoted ETag value
+    """
+    query = "&".join(f"{key}={value}" for key, value in sorted(request.query_params.multi_items()))
+    key = f"{user_id}:{data_version}:{date.today().isoformat()}:{request.url.path}?{query}"
+    return f'"{hashlib.sha1(key.encode("utf-8")).hexdigest()}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    Tell whether an If-None-Match header matches an ETag.
+    """
+    if not if_none_match:
+        return False
+    candidates = [candidate.strip() for candidate in if_none_match.split(",")]
+    return "*" in candidates or any(
+        candidate.removeprefix("W/") == etag for candidate in candidates
+    )
+
+
+def etag_headers(etag: str) -> Dict[str, str]:
+    """
+    Get the caching headers sent with a response carrying etag.
+    """
+    return {"ETag": etag, "Cache-Control": CACHE_CONTROL}
+
+
+def check_etag(
+    request: Request,
+    response: Response,
+    current_user: User = Depends(get_current_active_user),
+) -> str:
+    """
+    Answer conditional GETs of per-user data before the endpoint runs.
+
+    Uses the data version loaded with the current user, so a matching
+    If-None-Match costs no query beyond authentication.
+
+    Returns:
+        The ETag, already set on the response; endpoints that build their
+        own Response must add etag_headers(etag) themselves
+
+    Raises:
+        HTTPException: 304 Not Modified if the client's copy is current
+    """
+    etag = make_etag(current_user.id, current_user.data_version or 0, request)
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        raise HTTPException(status_code=status.HTTP_304_NOT_MODIFIED, headers=etag_headers(etag))
+    response.headers.update(etag_headers(etag))
+    return etag
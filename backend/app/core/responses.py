@@ -0,0 +1,41 @@
+from typing import Type
+
+from fastapi.responses import JSONResponse, ORJSONResponse
+
+# orjson is optional; without it the stdlib encoder is used
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depends on the environment
+    orjson = None
+
+
+RESPONSE_CLASSES = {
+    "json": JSONResponse,
+    "orjson": ORJSONResponse,
+}
+
+
+def get_default_response_class(encoder: str) -> Type[JSONResponse]:
+    """
+    Get the response class for the configured JSON encoder.
+
+    Falls back to the stdlib encoder when orjson is not installed, so the
+    setting can be left at its default everywhere.
+
+    Args:
+        encoder: Encoder name, "orjson" or "json"
+
+    Returns:
+        Response class to pass as FastAPI(default_response_class=...)
+
+    Raises:
+        ValueError: If the encoder name is unknown
+    """
+    if encoder not in RESPONSE_CLASSES:
+        raise ValueError(
+            f"Unknown JSON_RESPONSE_ENCODER '{encoder}', expected one of {sorted(RESPONSE_CLASSES)}"
+        )
+    if encoder == "orjson" and orjson is None:
+        print("orjson is not installed, falling back to the standard JSON encoder")
+        return JSONResponse
+    return RESPONSE_CLASSES[encoder]
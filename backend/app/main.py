@@ -6,16 +6,23 @@ from typing import Optional
 from fastapi import HTTPException, status
 
 from app.core.config import settings
-from app.core.database import get_db, init_db, SessionLocal
-from app.routers import auth, users, expenses, categories, budgets, reports, financial_reports, debug
+from app.core.database import engine, get_db, init_db, SessionLocal
+from app.core.responses import get_default_response_class
+from app.routers import auth, users, expenses, categories, budgets, reports, financial_reports, debug, dashboard
 from app.core.deps import get_current_active_user
+from app.core.etag import check_etag
 from app.models.user import User
+from app.services.render import render_service
+from app.services.report_jobs import resume_report_jobs
 
 # Initialize FastAPI app
+# Responses are encoded with the configured fast JSON encoder; a route can opt
+# out by passing response_class=JSONResponse
 app = FastAPI(
     title=settings.APP_NAME,
     description="API for Expense Tracker Application",
     version="1.0.0",
+    default_response_class=get_default_response_class(settings.JSON_RESPONSE_ENCODER),
 )
 
 # Configure CORS - more permissive for debugging
@@ -37,6 +44,7 @@ app.include_router(budgets.router, prefix="/api/budgets", tags=["Budgets"])
 app.include_router(reports.router, prefix="/api/reports", tags=["Reports"])
 app.include_router(financial_reports.router, prefix="/api/financial_reports", tags=["Financial Reports"])
 app.include_router(debug.router, prefix="/api", tags=["Debug"])
+app.include_router(dashboard.router, prefix="/api", tags=["Dashboard"])
 
 # Health check endpoint
 @app.get("/api/health", tags=["Health"])
@@ -55,6 +63,14 @@ async def startup_event():
     """Initialize the database on application startup."""
     init_db()
     
+    # Pick up report jobs left unfinished by the previous run
+    try:
+        resumed = resume_report_jobs(engine)
+        if resumed:
+            print(f"Resumed {resumed} report jobs")
+    except Exception as e:
+        print(f"Error resuming report jobs: {str(e)}")
+    
     # Create a test user for development
     try:
         from app.models.user import User
@@ -88,6 +104,12 @@ async def startup_event():
         print(f"Error creating test user: {str(e)}")
 
 
+@app.on_event("shutdown")
+def shutdown_event():
+    """Stop the report rendering worker processes."""
+    render_service.shutdown()
+
+
 @app.get("/", tags=["Root"])
 async def root():
     """Root endpoint that redirects to API documentation."""
@@ -106,6 +128,7 @@ def get_budgets_list(
     limit: int = Query(100, ge=1, le=100),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user),
+    _: str = Depends(check_etag),
 ):
     """Direct budget list endpoint to bypass router conflicts."""
     try:
@@ -2,4 +2,6 @@
 from app.models.user import User
 from app.models.category import Category
 from app.models.expense import Expense
-from app.models.budget import Budget 
\ No newline at end of file
+from app.models.budget import Budget
+from app.models.expense_rollup import ExpenseRollup
+from app.models.report_job import ReportJob
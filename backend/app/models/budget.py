@@ -1,5 +1,5 @@
 from datetime import datetime
-from sqlalchemy import Column, Integer, Float, String, ForeignKey, Date, DateTime
+from sqlalchemy import Column, Integer, Float, String, ForeignKey, Date, DateTime, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 
@@ -26,4 +26,9 @@ class Budget(Base):
     
     # Relationships
     category = relationship("Category", back_populates="budgets")
-    user = relationship("User", back_populates="budgets") 
\ No newline at end of file
+    user = relationship("User", back_populates="budgets") 
+    
+    # Budget lookups always filter by user and period, then by category
+    __table_args__ = (
+        Index("ix_budgets_user_year_month_category", user_id, year, month, category_id),
+    )
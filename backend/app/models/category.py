@@ -1,5 +1,5 @@
 from datetime import datetime
-from sqlalchemy import Column, DateTime, ForeignKey, Integer, String
+from sqlalchemy import Column, DateTime, ForeignKey, Index, Integer, String
 from sqlalchemy.orm import relationship
 
 from app.core.database import Base
@@ -27,4 +27,9 @@ class Category(Base):
     # Relationships
     user = relationship("User", back_populates="categories")
     expenses = relationship("Expense", back_populates="category", cascade="all, delete-orphan")
-    budgets = relationship("Budget", back_populates="category", cascade="all, delete-orphan") 
\ No newline at end of file
+    budgets = relationship("Budget", back_populates="category", cascade="all, delete-orphan") 
+    
+    # Categories are always listed per user and de-duplicated by name
+    __table_args__ = (
+        Index("ix_categories_user_name", user_id, name),
+    )
@@ -1,5 +1,5 @@
 from datetime import datetime
-from sqlalchemy import Column, DateTime, Float, ForeignKey, Integer, String, Text
+from sqlalchemy import Column, DateTime, Float, ForeignKey, Index, Integer, String, Text
 from sqlalchemy.orm import relationship
 
 from app.core.database import Base
@@ -31,4 +31,11 @@ class Expense(Base):
     
     # Relationships
     user = relationship("User", back_populates="expenses")
-    category = relationship("Category", back_populates="expenses") 
\ No newline at end of file
+    category = relationship("Category", back_populates="expenses") 
+    
+    # Composite indexes for the per-user access paths: listings ordered by
+    # (date, id) and per-category aggregates over a date range
+    __table_args__ = (
+        Index("ix_expenses_user_date_id", user_id, date.desc(), id.desc()),
+        Index("ix_expenses_user_category_date", user_id, category_id, date),
+    )
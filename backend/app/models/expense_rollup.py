@@ -0,0 +1,23 @@
+from sqlalchemy import Column, Float, ForeignKey, Integer, String
+
+from app.core.database import Base
+
+
+class ExpenseRollup(Base):
+    """
+    Per-user monthly spending by category and currency.
+
+    Maintained from every expense write by app/services/rollup.py, so
+    summaries aggregate a handful of rows per month instead of every
+    expense. Rows whose count drops to zero are removed.
+    """
+
+    __tablename__ = "expense_rollups"
+
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    year = Column(Integer, primary_key=True)
+    month = Column(Integer, primary_key=True)
+    category_id = Column(Integer, ForeignKey("categories.id", ondelete="CASCADE"), primary_key=True)
+    currency = Column(String, primary_key=True)
+    total = Column(Float, nullable=False, default=0.0)
+    count = Column(Integer, nullable=False, default=0)
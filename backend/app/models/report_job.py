@@ -0,0 +1,50 @@
+from datetime import datetime
+
+from sqlalchemy import Column, DateTime, Float, ForeignKey, Index, Integer, String
+
+from app.core.database import Base
+
+
+class ReportJob(Base):
+    """
+    A CSV or PDF report rendered in the background.
+
+    Created by POST /api/reports/jobs and run by app/services/report_jobs.py,
+    which records progress here and the path of the finished file. Jobs
+    are kept for REPORT_JOB_RETENTION_HOURS after they finish.
+    """
+
+    __tablename__ = "report_jobs"
+
+    id = Column(String(32), primary_key=True)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    format = Column(String, nullable=False)  # csv, pdf
+
+    # Report parameters, as accepted by the synchronous report endpoints
+    year = Column(Integer, nullable=True)
+    month = Column(Integer, nullable=True)
+    category_id = Column(Integer, nullable=True)
+
+    status = Column(String, nullable=False, default="queued")  # queued, running, succeeded, failed
+    progress = Column(Float, nullable=False, default=0.0)  # 0 to 1
+    rows = Column(Integer, nullable=False, default=0)  # expenses read so far
+    error = Column(String, nullable=True)
+    filename = Column(String, nullable=False)  # offered to the client
+    file_path = Column(String, nullable=True)  # set once succeeded
+
+    # Timestamps
+    created_at = Column(DateTime, default=datetime.utcnow)
+    started_at = Column(DateTime, nullable=True)
+    finished_at = Column(DateTime, nullable=True)
+    # Refreshed while running; jobs whose heartbeat is older than
+    # REPORT_JOB_LEASE_SECONDS are considered abandoned
+    heartbeat_at = Column(DateTime, nullable=True)
+
+    __table_args__ = (Index("ix_report_jobs_user_created", user_id, created_at),)
+
+    @property
+    def download_url(self):
+        """Where the finished file can be downloaded from, once it exists."""
+        if self.status != "succeeded":
+            return None
+        return f"/api/reports/jobs/{self.id}/download"
@@ -27,6 +27,10 @@ class User(Base):
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     last_login = Column(DateTime, nullable=True)
     
+    # Bumped by every write to the user's expenses, categories or budgets;
+    # conditional GETs derive their ETag from it
+    data_version = Column(Integer, nullable=False, default=0, server_default="0")
+    
     # Relationships
     expenses = relationship("Expense", back_populates="user", cascade="all, delete-orphan")
     categories = relationship("Category", back_populates="user", cascade="all, delete-orphan")
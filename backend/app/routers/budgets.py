@@ -7,8 +7,10 @@ import traceback
 import sys
 from sqlalchemy.sql import text
 
+from app.core.cache import cached_for_user
 from app.core.database import get_db
 from app.core.deps import get_current_active_user
+from app.core.etag import check_etag
 from app.models.user import User
 from app.schemas.budget import (
     Budget,
@@ -57,11 +59,19 @@ def test_budget_endpoint(
 def get_current_budgets_endpoint(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user),
+    _: str = Depends(check_etag),
 ) -> Any:
     """
-    Get current budgets with spending statistics.
+    Get current budgets with spending statistics and month-end forecasts,
+    cached per user until their data changes.
     """
-    return budget_service.get_current_budgets(db=db, user_id=current_user.id)
+    # Forecasts depend on the day, not just the month
+    return cached_for_user(
+        current_user,
+        "budgets.overview.current",
+        (datetime.now().date().isoformat(),),
+        lambda: budget_service.get_current_budgets(db=db, user_id=current_user.id),
+    )
 
 
 @router.get("/stats", response_model=List[dict])
@@ -70,17 +80,24 @@ def get_budget_stats_endpoint(
     current_user: User = Depends(get_current_active_user),
     year: int = Query(..., description="Year for budget stats"),
     month: Optional[int] = Query(None, description="Month for budget stats (1-12)"),
-    category_id: Optional[int] = Query(None, description="Filter by category")
+    category_id: Optional[int] = Query(None, description="Filter by category"),
+    _: str = Depends(check_etag),
 ) -> Any:
     """
-    Get budget statistics with spending information.
+    Get budget statistics with spending information, cached per user until
+    their data changes.
     """
-    return budget_service.get_budgets_with_stats(
-        db=db, 
-        user_id=current_user.id, 
-        year=year, 
-        month=month, 
-        category_id=category_id
+    return cached_for_user(
+        current_user,
+        "budgets.stats",
+        (year, month, category_id),
+        lambda: budget_service.get_budgets_with_stats(
+            db=db, 
+            user_id=current_user.id, 
+            year=year, 
+            month=month, 
+            category_id=category_id
+        ),
     )
 
 
@@ -112,6 +129,7 @@ def list_budgets_endpoint(
     limit: int = Query(100, ge=1, le=100),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user),
+    _: str = Depends(check_etag),
 ) -> Any:
     """
     Get all budgets for the current user with optional filtering.
@@ -3,11 +3,16 @@ from typing import Any, List, Optional
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 
+import app.services.category as category_service
+from app.core.cache import cached_for_user
 from app.core.database import get_db
 from app.core.deps import get_current_active_user, get_current_admin_user
+from app.core.etag import check_etag
 from app.models.category import Category
 from app.models.user import User
-from app.schemas.category import Category as CategorySchema, CategoryCreate, CategoryUpdate
+from app.schemas.category import Category as CategorySchema
+from app.schemas.category import CategoryCreate, CategoryUpdate
+from app.services.user import bump_data_version
 
 router = APIRouter()
 
@@ -18,19 +23,18 @@ def get_categories(
     limit: int = 100,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user),
+    _: str = Depends(check_etag),
 ) -> Any:
     """
-    Get all categories for the current user.
+    Get all categories for the current user, cached per user until their
+    data changes.
     """
-    categories = (
-        db.query(Category)
-        .filter(Category.user_id == current_user.id)
-        .offset(skip)
-        .limit(limit)
-        .all()
+    return cached_for_user(
+        current_user,
+        "categories.list",
+        (skip, limit),
+        lambda: category_service.list_categories(db, current_user.id, skip, limit),
     )
-    
-    return categories
 
 
 @router.post("/defaults", response_model=List[CategorySchema])
@@ -81,6 +85,7 @@ def create_default_categories(
         if new_categories:
             print(f"Committing {len(new_categories)} new categories to database")
             try:
+                bump_data_version(db, current_user.id)
                 db.commit()
                 # Refresh to get IDs
                 for category in new_categories:
@@ -127,6 +132,7 @@ def create_category(
         user_id=current_user.id,
     )
     db.add(category)
+    bump_data_version(db, current_user.id)
     db.commit()
     db.refresh(category)
     return category
@@ -179,6 +185,7 @@ def update_category(
     for key, value in category_in.dict(exclude_unset=True).items():
         setattr(category, key, value)
     
+    bump_data_version(db, current_user.id)
     db.commit()
     db.refresh(category)
     return category
@@ -212,5 +219,6 @@ def delete_category(
         )
     
     db.delete(category)
+    bump_data_version(db, current_user.id)
     db.commit()
     return category 
\ No newline at end of file
@@ -0,0 +1,53 @@
+import time
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from sqlalchemy.orm import Session
+
+import app.services.dashboard as dashboard_service
+from app.core.database import get_db
+from app.core.deps import get_current_active_user
+from app.core.etag import check_etag
+from app.models.user import User
+
+router = APIRouter()
+
+
+@router.get("/dashboard", response_model=Dict[str, Any])
+def get_dashboard(
+    response: Response,
+    year: Optional[int] = Query(None, description="Year of budgets and summary (default: current)"),
+    month: Optional[int] = Query(
+        None, description="Month of budgets and summary (default: current)"
+    ),
+    recent: int = Query(6, ge=1, le=50, description="Number of recent expenses"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user),
+    _: str = Depends(check_etag),
+) -> Any:
+    """
+    Get everything the dashboard page shows in one request.
+
+    Authenticates once, then reads budget stats (with month-end forecasts
+    for the current month), the monthly summary, recent expenses and
+    categories concurrently on separate connections.
+    Per-section durations are reported in the Server-Timing header.
+    """
+    if month is not None and not 1 <= month <= 12:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Month must be between 1 and 12",
+        )
+    today = datetime.now()
+    started = time.perf_counter()
+    payload, timings = dashboard_service.build_dashboard(
+        db,
+        current_user,
+        year=year or today.year,
+        month=month or today.month,
+        recent_limit=recent,
+    )
+    timings["total"] = (time.perf_counter() - started) * 1000
+    response.headers["Server-Timing"] = dashboard_service.server_timing(timings)
+    return payload
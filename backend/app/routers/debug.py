@@ -1,6 +1,10 @@
 from fastapi import APIRouter, Depends, Request
 from fastapi.responses import JSONResponse
+from app.core.artifacts import artifact_cache
+from app.core.cache import summary_cache
 from app.core.config import settings
+from app.core.deps import get_current_admin_user
+from app.models.user import User
 from typing import Dict, Any
 
 router = APIRouter()
@@ -17,3 +21,9 @@ async def debug_info(request: Request) -> JSONResponse:
         "debug_mode": settings.DEBUG,
         "use_sqlite": settings.USE_SQLITE,
     })
+
+
+@router.get("/debug/cache", response_model=Dict[str, Any])
+def cache_stats(_: User = Depends(get_current_admin_user)) -> Dict[str, Any]:
+    """Hit, miss and eviction counters of this worker's summary and report caches."""
+    return {**summary_cache.stats(), "artifacts": artifact_cache.stats()}
@@ -1,24 +1,145 @@
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
 from typing import Any, List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
-from sqlalchemy import extract, func
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
 from sqlalchemy.orm import Session, joinedload
 
+import app.services.analytics as analytics_service
+import app.services.expense as expense_service
+import app.services.rollup as rollup_service
+from app.core.cache import cached_for_user
+from app.core.config import settings
 from app.core.database import get_db
 from app.core.deps import get_current_active_user, get_current_admin_user
+from app.core.etag import check_etag, etag_headers
 from app.models.category import Category
 from app.models.expense import Expense
 from app.models.user import User
+from app.schemas.expense import Expense as ExpenseSchema
 from app.schemas.expense import (
-    Expense as ExpenseSchema,
+    ExpenseBulkAffected,
+    ExpenseBulkCreate,
+    ExpenseBulkResult,
+    ExpenseBulkUpdate,
     ExpenseCreate,
+    ExpenseSelection,
     ExpenseUpdate,
     ExpenseWithCategory,
 )
+from app.services.user import bump_data_version
+from app.utils.pagination import decode_cursor, next_cursor
 
 router = APIRouter()
 
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+# Values accepted by the include and shape query parameters of listings
+LISTING_INCLUDES = {"categories", "totals"}
+LISTING_SHAPES = {"embedded", "normalized"}
+
+
+def _parse_cursor(cursor: Optional[str]):
+    """
+    Decode the cursor query parameter, turning malformed values into a 400.
+    """
+    if cursor is None:
+        return None
+    try:
+        return decode_cursor(cursor)
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor",
+        )
+
+
+def _expense_page_response(
+    rows: List[dict],
+    cursor_value: Optional[str],
+    normalized: bool = False,
+    categories: Optional[dict] = None,
+    totals: Optional[dict] = None,
+    etag: Optional[str] = None,
+) -> Response:
+    """
+    Build the JSON response for a page of expense rows, adding the next-page
+    cursor and caching headers.
+    """
+    headers = etag_headers(etag) if etag else {}
+    if cursor_value:
+        headers[NEXT_CURSOR_HEADER] = cursor_value
+    if normalized or totals is not None:
+        content = expense_service.serialize_expense_page(rows, normalized, categories, totals)
+    else:
+        content = expense_service.serialize_expense_rows(rows)
+    return Response(content=content, media_type="application/json", headers=headers)
+
+
+def _fetch_page(db: Session, filters: list, with_totals: bool, **options) -> tuple:
+    """
+    Fetch a listing page, with aggregates when requested.
+
+    Returns:
+        Tuple containing (rows, totals or None)
+    """
+    if with_totals:
+        return expense_service.list_expense_rows_with_totals(db, filters, **options)
+    return expense_service.list_expense_rows(db, filters, **options), None
+
+
+def _parse_include(include: Optional[str]) -> set:
+    """
+    Split the comma-separated include query parameter, rejecting unknown values.
+    """
+    if not include:
+        return set()
+    values = {value.strip() for value in include.split(",") if value.strip()}
+    unknown = values - LISTING_INCLUDES
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown include value(s): {', '.join(sorted(unknown))}",
+        )
+    return values
+
+
+def _parse_shape(shape: Optional[str]) -> bool:
+    """
+    Validate the shape query parameter and tell whether the listing is normalized.
+    """
+    if shape is None:
+        return False
+    if shape not in LISTING_SHAPES:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="shape must be 'embedded' or 'normalized'",
+        )
+    return shape == "normalized"
+
+
+def _parse_sort(sort: Optional[str], search: Optional[str], position) -> bool:
+    """
+    Validate the sort query parameter and tell whether to order by relevance.
+    """
+    if sort in (None, "date"):
+        return False
+    if sort != "relevance":
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="sort must be 'date' or 'relevance'",
+        )
+    if not search:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="sort=relevance requires a search term",
+        )
+    if position:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Cursor pagination is not available with sort=relevance",
+        )
+    return True
+
 
 @router.get("/", response_model=List[ExpenseWithCategory])
 def get_expenses(
@@ -30,57 +151,86 @@ def get_expenses(
     max_amount: Optional[float] = None,
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = Query(None, description="Opaque cursor from the X-Next-Cursor header"),
+    sort: Optional[str] = Query(None, description="'date' (default) or 'relevance' when searching"),
+    include: Optional[str] = Query(None, description="Comma-separated extras: 'categories', 'totals'"),
+    shape: Optional[str] = Query(None, description="'embedded' (default) or 'normalized'"),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user),
+    etag: str = Depends(check_etag),
 ) -> Any:
     """
     Get all expenses for the current user with optional filtering.
+
+    `search` matches words (and word prefixes) in the description and notes
+    using the full-text index when available. With sort=relevance the best
+    matches come first; cursor pagination is only available in date order.
+
+    Pages are ordered by (date, id) descending. When a page is full, the
+    cursor for the next page is returned in the X-Next-Cursor header; passing
+    it back as `cursor` continues after the last row without an OFFSET scan.
+    `skip` is still honoured when no cursor is given.
+
+    Rows are selected as plain columns and serialized directly in the
+    ExpenseWithCategory shape, without building ORM objects or validating
+    each row again.
+
+    With shape=normalized the body is {"expenses": [...]} where expenses
+    carry only category_id and the join is skipped; adding
+    include=categories side-loads each referenced category once in a
+    "categories" map keyed by id, fetched with a single IN query.
+
+    include=totals also wraps the page in {"expenses": [...]} and adds
+    total_count, total_amount and per-category facets for every expense
+    matching the filters (ignoring the cursor and skip), computed in the
+    same query as the page.
     """
+    position = _parse_cursor(cursor)
+    by_relevance = _parse_sort(sort, search, position)
+    includes = _parse_include(include)
+    normalized = _parse_shape(shape)
     try:
         print(f"Fetching expenses for user_id={current_user.id} with filters: "
               f"search={search}, category_id={category_id}, start_date={start_date}, end_date={end_date}, "
-              f"min_amount={min_amount}, max_amount={max_amount}, skip={skip}, limit={limit}")
-        
-        query = db.query(Expense).filter(Expense.user_id == current_user.id)
-        
-        # Apply filters if provided
-        if search:
-            search_term = f"%{search}%"
-            print(f"Searching for expenses with description like: {search_term}")
-            query = query.filter(Expense.description.ilike(search_term))
-        if category_id:
-            query = query.filter(Expense.category_id == category_id)
-        if start_date:
-            query = query.filter(Expense.date >= start_date)
-        if end_date:
-            query = query.filter(Expense.date <= end_date)
-        if min_amount:
-            query = query.filter(Expense.amount >= min_amount)
-        if max_amount:
-            query = query.filter(Expense.amount <= max_amount)
+              f"min_amount={min_amount}, max_amount={max_amount}, skip={skip}, limit={limit}, "
+              f"cursor={cursor}")
         
-        # Order by date (most recent first) and apply pagination
-        expenses = (
-            query.order_by(Expense.date.desc())
-            .options(joinedload(Expense.category))
-            .offset(skip)
-            .limit(limit)
-            .all()
+        filters = expense_service.build_expense_filters(
+            user_id=current_user.id,
+            category_id=category_id,
+            start_date=start_date,
+            end_date=end_date,
+            min_amount=min_amount,
+            max_amount=max_amount,
+        )
+        rows, totals = _fetch_page(
+            db,
+            filters,
+            with_totals="totals" in includes,
+            search=search,
+            skip=skip,
+            limit=limit,
+            position=position,
+            by_relevance=by_relevance,
+            with_category=not normalized,
         )
         
-        print(f"Found {len(expenses)} expenses for user_id={current_user.id}")
-        
-        # Check if categories are properly loaded
-        category_issues = 0
-        for expense in expenses:
-            if not hasattr(expense, 'category') or not expense.category:
-                category_issues += 1
-                print(f"Warning: Expense id={expense.id} has missing category (category_id={expense.category_id})")
+        print(f"Found {len(rows)} expenses for user_id={current_user.id}")
         
-        if category_issues > 0:
-            print(f"Warning: {category_issues} expenses have missing category relationships")
+        categories = None
+        if normalized and "categories" in includes:
+            categories = expense_service.load_categories(db, (row["category_id"] for row in rows))
         
-        return expenses
+        return _expense_page_response(
+            rows,
+            None if by_relevance else next_cursor(rows, limit),
+            normalized=normalized,
+            categories=categories,
+            totals=totals,
+            etag=etag,
+        )
+    except HTTPException:
+        raise
     except Exception as e:
         print(f"Error fetching expenses: {str(e)}")
         raise HTTPException(
@@ -123,6 +273,7 @@ def create_expense(
         
         print(f"Adding expense to database: {expense.__dict__}")
         db.add(expense)
+        bump_data_version(db, current_user.id)
         
         try:
             db.commit()
@@ -158,6 +309,167 @@ def create_expense(
         )
 
 
+@router.post("/bulk", response_model=ExpenseBulkResult)
+def create_expenses_bulk(
+    bulk_in: ExpenseBulkCreate,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user),
+) -> Any:
+    """
+    Create up to EXPENSE_BULK_MAX_ITEMS expenses in one request.
+
+    Items that fail validation or reference another user's category are
+    returned in `errors` with their index; the others are inserted in a
+    single statement and transaction and returned in request order.
+    """
+    if len(bulk_in.items) > settings.EXPENSE_BULK_MAX_ITEMS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {settings.EXPENSE_BULK_MAX_ITEMS} expenses can be created per request",
+        )
+    try:
+        created, errors = expense_service.bulk_create_expenses(
+            db, current_user.id, bulk_in.items
+        )
+    except Exception as e:
+        db.rollback()
+        print(f"Database error during bulk create: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Database error: {str(e)}",
+        )
+    
+    print(f"Bulk created {len(created)} expenses for user_id={current_user.id}, "
+          f"rejected {len(errors)}")
+    return {"created": created, "errors": errors}
+
+
+@router.patch("/bulk", response_model=ExpenseBulkAffected)
+def update_expenses_bulk(
+    bulk_in: ExpenseBulkUpdate,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user),
+) -> Any:
+    """
+    Apply the same changes to every expense matching ids and/or filters.
+
+    Runs as a single UPDATE scoped to the current user.
+    """
+    changes = bulk_in.changes.dict(exclude_unset=True)
+    if not changes:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="No changes given",
+        )
+    if "category_id" in changes:
+        category = (
+            db.query(Category)
+            .filter(Category.id == changes["category_id"], Category.user_id == current_user.id)
+            .first()
+        )
+        if not category:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Category not found or doesn't belong to the user",
+            )
+    
+    clauses = expense_service.selection_clauses(db, current_user.id, bulk_in)
+    try:
+        count = expense_service.bulk_update_expenses(db, current_user.id, clauses, changes)
+    except Exception as e:
+        db.rollback()
+        print(f"Database error during bulk update: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Database error: {str(e)}",
+        )
+    
+    print(f"Bulk updated {count} expenses for user_id={current_user.id}")
+    return {"affected": count}
+
+
+@router.delete("/bulk", response_model=ExpenseBulkAffected)
+def delete_expenses_bulk(
+    selection: ExpenseSelection,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user),
+) -> Any:
+    """
+    Delete every expense matching ids and/or filters.
+
+    Runs as a single DELETE scoped to the current user.
+    """
+    clauses = expense_service.selection_clauses(db, current_user.id, selection)
+    try:
+        count = expense_service.bulk_delete_expenses(db, current_user.id, clauses)
+    except Exception as e:
+        db.rollback()
+        print(f"Database error during bulk delete: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Database error: {str(e)}",
+        )
+    
+    print(f"Bulk deleted {count} expenses for user_id={current_user.id}")
+    return {"affected": count}
+
+
+@router.get("/timeseries", response_model=dict)
+def get_expense_timeseries(
+    granularity: str = Query("day", description="Bucket size: 'day', 'week' or 'month'"),
+    start: Optional[date] = Query(None, description="First day, inclusive (default: a year before end)"),
+    end: Optional[date] = Query(None, description="Last day, inclusive (default: today)"),
+    category_id: Optional[int] = None,
+    cumulative: bool = Query(False, description="Add the running total"),
+    moving_average: Optional[int] = Query(
+        None, ge=2, le=366, description="Add a trailing mean over this many buckets"
+    ),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user),
+    _: str = Depends(check_etag),
+) -> Any:
+    """
+    Get spending per day, week or month with empty buckets filled with zeros.
+
+    Returns parallel arrays (buckets, amounts, counts and the optional
+    cumulative/moving_average series), cached per user until their data
+    changes.
+    """
+    if granularity not in analytics_service.GRANULARITIES:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="granularity must be 'day', 'week' or 'month'",
+        )
+    end = end or date.today()
+    start = start or end - timedelta(days=365)
+    if start > end:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="start must not be after end",
+        )
+    if (end - start).days > analytics_service.MAX_RANGE_DAYS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Range must not exceed {analytics_service.MAX_RANGE_DAYS} days",
+        )
+    
+    return cached_for_user(
+        current_user,
+        "expenses.timeseries",
+        (granularity, start, end, category_id, cumulative, moving_average),
+        lambda: analytics_service.expense_timeseries(
+            db,
+            current_user.id,
+            granularity,
+            start,
+            end,
+            category_id=category_id,
+            cumulative=cumulative,
+            moving_average=moving_average,
+        ),
+    )
+
+
 @router.get("/{expense_id}", response_model=ExpenseWithCategory)
 def get_expense(
     expense_id: int,
@@ -220,6 +532,7 @@ def update_expense(
     for key, value in expense_in.dict(exclude_unset=True).items():
         setattr(expense, key, value)
     
+    bump_data_version(db, current_user.id)
     db.commit()
     db.refresh(expense)
     return expense
@@ -246,6 +559,7 @@ def delete_expense(
         )
     
     db.delete(expense)
+    bump_data_version(db, current_user.id)
     db.commit()
     return expense
 
@@ -256,54 +570,61 @@ def get_monthly_summary(
     month: Optional[int] = Query(None, description="Month to get summary for (1-12)"),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user),
+    _: str = Depends(check_etag),
 ) -> Any:
     """
     Get monthly summary of expenses by category.
+
+    Reads the per-month rollups, so the cost depends on the number of
+    categories rather than expenses, and caches the result per user until
+    their data changes.
     """
-    query = (
-        db.query(
-            Category.name,
-            Category.color,
-            func.sum(Expense.amount).label("total_amount"),
-        )
-        .join(Expense, Expense.category_id == Category.id)
-        .filter(
-            Expense.user_id == current_user.id,
-            extract('year', Expense.date) == year,
+    if month is not None and not 1 <= month <= 12:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Month must be between 1 and 12",
         )
-        .group_by(Category.name, Category.color)
-    )
-    
-    if month:
-        if month < 1 or month > 12:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Month must be between 1 and 12",
-            )
-        query = query.filter(extract('month', Expense.date) == month)
     
-    results = query.all()
-    
-    # Calculate total amount
-    total_amount = sum(result.total_amount for result in results)
-    
-    # Format the results
-    categories = [
-        {
-            "name": result.name,
-            "color": result.color,
-            "amount": result.total_amount,
-            "percentage": (result.total_amount / total_amount * 100) if total_amount > 0 else 0,
-        }
-        for result in results
-    ]
+    return cached_for_user(
+        current_user,
+        "expenses.summary.monthly",
+        (year, month),
+        lambda: rollup_service.monthly_summary(db, current_user.id, year, month),
+    )
+
+
+@router.get("/summary/compare", response_model=dict)
+def compare_summaries(
+    periods: str = Query(
+        ...,
+        description="Comma-separated periods (YYYY, YYYY-Qn or YYYY-MM); the first is compared with the others",
+    ),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user),
+    _: str = Depends(check_etag),
+) -> Any:
+    """
+    Compare spending per category across months, quarters or years.
+
+    All periods are aggregated by one query over the monthly rollups; the
+    result holds per-period amounts with deltas and percentage changes of
+    the first period against each of them, cached per user until their
+    data changes.
+    """
+    try:
+        parsed = analytics_service.parse_periods(periods)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e),
+        )
     
-    return {
-        "year": year,
-        "month": month,
-        "total_amount": total_amount,
-        "categories": categories,
-    }
+    return cached_for_user(
+        current_user,
+        "expenses.summary.compare",
+        tuple(period.label for period in parsed),
+        lambda: analytics_service.compare_periods(db, current_user.id, parsed),
+    )
 
 
 # Admin endpoint to get all expenses
@@ -316,34 +637,40 @@ def get_all_expenses(
     end_date: Optional[datetime] = None,
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = Query(None, description="Opaque cursor from the X-Next-Cursor header"),
+    include: Optional[str] = Query(None, description="Comma-separated extras: 'categories', 'totals'"),
+    shape: Optional[str] = Query(None, description="'embedded' (default) or 'normalized'"),
     db: Session = Depends(get_db),
     _: User = Depends(get_current_admin_user),  # Only admin can access
 ) -> Any:
     """
     Admin endpoint to get all expenses with optional filtering.
+    Supports the same cursor pagination and normalized shape as the user listing.
     """
-    query = db.query(Expense)
+    position = _parse_cursor(cursor)
+    includes = _parse_include(include)
+    normalized = _parse_shape(shape)
+    filters = expense_service.build_expense_filters(
+        user_id=user_id,
+        category_id=category_id,
+        start_date=start_date,
+        end_date=end_date,
+    )
+    rows, totals = _fetch_page(
+        db,
+        filters,
+        with_totals="totals" in includes,
+        search=search,
+        skip=skip,
+        limit=limit,
+        position=position,
+        with_category=not normalized,
+    )
     
-    # Apply filters if provided
-    if user_id:
-        query = query.filter(Expense.user_id == user_id)
-    if search:
-        search_term = f"%{search}%"
-        query = query.filter(Expense.description.ilike(search_term))
-    if category_id:
-        query = query.filter(Expense.category_id == category_id)
-    if start_date:
-        query = query.filter(Expense.date >= start_date)
-    if end_date:
-        query = query.filter(Expense.date <= end_date)
+    categories = None
+    if normalized and "categories" in includes:
+        categories = expense_service.load_categories(db, (row["category_id"] for row in rows))
     
-    # Order by date (most recent first) and apply pagination
-    expenses = (
-        query.order_by(Expense.date.desc())
-        .options(joinedload(Expense.category))
-        .offset(skip)
-        .limit(limit)
-        .all()
+    return _expense_page_response(
+        rows, next_cursor(rows, limit), normalized=normalized, categories=categories, totals=totals
     )
-    
-    return expenses 
\ No newline at end of file
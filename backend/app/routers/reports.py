@@ -1,24 +1,25 @@
-import csv
-import io
-from datetime import datetime, timedelta
+import os
+from datetime import datetime
 from typing import Any, Dict, List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
-from fastapi.responses import StreamingResponse
-from reportlab.lib import colors
-from reportlab.lib.pagesizes import letter
-from reportlab.lib.styles import getSampleStyleSheet
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph
-from sqlalchemy import extract, func
-from sqlalchemy.orm import Session, joinedload
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import FileResponse, StreamingResponse
+from sqlalchemy.orm import Session
+from starlette.background import BackgroundTask
 
+import app.services.report_jobs as report_jobs_service
+import app.services.rollup as rollup_service
+from app.core.artifacts import artifact_cache
+from app.core.cache import cached_for_user
+from app.core.config import settings
 from app.core.database import get_db
 from app.core.deps import get_current_active_user
-from app.models.category import Category
-from app.models.expense import Expense
+from app.core.etag import check_etag
 from app.models.user import User
-from app.schemas.expense import ExpenseWithCategory
-from app.services.export import generate_csv, generate_pdf
+from app.schemas.report_job import ReportJob as ReportJobSchema
+from app.schemas.report_job import ReportJobCreate
+from app.services.export import expense_report_filters, stream_expense_csv
+from app.services.render import RenderTimeoutError
 
 router = APIRouter()
 
@@ -33,44 +34,42 @@ def download_csv_report(
 ) -> Any:
     """
     Generate and download a CSV report of expenses with optional filtering.
+
+    Rows are read in batches of EXPORT_BATCH_SIZE and sent as they are
+    encoded, so memory use does not grow with the number of expenses. The
+    streamed file is kept in the artifact cache, and repeated requests are
+    served from it until the user's data changes.
     """
-    # Build query
-    query = db.query(Expense).filter(Expense.user_id == current_user.id)
-    
-    # Apply filters
-    if year:
-        query = query.filter(extract('year', Expense.date) == year)
-    if month:
-        query = query.filter(extract('month', Expense.date) == month)
-    if category_id:
-        query = query.filter(Expense.category_id == category_id)
-    
-    # Get expenses ordered by date with category info
-    expenses = query.options(joinedload(Expense.category)).order_by(Expense.date.desc()).all()
-    
-    # Generate CSV content
     try:
-        csv_content = generate_csv(expenses, current_user)
-        
-        # Return as downloadable file
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        period = f"{year or 'all'}" if not month else f"{year or 'all'}_{month:02d}"
-        filename = f"expense_report_{period}_{timestamp}.csv"
-        
-        return StreamingResponse(
-            iter([csv_content]), 
-            media_type="text/csv",
-            headers={"Content-Disposition": f"attachment; filename={filename}"}
-        )
-    except Exception as e:
-        print(f"Error generating CSV report: {str(e)}")
+        filters = expense_report_filters(current_user.id, year, month, category_id)
+    except ValueError as e:
         raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Failed to generate CSV report: {str(e)}"
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e),
         )
+    
+    # Return as downloadable file, generated while it is sent
+    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+    period = f"{year or 'all'}" if not month else f"{year or 'all'}_{month:02d}"
+    filename = f"expense_report_{period}_{timestamp}.csv"
+    headers = {"Content-Disposition": f"attachment; filename={filename}"}
+    
+    key = report_jobs_service.report_artifact_key(current_user, "csv", year, month, category_id)
+    cached = artifact_cache.get(key)
+    if cached:
+        return FileResponse(cached, media_type="text/csv", headers=headers)
+    
+    # Streamed as before, and stored for the next request unless reading failed
+    errors: List[Exception] = []
+    chunks = stream_expense_csv(db.get_bind(), filters, settings.EXPORT_BATCH_SIZE, errors.append)
+    return StreamingResponse(
+        artifact_cache.tee(key, chunks, lambda: not errors),
+        media_type="text/csv",
+        headers=headers,
+    )
 
 
-@router.get("/pdf", response_class=StreamingResponse)
+@router.get("/pdf", response_class=FileResponse)
 def download_pdf_report(
     year: int = Query(..., description="Year to generate report for"),
     month: Optional[int] = Query(None, description="Month to generate report for (1-12)"),
@@ -80,6 +79,12 @@ def download_pdf_report(
 ) -> Any:
     """
     Generate and download a PDF report of expenses for a specific year and optional month.
+
+    Expenses are read in batches; at most PDF_MAX_DETAIL_ROWS of them are
+    listed, older ones are summarized per month in an appendix. The PDF is
+    rendered by a worker process (see app/services/render.py), so the
+    layout work does not hold up other requests. Rendered reports are kept
+    in the artifact cache until the user's data changes.
     """
     # Validate month if provided
     if month is not None and (month < 1 or month > 12):
@@ -88,63 +93,33 @@ def download_pdf_report(
             detail="Month must be between 1 and 12",
         )
     
+    # Add category filter only if provided and valid
+    if category_id is not None and category_id <= 0:
+        category_id = None
+    
+    # Date range for the year, or the month when one is provided
     try:
-        # Build query
-        query = (
-            db.query(Expense)
-            .filter(
-                Expense.user_id == current_user.id,
-                extract('year', Expense.date) == year,
-            )
+        filters = expense_report_filters(current_user.id, year, month, category_id)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e),
         )
-        
-        # Only apply month filter if a valid month is provided
-        if month is not None and month >= 1 and month <= 12:
-            query = query.filter(extract('month', Expense.date) == month)
-            
-        # Add category filter if provided and valid
-        if category_id is not None and category_id > 0:
-            query = query.filter(Expense.category_id == category_id)
-        
-        # Get expenses with category information
-        expenses = query.options(joinedload(Expense.category)).order_by(Expense.date.desc()).all()
-        
-        # Get category summary
-        category_summary = (
-            db.query(
-                Category.name,
-                Category.color,
-                func.sum(Expense.amount).label("total_amount"),
-            )
-            .join(Expense, Expense.category_id == Category.id)
-            .filter(
-                Expense.user_id == current_user.id,
-                extract('year', Expense.date) == year,
-            )
+    
+    # Rendered by a worker process on a cache miss
+    key = report_jobs_service.report_artifact_key(current_user, "pdf", year, month, category_id)
+    try:
+        artifact = artifact_cache.get_or_create(
+            key,
+            lambda path: report_jobs_service.write_pdf_report(
+                db, current_user, year, month, category_id, filters, path
+            ),
         )
-        
-        # Only apply month filter to summary if a valid month is provided
-        if month is not None and month >= 1 and month <= 12:
-            category_summary = category_summary.filter(extract('month', Expense.date) == month)
-            
-        # Add category filter to summary if provided and valid
-        if category_id is not None and category_id > 0:
-            category_summary = category_summary.filter(Category.id == category_id)
-        
-        category_summary = category_summary.group_by(Category.name, Category.color).all()
-        
-        # Generate PDF content
-        pdf_content = generate_pdf(expenses, category_summary, year, month, current_user)
-        
-        # Return as downloadable file
-        period = f"{year}" if month is None or month < 1 or month > 12 else f"{year}_{month:02d}"
-        category_suffix = f"_category_{category_id}" if category_id is not None and category_id > 0 else ""
-        filename = f"expense_report_{period}{category_suffix}.pdf"
-        
-        return StreamingResponse(
-            iter([pdf_content]), 
-            media_type="application/pdf",
-            headers={"Content-Disposition": f"attachment; filename={filename}"}
+    except RenderTimeoutError as e:
+        print(f"Error generating PDF report: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_504_GATEWAY_TIMEOUT,
+            detail="Generating the PDF report took too long; try a shorter period",
         )
     except Exception as e:
         print(f"Error generating PDF report: {str(e)}")
@@ -152,6 +127,107 @@ def download_pdf_report(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to generate PDF report: {str(e)}"
         )
+    
+    # Return as downloadable file
+    filename = report_jobs_service.report_filename("pdf", year, month, category_id)
+    
+    return FileResponse(
+        artifact.path,
+        media_type="application/pdf",
+        headers={"Content-Disposition": f"attachment; filename={filename}"},
+        background=BackgroundTask(os.remove, artifact.path) if artifact.temporary else None,
+    )
+
+
+@router.post("/jobs", response_model=ReportJobSchema, status_code=status.HTTP_202_ACCEPTED)
+def create_report_job(
+    job_in: ReportJobCreate,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user),
+) -> Any:
+    """
+    Queue a CSV or PDF report to be rendered in the background.
+
+    Poll GET /jobs/{job_id} until its status is "succeeded", then download
+    the file from its download_url.
+    """
+    if job_in.month is not None and not 1 <= job_in.month <= 12:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Month must be between 1 and 12",
+        )
+    if job_in.format == "pdf" and job_in.year is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="PDF reports require a year",
+        )
+    try:
+        expense_report_filters(current_user.id, job_in.year, job_in.month, job_in.category_id)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e),
+        )
+    
+    return report_jobs_service.create_report_job(
+        db,
+        current_user.id,
+        job_in.format,
+        year=job_in.year,
+        month=job_in.month,
+        category_id=job_in.category_id,
+    )
+
+
+@router.get("/jobs/{job_id}", response_model=ReportJobSchema)
+def get_report_job(
+    job_id: str,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user),
+) -> Any:
+    """
+    Get the status and progress of a report job.
+    """
+    job = report_jobs_service.get_report_job(db, current_user.id, job_id)
+    if not job:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Report job not found",
+        )
+    return job
+
+
+@router.get("/jobs/{job_id}/download", response_class=FileResponse)
+def download_report_job(
+    job_id: str,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user),
+) -> Any:
+    """
+    Download the file of a finished report job, served from disk.
+    """
+    job = report_jobs_service.get_report_job(db, current_user.id, job_id)
+    if not job:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Report job not found",
+        )
+    if job.status != "succeeded":
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Report job is {job.status}",
+        )
+    if not os.path.exists(job.file_path):
+        raise HTTPException(
+            status_code=status.HTTP_410_GONE,
+            detail="Report file is no longer available",
+        )
+    
+    return FileResponse(
+        job.file_path,
+        media_type="text/csv" if job.format == "csv" else "application/pdf",
+        headers={"Content-Disposition": f"attachment; filename={job.filename}"},
+    )
 
 
 @router.post("/import/csv")
@@ -178,48 +254,15 @@ def import_expenses_from_csv(
     return {"detail": "CSV import functionality coming soon"}
 
 
-@router.get("/summary/annual", response_model=Dict[str, Any])
-def get_annual_summary(
-    year: int = Query(..., description="Year to get summary for"),
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user),
-) -> Any:
+def _annual_summary(db: Session, user_id: int, year: int) -> Dict[str, Any]:
     """
-    Get annual summary of expenses by month and category.
+    Build the annual summary payload from the rollups.
     """
-    # Get monthly totals
-    monthly_totals = (
-        db.query(
-            extract('month', Expense.date).label("month"),
-            func.sum(Expense.amount).label("total_amount"),
-        )
-        .filter(
-            Expense.user_id == current_user.id,
-            extract('year', Expense.date) == year,
-        )
-        .group_by(extract('month', Expense.date))
-        .order_by(extract('month', Expense.date))
-        .all()
-    )
-    
-    # Get category totals
-    category_totals = (
-        db.query(
-            Category.name,
-            Category.color,
-            func.sum(Expense.amount).label("total_amount"),
-        )
-        .join(Expense, Expense.category_id == Category.id)
-        .filter(
-            Expense.user_id == current_user.id,
-            extract('year', Expense.date) == year,
-        )
-        .group_by(Category.name, Category.color)
-        .all()
-    )
-    
-    # Calculate total amount for the year
-    total_amount = sum(item.total_amount for item in monthly_totals)
+    # Month, category and grand totals from one aggregation
+    breakdown = rollup_service.period_breakdown(db, user_id, year)
+    monthly_totals = breakdown.by_month
+    category_totals = breakdown.by_category
+    total_amount = breakdown.total
     
     # Format monthly data
     monthly_data = [
@@ -247,4 +290,25 @@ def get_annual_summary(
         "total_amount": total_amount,
         "monthly_data": monthly_data,
         "category_data": category_data,
-    } 
\ No newline at end of file
+    }
+
+
+@router.get("/summary/annual", response_model=Dict[str, Any])
+def get_annual_summary(
+    year: int = Query(..., description="Year to get summary for"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user),
+    _: str = Depends(check_etag),
+) -> Any:
+    """
+    Get annual summary of expenses by month and category.
+
+    Both breakdowns come from one aggregation over the per-month rollups;
+    the result is cached per user until their data changes.
+    """
+    return cached_for_user(
+        current_user,
+        "reports.summary.annual",
+        (year,),
+        lambda: _annual_summary(db, current_user.id, year),
+    )
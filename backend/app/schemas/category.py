@@ -2,6 +2,7 @@ from datetime import datetime
 from typing import Optional
 
 from pydantic import BaseModel
+from typing_extensions import TypedDict
 
 
 # Shared properties
@@ -58,4 +59,19 @@ class CategoryInDB(CategoryInDBBase):
     """
     Properties stored in DB.
     """
-    pass 
\ No newline at end of file
+    pass 
+
+
+# Plain row shape used by read paths that skip model validation
+class CategoryRow(TypedDict):
+    """
+    Category row as a plain dict, serialized without validation.
+    """
+    id: int
+    name: str
+    description: Optional[str]
+    color: Optional[str]
+    icon: Optional[str]
+    user_id: int
+    created_at: Optional[datetime]
+    updated_at: Optional[datetime]
@@ -1,9 +1,10 @@
 from datetime import datetime
-from typing import Optional
+from typing import Any, Dict, List, Optional
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, model_validator
+from typing_extensions import TypedDict
 
-from app.schemas.category import Category
+from app.schemas.category import Category, CategoryRow
 
 
 # Shared properties
@@ -30,6 +31,17 @@ class ExpenseCreate(ExpenseBase):
     category_id: int
 
 
+# Body of a bulk expense creation request
+class ExpenseBulkCreate(BaseModel):
+    """
+    Expenses to create in one request.
+
+    Items are validated one by one as ExpenseCreate by the endpoint, so
+    an invalid item is reported without rejecting the rest.
+    """
+    items: List[Dict[str, Any]] = Field(..., min_length=1)
+
+
 # Properties to receive on expense update
 class ExpenseUpdate(ExpenseBase):
     """
@@ -68,9 +80,153 @@ class ExpenseWithCategory(Expense):
     category: Category
 
 
+# Expenses targeted by a bulk update or delete
+class ExpenseSelection(BaseModel):
+    """
+    Either explicit ids, the same filters as the expense listing, or both.
+    """
+    ids: Optional[List[int]] = None
+    search: Optional[str] = None
+    category_id: Optional[int] = None
+    start_date: Optional[datetime] = None
+    end_date: Optional[datetime] = None
+    # Every amount is positive, so a lower bound of 0 or less selects everything
+    min_amount: Optional[float] = Field(None, gt=0)
+    max_amount: Optional[float] = None
+
+    @model_validator(mode="after")
+    def check_not_empty(self) -> "ExpenseSelection":
+        # An empty selection would touch every expense of the user
+        if self.search is not None and not self.search.strip():
+            raise ValueError("search cannot be blank")
+        filters = (
+            self.search, self.category_id, self.start_date, self.end_date,
+            self.min_amount, self.max_amount,
+        )
+        if self.ids is None and all(value is None for value in filters):
+            raise ValueError("Pass ids or at least one filter")
+        return self
+
+
+# Fields set by a bulk expense update
+class ExpenseBulkChanges(ExpenseUpdate):
+    """
+    Changes applied to every selected expense.
+
+    They are written with one UPDATE, without the per-row checks of a
+    single update, so required fields cannot be cleared.
+    """
+    amount: Optional[float] = Field(None, gt=0)
+
+    @model_validator(mode="after")
+    def check_required_not_null(self) -> "ExpenseBulkChanges":
+        for field in ("amount", "date", "category_id", "description"):
+            if field in self.model_fields_set and getattr(self, field) is None:
+                raise ValueError(f"{field} cannot be null")
+        return self
+
+
+# Body of a bulk expense update request
+class ExpenseBulkUpdate(ExpenseSelection):
+    """
+    Selection plus the fields to set on every selected expense.
+    """
+    changes: ExpenseBulkChanges
+
+
+# Number of expenses touched by a bulk update or delete
+class ExpenseBulkAffected(BaseModel):
+    """
+    Count of updated or deleted expenses.
+    """
+    affected: int
+
+
+# Why one item of a bulk request was rejected
+class BulkItemError(BaseModel):
+    """
+    Error for the item at index in the request's items.
+    """
+    index: int
+    detail: str
+
+
+# Result of a bulk expense creation request
+class ExpenseBulkResult(BaseModel):
+    """
+    Created expenses in request order, plus the rejected items.
+    """
+    created: List[Expense]
+    errors: List[BulkItemError]
+
+
 # Properties stored in DB
 class ExpenseInDB(ExpenseInDBBase):
     """
     Properties stored in DB.
     """
-    pass 
\ No newline at end of file
+    pass 
+
+
+# Plain row shape of Expense used by the listing fast path
+class ExpenseRow(TypedDict):
+    """
+    Expense as a plain dict, serialized without validation.
+    Must stay field-compatible with Expense.
+    """
+    id: int
+    amount: float
+    description: Optional[str]
+    date: datetime
+    currency: Optional[str]
+    notes: Optional[str]
+    attachment_url: Optional[str]
+    category_id: int
+    user_id: int
+    created_at: Optional[datetime]
+    updated_at: Optional[datetime]
+
+
+class ExpenseWithCategoryRow(ExpenseRow):
+    """
+    Expense with category as a plain dict, serialized without validation.
+    Must stay field-compatible with ExpenseWithCategory.
+    """
+    category: CategoryRow
+
+
+# Per-category count and amount for the active filter set
+class CategoryFacet(TypedDict):
+    """
+    Number and total amount of matching expenses in one category.
+    """
+    category_id: int
+    count: int
+    amount: float
+
+
+class ExpensePageTotals(TypedDict, total=False):
+    """
+    Aggregates over every expense matching the filters, not just the page.
+    """
+    total_count: int
+    total_amount: float
+    facets: List[CategoryFacet]
+
+
+# Body of expense listings requested with include=totals
+class ExpensePage(ExpensePageTotals, total=False):
+    """
+    Page of expenses with embedded categories plus aggregates.
+    """
+    expenses: List[ExpenseWithCategoryRow]
+
+
+# Body of expense listings requested with shape=normalized
+class NormalizedExpensePage(ExpensePageTotals, total=False):
+    """
+    Expenses referencing their category by id only, with each category
+    side-loaded once in a map keyed by id.
+    """
+    expenses: List[ExpenseRow]
+    categories: Dict[int, CategoryRow]
@@ -0,0 +1,42 @@
+from datetime import datetime
+from typing import Literal, Optional
+
+from pydantic import BaseModel, Field
+
+
+# Properties to receive on report job creation
+class ReportJobCreate(BaseModel):
+    """
+    A report to render in the background, with the parameters of
+    GET /api/reports/csv or GET /api/reports/pdf.
+    """
+
+    format: Literal["csv", "pdf"]
+    year: Optional[int] = Field(None, description="Year of the report (required for PDF)")
+    month: Optional[int] = Field(None, description="Month of the report (1-12)")
+    category_id: Optional[int] = Field(None, description="Category ID to filter expenses")
+
+
+# Properties to return to client
+class ReportJob(BaseModel):
+    """
+    Status of a report job.
+    """
+
+    id: str
+    format: str
+    year: Optional[int] = None
+    month: Optional[int] = None
+    category_id: Optional[int] = None
+    status: str
+    progress: float
+    rows: int
+    error: Optional[str] = None
+    filename: str
+    download_url: Optional[str] = None
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
@@ -0,0 +1,470 @@
+from datetime import date, datetime, time, timedelta
+from typing import Any, Dict, List, NamedTuple, Optional
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import Date, case, cast, func, select
+from sqlalchemy.orm import Session
+
+from app.models.category import Category
+from app.models.expense import Expense
+from app.models.expense_rollup import ExpenseRollup
+
+# pandas resampling rule per granularity; weeks start on Monday
+GRANULARITIES = {"day": "D", "week": "W-MON", "month": "MS"}
+
+# Longest range accepted, in days (about 20 years of daily buckets)
+MAX_RANGE_DAYS = 366 * 20
+
+
+def _day_bucket(db: Session) -> Any:
+    """
+    SQL expression truncating Expense.date to its day.
+    """
+    dialect = db.get_bind().dialect.name
+    if dialect == "sqlite":
+        return func.date(Expense.date)
+    if dialect == "postgresql":
+        return func.date_trunc("day", Expense.date)
+    return cast(Expense.date, Date)
+
+
+def daily_totals(
+    db: Session,
+    user_id: int,
+    start: date,
+    end: date,
+    category_id: Optional[int] = None,
+) -> pd.DataFrame:
+    """
+    Spending per day with at least one expense, aggregated in the database.
+
+    Args:
+        db: Database session
+        user_id: User ID
+        start: First day, inclusive
+        end: Last day, inclusive
+        category_id: Optional category filter
+
+    Returns:
+        DataFrame indexed by day with amount and count columns
+    """
+    day = _day_bucket(db).label("day")
+    query = (
+        select(day, func.sum(Expense.amount), func.count(Expense.id))
+        .where(
+            Expense.user_id == user_id,
+            Expense.date >= datetime.combine(start, time.min),
+            Expense.date < datetime.combine(end + timedelta(days=1), time.min),
+        )
+        .group_by(day)
+    )
+    if category_id is not None:
+        query = query.where(Expense.category_id == category_id)
+    rows = db.execute(query).all()
+
+    frame = pd.DataFrame(rows, columns=["day", "amount", "count"])
+    frame.index = pd.to_datetime(frame.pop("day")).dt.normalize()
+    return frame.astype({"amount": "float64", "count": "int64"})
+
+
+def monthly_rollup_totals(
+    db: Session,
+    user_id: int,
+    start: date,
+    end: date,
+    category_id: Optional[int] = None,
+) -> pd.DataFrame:
+    """
+    Spending per month from the monthly rollups, for whole-month ranges.
+
+    Returns:
+        DataFrame indexed by the first day of each month with spending,
+        with amount and count columns, like daily_totals
+    """
+    month_index = ExpenseRollup.year * 12 + ExpenseRollup.month - 1
+    query = (
+        select(
+            ExpenseRollup.year,
+            ExpenseRollup.month,
+            func.sum(ExpenseRollup.total),
+            func.sum(ExpenseRollup.count),
+        )
+        .where(
+            ExpenseRollup.user_id == user_id,
+            ExpenseRollup.year.between(start.year, end.year),
+            month_index >= start.year * 12 + start.month - 1,
+            month_index <= end.year * 12 + end.month - 1,
+        )
+        .group_by(ExpenseRollup.year, ExpenseRollup.month)
+    )
+    if category_id is not None:
+        query = query.where(ExpenseRollup.category_id == category_id)
+    rows = db.execute(query).all()
+
+    frame = pd.DataFrame(rows, columns=["year", "month", "amount", "count"])
+    months = (frame.pop("year") - 1970) * 12 + frame.pop("month") - 1
+    frame.index = pd.DatetimeIndex(months.to_numpy(dtype=np.int64).astype("datetime64[M]"))
+    return frame.astype({"amount": "float64", "count": "int64"})
+
+
+def _whole_months(start: date, end: date) -> bool:
+    """
+    Tell whether [start, end] starts and ends on month boundaries.
+    """
+    return start.day == 1 and (end + timedelta(days=1)).day == 1
+
+
+def build_timeseries(
+    daily: pd.DataFrame,
+    granularity: str,
+    start: date,
+    end: date,
+    cumulative: bool = False,
+    moving_average: Optional[int] = None,
+) -> Dict[str, Any]:
+    """
+    Zero-fill daily totals over [start, end] and bucket them.
+
+    Args:
+        daily: Output of daily_totals or monthly_rollup_totals
+        granularity: "day", "week" or "month"
+        start: First day, inclusive
+        end: Last day, inclusive
+        cumulative: Add the running total of amounts
+        moving_average: Add the mean of amounts over this many buckets
+
+    Returns:
+        Columnar payload: buckets (bucket start dates) plus parallel
+        amounts, counts and the optional series
+    """
+    days = pd.date_range(start, end, freq="D")
+    filled = daily.reindex(days, fill_value=0)
+    if granularity != "day":
+        filled = filled.resample(GRANULARITIES[granularity], label="left", closed="left").sum()
+
+    amounts = filled["amount"].to_numpy(dtype=np.float64)
+    result: Dict[str, Any] = {
+        "granularity": granularity,
+        "start": start.isoformat(),
+        "end": end.isoformat(),
+        "buckets": filled.index.strftime("%Y-%m-%d").tolist(),
+        "amounts": amounts.round(2).tolist(),
+        "counts": filled["count"].to_numpy(dtype=np.int64).tolist(),
+    }
+    if cumulative:
+        result["cumulative"] = np.cumsum(amounts).round(2).tolist()
+    if moving_average:
+        # Trailing mean; the first buckets average over what is available
+        window = np.ones(moving_average)
+        sums = np.convolve(amounts, window)[: len(amounts)]
+        sizes = np.minimum(np.arange(1, len(amounts) + 1), moving_average)
+        result["moving_average"] = (sums / sizes).round(2).tolist()
+    return result
+
+
+def expense_timeseries(
+    db: Session,
+    user_id: int,
+    granularity: str,
+    start: date,
+    end: date,
+    category_id: Optional[int] = None,
+    cumulative: bool = False,
+    moving_average: Optional[int] = None,
+) -> Dict[str, Any]:
+    """
+    Zero-filled spending per day, week or month between two dates.
+
+    The database returns one row per day with spending, or per month from
+    the rollups when monthly buckets cover whole months; filling the gaps,
+    bucketing and the running series are vectorized in pandas/NumPy.
+
+    Returns:
+        Payload described in build_timeseries
+    """
+    if granularity == "month" and _whole_months(start, end):
+        daily = monthly_rollup_totals(db, user_id, start, end, category_id)
+    else:
+        daily = daily_totals(db, user_id, start, end, category_id)
+    return build_timeseries(daily, granularity, start, end, cumulative, moving_average)
+
+
+# Days of history behind the weekday and exponentially weighted forecasts
+FORECAST_HISTORY_DAYS = 56
+
+# Weight of the most recent day in the exponentially weighted daily rate
+FORECAST_EWMA_ALPHA = 0.2
+
+
+def category_daily_spend(
+    db: Session, user_id: int, category_ids: List[int], start: date, end: date
+) -> np.ndarray:
+    """
+    Daily spending of several categories as a matrix, from one grouped query.
+
+    Args:
+        db: Database session
+        user_id: User ID
+        category_ids: Categories, one matrix row each in this order
+        start: First day, inclusive
+        end: Last day, inclusive
+
+    Returns:
+        Array of shape (len(category_ids), days in [start, end])
+    """
+    matrix = np.zeros((len(category_ids), (end - start).days + 1))
+    if not category_ids:
+        return matrix
+    day = _day_bucket(db).label("day")
+    rows = db.execute(
+        select(Expense.category_id, day, func.sum(Expense.amount))
+        .where(
+            Expense.user_id == user_id,
+            Expense.category_id.in_(category_ids),
+            Expense.date >= datetime.combine(start, time.min),
+            Expense.date < datetime.combine(end + timedelta(days=1), time.min),
+        )
+        .group_by(Expense.category_id, day)
+    ).all()
+    if not rows:
+        return matrix
+
+    position = {category_id: index for index, category_id in enumerate(category_ids)}
+    categories, days, amounts = zip(*rows)
+    # Day strings (SQLite) and truncated datetimes (PostgreSQL) both convert
+    offsets = (np.array(days, dtype="datetime64[D]") - np.datetime64(start, "D")).astype(np.int64)
+    np.add.at(
+        matrix,
+        (np.array([position[c] for c in categories]), offsets),
+        np.array(amounts, dtype=np.float64),
+    )
+    return matrix
+
+
+def forecast_month_end(
+    history: np.ndarray, spent: np.ndarray, history_start: date, today: date
+) -> Dict[str, np.ndarray]:
+    """
+    Project month-end spending of several categories at once.
+
+    Three models extend the spending so far over the rest of the month:
+
+    - linear: the month-to-date daily burn rate
+    - weekday: the mean spend of each weekday over the history window,
+      summed over the weekdays left in the month
+    - ewma: an exponentially weighted daily rate, favouring recent days
+
+    Args:
+        history: Daily spend, shape (categories, days), ending today
+        spent: Spending so far this month per category
+        history_start: Day of the first history column
+        today: Day of the last history column
+
+    Returns:
+        Dict with daily_burn_rate, days_remaining and the linear, weekday
+        and ewma projections, each an array per category
+    """
+    days = history.shape[1]
+    elapsed = today.day
+    days_in_month = pd.Timestamp(today).days_in_month
+    remaining = days_in_month - elapsed
+
+    burn_rate = history[:, -elapsed:].sum(axis=1) / elapsed
+
+    weekdays = (history_start.weekday() + np.arange(days)) % 7
+    weekday_totals = history @ np.eye(7)[weekdays]
+    weekday_means = weekday_totals / np.maximum(np.bincount(weekdays, minlength=7), 1)
+    remaining_weekdays = np.bincount((today.weekday() + np.arange(1, remaining + 1)) % 7, minlength=7)
+
+    weights = (1 - FORECAST_EWMA_ALPHA) ** np.arange(days)[::-1]
+    ewma_rate = history @ (weights / weights.sum())
+
+    return {
+        "daily_burn_rate": burn_rate,
+        "days_remaining": np.full(len(spent), remaining),
+        "linear": spent + burn_rate * remaining,
+        "weekday": spent + weekday_means @ remaining_weekdays,
+        "ewma": spent + ewma_rate * remaining,
+    }
+
+
+def add_budget_forecasts(db: Session, user_id: int, budgets: List[Dict[str, Any]], today: date) -> None:
+    """
+    Add month-end forecasts to budget stats of the month containing today.
+
+    All budgets are projected together from one daily aggregate query.
+
+    Args:
+        db: Database session
+        user_id: User ID
+        budgets: Budget dicts from get_budgets_with_stats, updated in place
+        today: Current day
+    """
+    if not budgets:
+        return
+    category_ids = [budget["category_id"] for budget in budgets]
+    history_start = min(today.replace(day=1), today - timedelta(days=FORECAST_HISTORY_DAYS - 1))
+    history = category_daily_spend(db, user_id, category_ids, history_start, today)
+    spent = np.array([budget["spent_amount"] for budget in budgets], dtype=np.float64)
+    forecast = forecast_month_end(history, spent, history_start, today)
+
+    for index, budget in enumerate(budgets):
+        budget["daily_burn_rate"] = round(float(forecast["daily_burn_rate"][index]), 2)
+        budget["days_remaining"] = int(forecast["days_remaining"][index])
+        budget["forecast"] = {
+            model: round(float(forecast[model][index]), 2) for model in ("linear", "weekday", "ewma")
+        }
+
+
+# Most periods accepted by one comparison
+MAX_COMPARE_PERIODS = 24
+
+
+class Period(NamedTuple):
+    """
+    A year, quarter or month as an inclusive range of month indexes.
+
+    Month indexes count months from year 0 (year * 12 + month - 1), so any
+    period is a contiguous range of them.
+    """
+
+    label: str
+    first: int
+    last: int
+
+    @property
+    def start(self) -> date:
+        return date(self.first // 12, self.first % 12 + 1, 1)
+
+    @property
+    def end(self) -> date:
+        following = self.last + 1
+        return date(following // 12, following % 12 + 1, 1) - timedelta(days=1)
+
+
+def parse_period(text: str) -> Period:
+    """
+    Parse a period written as YYYY, YYYY-Qn or YYYY-MM.
+
+    Raises:
+        ValueError: If the period is malformed or out of range
+    """
+    text = text.strip().upper()
+    year_text, _, part = text.partition("-")
+    if len(year_text) != 4 or not year_text.isdigit() or not 1 <= int(year_text) <= 9998:
+        raise ValueError(f"Invalid period '{text}', expected YYYY, YYYY-Qn or YYYY-MM")
+    year = int(year_text)
+    if not part:
+        return Period(f"{year:04d}", year * 12, year * 12 + 11)
+    if part.startswith("Q") and part[1:] in ("1", "2", "3", "4"):
+        quarter = int(part[1:])
+        return Period(f"{year:04d}-Q{quarter}", year * 12 + quarter * 3 - 3, year * 12 + quarter * 3 - 1)
+    if len(part) == 2 and part.isdigit() and 1 <= int(part) <= 12:
+        month = int(part)
+        return Period(f"{year:04d}-{month:02d}", year * 12 + month - 1, year * 12 + month - 1)
+    raise ValueError(f"Invalid period '{text}', expected YYYY, YYYY-Qn or YYYY-MM")
+
+
+def parse_periods(text: str) -> List[Period]:
+    """
+    Parse a comma-separated list of periods, see parse_period.
+
+    Raises:
+        ValueError: If a period is invalid or the count is out of range
+    """
+    periods = [parse_period(part) for part in text.split(",") if part.strip()]
+    if not periods:
+        raise ValueError("At least one period is required")
+    if len(periods) > MAX_COMPARE_PERIODS:
+        raise ValueError(f"At most {MAX_COMPARE_PERIODS} periods can be compared")
+    return periods
+
+
+def _changes(amounts: np.ndarray) -> Dict[str, List[Any]]:
+    """
+    Deltas and percentage changes of the first column against every column.
+
+    Percentage changes are None where the compared amount is zero.
+    """
+    deltas = amounts[:, :1] - amounts
+    with np.errstate(divide="ignore", invalid="ignore"):
+        percent = np.where(amounts != 0, deltas / amounts * 100, np.nan).round(2)
+    return {
+        "amounts": amounts.round(2).tolist(),
+        "deltas": deltas.round(2).tolist(),
+        "percent_changes": [
+            [None if np.isnan(value) else value for value in row] for row in percent.tolist()
+        ],
+    }
+
+
+def compare_periods(db: Session, user_id: int, periods: List[Period]) -> Dict[str, Any]:
+    """
+    Spending per category across several periods, compared with the first.
+
+    One query over the monthly rollups covers the span of all periods and
+    sums each period in its own conditional aggregate; deltas and
+    percentage changes are then computed for every category at once.
+
+    Args:
+        db: Database session
+        user_id: User ID
+        periods: Periods to compare; the first is the base
+
+    Returns:
+        Dict with the periods (label, start, end, total_amount), the base
+        period, per-category amounts, deltas and percent_changes aligned
+        with the periods, and the same series for the totals. A delta is
+        the base amount minus the period's amount.
+    """
+    month_index = ExpenseRollup.year * 12 + ExpenseRollup.month - 1
+    first = min(period.first for period in periods)
+    last = max(period.last for period in periods)
+    rows = db.execute(
+        select(
+            Category.name,
+            Category.color,
+            *(
+                func.sum(case((month_index.between(period.first, period.last), ExpenseRollup.total), else_=0.0))
+                for period in periods
+            ),
+        )
+        .join(ExpenseRollup, ExpenseRollup.category_id == Category.id)
+        .where(
+            ExpenseRollup.user_id == user_id,
+            ExpenseRollup.year.between(first // 12, last // 12),
+            month_index.between(first, last),
+        )
+        .group_by(Category.name, Category.color)
+    ).all()
+
+    # The span may include months outside every period
+    rows = sorted(
+        (row for row in rows if any(row[2:])), key=lambda row: (row[0], row[1] or "")
+    )
+    matrix = np.array([row[2:] for row in rows], dtype=np.float64).reshape(len(rows), len(periods))
+    totals = matrix.sum(axis=0)
+    changes = _changes(np.vstack([matrix, totals]))
+
+    return {
+        "base": periods[0].label,
+        "periods": [
+            {
+                "period": period.label,
+                "start": period.start.isoformat(),
+                "end": period.end.isoformat(),
+                "total_amount": round(float(total), 2),
+            }
+            for period, total in zip(periods, totals)
+        ],
+        "categories": [
+            {
+                "name": row[0],
+                "color": row[1],
+                **{key: series[index] for key, series in changes.items()},
+            }
+            for index, row in enumerate(rows)
+        ],
+        "totals": {key: series[-1] for key, series in changes.items()},
+    }
@@ -1,16 +1,17 @@
 from datetime import datetime
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, List, Optional
 
-from sqlalchemy import and_, extract, func, text
-from sqlalchemy.orm import Session, joinedload
+from sqlalchemy import func, select, text
+from sqlalchemy.orm import Session
 from fastapi import HTTPException, status
 import traceback
 
 from app.models.budget import Budget
 from app.models.category import Category
-from app.models.expense import Expense
 from app.schemas.budget import BudgetCreate, BudgetUpdate
-from app.utils.date import get_month_date_range
+from app.services.analytics import add_budget_forecasts
+from app.services.rollup import category_spend_subquery
+from app.services.user import bump_data_version
 
 
 def get_budget(db: Session, budget_id: int, user_id: int) -> Optional[Budget]:
@@ -150,6 +151,7 @@ def create_budget(db: Session, budget_in: BudgetCreate, user_id: int) -> Budget:
         print(f"Budget inserted with ID: {budget_id}")
         
         # Commit the transaction
+        bump_data_version(db, user_id)
         db.commit()
         print("Transaction committed")
         
@@ -198,6 +200,7 @@ def update_budget(
         if value is not None:
             setattr(budget, key, value)
     
+    bump_data_version(db, user_id)
     db.commit()
     db.refresh(budget)
     return budget
@@ -212,6 +215,7 @@ def delete_budget(db: Session, budget_id: int, user_id: int) -> bool:
         return False
     
     db.delete(budget)
+    bump_data_version(db, user_id)
     db.commit()
     return True
 
@@ -225,63 +229,58 @@ def get_budgets_with_stats(
 ) -> List[Dict[str, Any]]:
     """
     Get budgets with spending statistics for a specific period.
+
+    Budgets, their categories and the period's spend per category are read
+    in one statement, regardless of how many budgets match.
     """
-    # Build query for budgets with categories
+    spend = category_spend_subquery(user_id, year, month or None)
     query = (
-        db.query(Budget)
+        select(
+            Budget.id,
+            Budget.amount,
+            Budget.year,
+            Budget.month,
+            Budget.period,
+            Budget.currency,
+            Budget.category_id,
+            Category.name,
+            Category.color,
+            func.coalesce(spend.c.spent, 0.0),
+        )
         .join(Category, Budget.category_id == Category.id)
-        .filter(
+        .outerjoin(spend, spend.c.category_id == Budget.category_id)
+        .where(
             Budget.user_id == user_id,
             Budget.year == year,
         )
-        .options(joinedload(Budget.category))
     )
     
     # Apply additional filters
     if month:
-        query = query.filter(Budget.month == month)
+        query = query.where(Budget.month == month)
     if category_id:
-        query = query.filter(Budget.category_id == category_id)
-    
-    # Get all matching budgets
-    budgets = query.all()
-    
-    # Build date range filter for expenses
-    date_filters = [extract('year', Expense.date) == year]
-    if month:
-        date_filters.append(extract('month', Expense.date) == month)
+        query = query.where(Budget.category_id == category_id)
     
     # Build result list with spending stats
     result = []
-    for budget in budgets:
-        # Query to get total expenses for this category in this period
-        expenses_query = (
-            db.query(func.sum(Expense.amount).label("total"))
-            .filter(
-                Expense.user_id == user_id,
-                Expense.category_id == budget.category_id,
-                *date_filters
-            )
-        )
-        
-        # Execute query and get amount
-        total_expenses = expenses_query.scalar() or 0.0
+    for row in db.execute(query):
+        amount, total_expenses = row[1], row[9]
         
         # Calculate stats
-        remaining_amount = budget.amount - total_expenses
-        percentage_used = (total_expenses / budget.amount * 100) if budget.amount > 0 else 0
+        remaining_amount = amount - total_expenses
+        percentage_used = (total_expenses / amount * 100) if amount > 0 else 0
         
         # Create budget dict with stats
         budget_dict = {
-            "id": budget.id,
-            "amount": budget.amount,
-            "year": budget.year,
-            "month": budget.month,
-            "period": budget.period,
-            "currency": budget.currency,
-            "category_id": budget.category_id,
-            "category_name": budget.category.name,
-            "category_color": budget.category.color,
+            "id": row[0],
+            "amount": amount,
+            "year": row[2],
+            "month": row[3],
+            "period": row[4],
+            "currency": row[5],
+            "category_id": row[6],
+            "category_name": row[7],
+            "category_color": row[8],
             "spent_amount": total_expenses,
             "remaining_amount": remaining_amount,
             "percentage_used": percentage_used,
@@ -294,7 +293,9 @@ def get_budgets_with_stats(
 
 def get_current_budgets(db: Session, user_id: int) -> List[Dict[str, Any]]:
     """
-    Get budgets for the current month with spending statistics.
+    Get budgets for the current month with spending statistics and
+    month-end forecasts (daily_burn_rate, days_remaining and forecast with
+    linear, weekday and ewma projections).
     """
     # Get current year and month
     current_date = datetime.now()
@@ -302,9 +303,11 @@ def get_current_budgets(db: Session, user_id: int) -> List[Dict[str, Any]]:
     current_month = current_date.month
     
     # Call the generic function with current period
-    return get_budgets_with_stats(
+    budgets = get_budgets_with_stats(
         db, 
         user_id, 
         year=current_year, 
         month=current_month
-    ) 
\ No newline at end of file
+    )
+    add_budget_forecasts(db, user_id, budgets, current_date.date())
+    return budgets
@@ -0,0 +1,27 @@
+from typing import Any, Dict, List
+
+from sqlalchemy.orm import Session
+
+from app.models.category import Category
+from app.schemas.category import Category as CategorySchema
+
+
+def list_categories(
+    db: Session, user_id: int, skip: int = 0, limit: int = 100
+) -> List[Dict[str, Any]]:
+    """
+    Get a user's categories as plain dicts, ready to cache and serialize.
+
+    Args:
+        db: Database session
+        user_id: User ID
+        skip: Number of categories to skip
+        limit: Maximum number of categories to return
+
+    Returns:
+        List of category dicts
+    """
+    categories = (
+        db.query(Category).filter(Category.user_id == user_id).offset(skip).limit(limit).all()
+    )
+    return [CategorySchema.model_validate(category).model_dump() for category in categories]
@@ -0,0 +1,120 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, Callable, Dict, Tuple
+
+from sqlalchemy.orm import Session, sessionmaker
+
+import app.services.budget as budget_service
+import app.services.category as category_service
+import app.services.expense as expense_service
+import app.services.rollup as rollup_service
+from app.core.cache import cached_for_user
+from app.core.config import settings
+from app.models.user import User
+
+# Shared by all dashboard requests; each section borrows a thread and its own
+# pooled connection
+_executor = ThreadPoolExecutor(
+    max_workers=settings.DASHBOARD_MAX_WORKERS, thread_name_prefix="dashboard"
+)
+
+
+def _budgets_section(user: User, year: int, month: int) -> Callable[[Session], Any]:
+    """
+    Budgets of the month as GET /budgets/overview/current returns them for
+    the current month, with forecasts, and as GET /budgets/stats does for
+    other months, which have nothing left to forecast.
+    """
+    today = datetime.now().date()
+    if (year, month) == (today.year, today.month):
+        return lambda db: cached_for_user(
+            user,
+            "budgets.overview.current",
+            (today.isoformat(),),
+            lambda: budget_service.get_current_budgets(db, user.id),
+        )
+    return lambda db: cached_for_user(
+        user,
+        "budgets.stats",
+        (year, month, None),
+        lambda: budget_service.get_budgets_with_stats(db, user.id, year=year, month=month),
+    )
+
+
+def _sections(
+    user: User, year: int, month: int, recent_limit: int
+) -> Dict[str, Callable[[Session], Any]]:
+    """
+    The dashboard reads, each taking its own session.
+
+    Sections backed by a standalone endpoint share its cache entries.
+    """
+    return {
+        "budgets": _budgets_section(user, year, month),
+        "summary": lambda db: cached_for_user(
+            user,
+            "expenses.summary.monthly",
+            (year, month),
+            lambda: rollup_service.monthly_summary(db, user.id, year, month),
+        ),
+        "recent_expenses": lambda db: expense_service.list_expense_rows(
+            db, expense_service.build_expense_filters(user_id=user.id), limit=recent_limit
+        ),
+        "categories": lambda db: cached_for_user(
+            user,
+            "categories.list",
+            (0, 100),
+            lambda: category_service.list_categories(db, user.id),
+        ),
+    }
+
+
+def build_dashboard(
+    db: Session, user: User, year: int, month: int, recent_limit: int
+) -> Tuple[Dict[str, Any], Dict[str, float]]:
+    """
+    Run the dashboard reads concurrently and collect them into one payload.
+
+    Every section runs in a worker thread with a session of its own, bound
+    to the same engine as db, so the reads use separate connections.
+
+    Args:
+        db: Request session; only its engine is used
+        user: Authenticated user, loaded once for all sections
+        year: Year of the budgets and summary
+        month: Month of the budgets and summary
+        recent_limit: Number of recent expenses
+
+    Returns:
+        (payload, timings) where timings maps section name to milliseconds
+
+    Raises:
+        Exception: The first error raised by a section
+    """
+    SectionSession = sessionmaker(autocommit=False, autoflush=False, bind=db.get_bind())
+
+    def run(read: Callable[[Session], Any]) -> Tuple[Any, float]:
+        started = time.perf_counter()
+        session = SectionSession()
+        try:
+            return read(session), (time.perf_counter() - started) * 1000
+        finally:
+            session.close()
+
+    futures = {
+        name: _executor.submit(run, read)
+        for name, read in _sections(user, year, month, recent_limit).items()
+    }
+    payload: Dict[str, Any] = {"year": year, "month": month}
+    timings: Dict[str, float] = {}
+    for name, future in futures.items():
+        payload[name], timings[name] = future.result()
+    return payload, timings
+
+
+def server_timing(timings: Dict[str, float]) -> str:
+    """
+    Format section timings as a Server-Timing header value.
+    """
+    return ", ".join(f"{name};dur={duration:.1f}" for name, duration in timings.items())
@@ -0,0 +1,536 @@
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from pydantic import TypeAdapter, ValidationError
+from sqlalchemy import Float, Integer, cast, delete, func, insert, literal, null, select, union_all, update
+from sqlalchemy.orm import Session
+
+from app.models.category import Category
+from app.models.expense import Expense
+from app.schemas.expense import (
+    ExpenseCreate,
+    ExpenseSelection,
+    ExpensePage,
+    ExpenseWithCategoryRow,
+    NormalizedExpensePage,
+)
+from app.services.rollup import DEFAULT_CURRENCY, RollupDeltas, apply_deltas, grouped_deltas
+from app.services.search import search_filter
+from app.services.user import bump_data_version
+from app.utils.pagination import keyset_after
+
+# Columns fetched by the listing fast path, in the order they are read back
+EXPENSE_COLUMNS = (
+    Expense.id,
+    Expense.amount,
+    Expense.description,
+    Expense.date,
+    Expense.currency,
+    Expense.notes,
+    Expense.attachment_url,
+    Expense.category_id,
+    Expense.user_id,
+    Expense.created_at,
+    Expense.updated_at,
+)
+CATEGORY_COLUMNS = (
+    Category.id,
+    Category.name,
+    Category.description,
+    Category.color,
+    Category.icon,
+    Category.user_id,
+    Category.created_at,
+    Category.updated_at,
+)
+
+# Expense fields that determine rollup rows or their totals
+ROLLUP_FIELDS = {"amount", "date", "category_id", "currency"}
+
+# Built once; serializes plain dicts straight to JSON bytes without validation
+expense_rows_adapter = TypeAdapter(List[ExpenseWithCategoryRow])
+expense_page_adapter = TypeAdapter(ExpensePage)
+normalized_page_adapter = TypeAdapter(NormalizedExpensePage)
+
+
+def _expense_row(row: Any) -> Dict[str, Any]:
+    """
+    Map a result row starting with EXPENSE_COLUMNS to an expense dict.
+    """
+    return {
+        "id": row[0],
+        "amount": row[1],
+        "description": row[2],
+        "date": row[3],
+        "currency": row[4],
+        "notes": row[5],
+        "attachment_url": row[6],
+        "category_id": row[7],
+        "user_id": row[8],
+        "created_at": row[9],
+        "updated_at": row[10],
+    }
+
+
+def _category_row(row: Any, offset: int = 0) -> Dict[str, Any]:
+    """
+    Map CATEGORY_COLUMNS starting at offset in a result row to a category dict.
+    """
+    return {
+        "id": row[offset],
+        "name": row[offset + 1],
+        "description": row[offset + 2],
+        "color": row[offset + 3],
+        "icon": row[offset + 4],
+        "user_id": row[offset + 5],
+        "created_at": row[offset + 6],
+        "updated_at": row[offset + 7],
+    }
+
+
+def build_expense_filters(
+    user_id: Optional[int] = None,
+    category_id: Optional[int] = None,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    min_amount: Optional[float] = None,
+    max_amount: Optional[float] = None,
+) -> List[Any]:
+    """
+    Build the WHERE clauses shared by the expense listing endpoints.
+
+    Args:
+        user_id: Restrict to one user (None only for admin listings)
+        category_id: Category filter
+        start_date: Inclusive lower date bound
+        end_date: Inclusive upper date bound
+        min_amount: Minimum amount
+        max_amount: Maximum amount
+
+    Returns:
+        List of SQLAlchemy boolean expressions
+    """
+    filters = []
+    if user_id is not None:
+        filters.append(Expense.user_id == user_id)
+    if category_id is not None:
+        filters.append(Expense.category_id == category_id)
+    if start_date is not None:
+        filters.append(Expense.date >= start_date)
+    if end_date is not None:
+        filters.append(Expense.date <= end_date)
+    if min_amount is not None:
+        filters.append(Expense.amount >= min_amount)
+    if max_amount is not None:
+        filters.append(Expense.amount <= max_amount)
+    return filters
+
+
+def _page_statement(
+    db: Session,
+    filters: List[Any],
+    search: Optional[str],
+    skip: int,
+    limit: int,
+    position: Optional[Tuple[datetime, int]],
+    by_relevance: bool,
+    with_category: bool,
+) -> Tuple[Any, List[Any]]:
+    """
+    Build the select for one page of expenses.
+
+    Returns:
+        Tuple containing (statement, ordering clauses of the page)
+    """
+    if with_category:
+        statement = select(*EXPENSE_COLUMNS, *CATEGORY_COLUMNS).join(
+            Category, Category.id == Expense.category_id
+        )
+    else:
+        statement = select(*EXPENSE_COLUMNS)
+    statement = statement.where(*filters)
+    order_by = [Expense.date.desc(), Expense.id.desc()]
+    if search:
+        statement, rank = search_filter(statement, db, search)
+        if by_relevance and rank is not None:
+            order_by.insert(0, rank)
+    statement = statement.order_by(*order_by)
+    if position:
+        statement = statement.where(keyset_after(Expense.date, Expense.id, position))
+    else:
+        statement = statement.offset(skip)
+    return statement.limit(limit), order_by
+
+
+def _map_rows(rows: List[Any], with_category: bool) -> List[Dict[str, Any]]:
+    """
+    Map page result rows to expense dicts, embedding the category if selected.
+    """
+    if not with_category:
+        return [_expense_row(row) for row in rows]
+    offset = len(EXPENSE_COLUMNS)
+    return [
+        {**_expense_row(row), "category": _category_row(row, offset)}
+        for row in rows
+    ]
+
+
+def list_expense_rows(
+    db: Session,
+    filters: List[Any],
+    search: Optional[str] = None,
+    skip: int = 0,
+    limit: int = 100,
+    position: Optional[Tuple[datetime, int]] = None,
+    by_relevance: bool = False,
+    with_category: bool = True,
+) -> List[Dict[str, Any]]:
+    """
+    Fetch one page of expenses as plain dicts.
+
+    Selects only the needed columns with a Core statement, so no ORM
+    objects are built. Rows are ordered by (date, id) descending, after
+    relevance when by_relevance is set.
+
+    Args:
+        db: Database session
+        filters: Clauses from build_expense_filters
+        search: Optional full-text search term
+        skip: Offset, ignored when position is given
+        limit: Page size
+        position: Decoded keyset cursor
+        by_relevance: Order search matches by relevance first
+        with_category: Join and embed each row's category; when False rows
+            only carry category_id (see load_categories)
+
+    Returns:
+        List of dicts shaped like ExpenseWithCategory, or Expense when
+        with_category is False
+    """
+    statement, _ = _page_statement(
+        db, filters, search, skip, limit, position, by_relevance, with_category
+    )
+    return _map_rows(db.execute(statement).all(), with_category)
+
+
+def list_expense_rows_with_totals(
+    db: Session,
+    filters: List[Any],
+    search: Optional[str] = None,
+    skip: int = 0,
+    limit: int = 100,
+    position: Optional[Tuple[datetime, int]] = None,
+    by_relevance: bool = False,
+    with_category: bool = True,
+) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+    """
+    Fetch one page of expenses plus aggregates over the whole filter set
+    in a single query.
+
+    The page and a per-category GROUP BY over the same filters are combined
+    with UNION ALL; facet rows carry NULL expense columns and page rows NULL
+    facet columns. The cursor position and offset only apply to the page,
+    so totals always describe every matching expense.
+
+    Args:
+        Same as list_expense_rows
+
+    Returns:
+        Tuple containing (rows as from list_expense_rows, dict with
+        total_count, total_amount and facets)
+    """
+    page, order_by = _page_statement(
+        db, filters, search, skip, limit, position, by_relevance, with_category
+    )
+    page = page.add_columns(func.row_number().over(order_by=order_by).label("seq")).subquery("page")
+    page_columns = list(page.c)[:-1]
+
+    facets = select(
+        Expense.category_id,
+        func.count(Expense.id).label("count"),
+        func.sum(Expense.amount).label("amount"),
+    ).where(*filters)
+    if search:
+        facets, _ = search_filter(facets, db, search)
+    facets = facets.group_by(Expense.category_id).subquery("facets")
+
+    category_slot = EXPENSE_COLUMNS.index(Expense.category_id)
+    page_rows = select(
+        literal(0).label("kind"),
+        page.c.seq,
+        *page_columns,
+        cast(null(), Integer).label("facet_count"),
+        cast(null(), Float).label("facet_amount"),
+    )
+    facet_rows = select(
+        literal(1),
+        cast(null(), Integer),
+        *[
+            facets.c.category_id if i == category_slot else cast(null(), c.type)
+            for i, c in enumerate(page_columns)
+        ],
+        facets.c["count"],
+        facets.c.amount,
+    )
+    combined = union_all(page_rows, facet_rows).subquery("combined")
+    result = db.execute(select(combined).order_by(combined.c.kind, combined.c.seq)).all()
+
+    rows = []
+    facet_list = []
+    width = len(page_columns)
+    for row in result:
+        values = row[2:2 + width]
+        if row[0] == 0:
+            rows.append(values)
+        else:
+            facet_list.append({
+                "category_id": values[category_slot],
+                "count": row[-2],
+                "amount": float(row[-1] or 0),
+            })
+
+    totals = {
+        "total_count": sum(facet["count"] for facet in facet_list),
+        "total_amount": sum(facet["amount"] for facet in facet_list),
+        "facets": sorted(facet_list, key=lambda facet: (-facet["count"], facet["category_id"])),
+    }
+    return _map_rows(rows, with_category), totals
+
+
+def load_categories(db: Session, category_ids: Iterable[int]) -> Dict[int, Dict[str, Any]]:
+    """
+    Fetch categories by id with a single IN query.
+
+    Args:
+        db: Database session
+        category_ids: Category ids, duplicates allowed
+
+    Returns:
+        Dict mapping category id to a category dict
+    """
+    ids = sorted(set(category_ids))
+    if not ids:
+        return {}
+    rows = db.execute(select(*CATEGORY_COLUMNS).where(Category.id.in_(ids))).all()
+    return {row[0]: _category_row(row) for row in rows}
+
+
+def serialize_expense_rows(rows: List[Dict[str, Any]]) -> bytes:
+    """
+    Serialize rows from list_expense_rows to JSON bytes.
+    """
+    return expense_rows_adapter.dump_json(rows)
+
+
+def serialize_expense_page(
+    rows: List[Dict[str, Any]],
+    normalized: bool = False,
+    categories: Optional[Dict[int, Dict[str, Any]]] = None,
+    totals: Optional[Dict[str, Any]] = None,
+) -> bytes:
+    """
+    Serialize a page of expense rows in the {"expenses": [...]} envelope
+    to JSON bytes.
+
+    Args:
+        rows: Rows from list_expense_rows
+        normalized: Whether rows were fetched without embedded categories
+        categories: Side-loaded category map from load_categories
+        totals: Aggregates from list_expense_rows_with_totals
+
+    Returns:
+        JSON bytes
+    """
+    page: Dict[str, Any] = {"expenses": rows}
+    if categories is not None:
+        page["categories"] = categories
+    if totals is not None:
+        page.update(totals)
+    adapter = normalized_page_adapter if normalized else expense_page_adapter
+    return adapter.dump_json(page)
+
+
+def _validation_detail(error: ValidationError) -> str:
+    """
+    Flatten a pydantic ValidationError into one line.
+    """
+    return "; ".join(
+        f"{'.'.join(str(part) for part in item['loc'])}: {item['msg']}" for item in error.errors()
+    )
+
+
+def bulk_create_expenses(
+    db: Session, user_id: int, items: List[Dict[str, Any]]
+) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """
+    Create many expenses in one transaction.
+
+    Each item is validated as ExpenseCreate, all referenced categories are
+    checked with one IN query, and the valid items are inserted with a
+    single INSERT ... RETURNING. Invalid items are reported and skipped.
+
+    Args:
+        db: Database session
+        user_id: Owner of the new expenses
+        items: Raw expense payloads
+
+    Returns:
+        Tuple containing (created expense dicts in request order, errors as
+        dicts with index and detail)
+    """
+    errors = []
+    valid = []
+    for index, item in enumerate(items):
+        try:
+            valid.append((index, ExpenseCreate.model_validate(item)))
+        except ValidationError as e:
+            errors.append({"index": index, "detail": _validation_detail(e)})
+
+    category_ids = {expense_in.category_id for _, expense_in in valid}
+    owned = set()
+    if category_ids:
+        owned = set(db.execute(
+            select(Category.id).where(Category.user_id == user_id, Category.id.in_(category_ids))
+        ).scalars())
+
+    now = datetime.utcnow()
+    rows = []
+    for index, expense_in in valid:
+        if expense_in.category_id not in owned:
+            errors.append({
+                "index": index,
+                "detail": "Category not found or doesn't belong to the user",
+            })
+            continue
+        rows.append({**expense_in.model_dump(), "user_id": user_id, "created_at": now, "updated_at": now})
+    errors.sort(key=lambda error: error["index"])
+
+    if not rows:
+        return [], errors
+
+    # A Core insert, so rows with and without optional fields share one
+    # statement. RETURNING rows come back in no guaranteed order; they are
+    # matched to the request as follows.
+    # - On PostgreSQL, sort_by_parameter_order makes SQLAlchemy add a
+    #   per-row sentinel and return rows in parameter order.
+    # - On SQLite that option would run one INSERT per row. SQLite inserts
+    #   the VALUES rows one at a time under its write lock, each taking the
+    #   next rowid, so sorting by id gives request order there.
+    table = Expense.__table__
+    columns = [table.c[column.key] for column in EXPENSE_COLUMNS]
+    if db.get_bind().dialect.name == "sqlite":
+        result = db.execute(insert(table).returning(*columns), rows)
+        created = sorted((_expense_row(row) for row in result), key=lambda row: row["id"])
+    else:
+        result = db.execute(insert(table).returning(*columns, sort_by_parameter_order=True), rows)
+        created = [_expense_row(row) for row in result]
+
+    # Core inserts bypass the ORM flush hooks that maintain rollups
+    deltas = RollupDeltas()
+    for row in rows:
+        deltas.add_expense(user_id, row["date"], row["category_id"], row["currency"], row["amount"])
+    apply_deltas(db, deltas)
+    bump_data_version(db, user_id)
+    db.commit()
+    return created, errors
+
+
+def selection_clauses(db: Session, user_id: int, selection: ExpenseSelection) -> List[Any]:
+    """
+    Build WHERE clauses matching a bulk selection of one user's expenses.
+
+    A search term needs a join on the full-text index, which UPDATE and
+    DELETE cannot use, so it is applied through an id subquery.
+
+    Args:
+        db: Database session
+        user_id: Owner of the expenses
+        selection: Ids and/or listing filters
+
+    Returns:
+        List of SQLAlchemy boolean expressions
+    """
+    filters = build_expense_filters(
+        user_id=user_id,
+        category_id=selection.category_id,
+        start_date=selection.start_date,
+        end_date=selection.end_date,
+        min_amount=selection.min_amount,
+        max_amount=selection.max_amount,
+    )
+    if selection.ids is not None:
+        filters.append(Expense.id.in_(selection.ids))
+    if selection.search is not None:
+        matching, _ = search_filter(select(Expense.id).where(*filters), db, selection.search)
+        filters = [Expense.user_id == user_id, Expense.id.in_(matching)]
+    return filters
+
+
+def bulk_update_expenses(
+    db: Session, user_id: int, clauses: List[Any], changes: Dict[str, Any]
+) -> int:
+    """
+    Apply the same changes to every matching expense with one UPDATE.
+
+    When a rolled-up field changes, the affected rollups are derived from
+    one grouped query over the matching rows taken before the update.
+
+    Args:
+        db: Database session
+        user_id: Owner of the expenses
+        clauses: Clauses from selection_clauses
+        changes: Column values to set
+
+    Returns:
+        Number of updated expenses
+    """
+    deltas = RollupDeltas()
+    if ROLLUP_FIELDS & set(changes):
+        for key, total, count in grouped_deltas(db, clauses, sign=1):
+            user, year, month, category_id, currency = key
+            if changes.get("date") is not None:
+                year, month = changes["date"].year, changes["date"].month
+            category_id = changes.get("category_id", category_id)
+            if "currency" in changes:
+                currency = changes["currency"] or DEFAULT_CURRENCY
+            new_total = count * changes["amount"] if changes.get("amount") is not None else total
+            deltas.add(key, -total, -count)
+            deltas.add((user, year, month, category_id, currency), new_total, count)
+
+    statement = (
+        update(Expense)
+        .where(*clauses)
+        .values(**changes)
+        .execution_options(synchronize_session=False)
+    )
+    count = db.execute(statement).rowcount
+    apply_deltas(db, deltas)
+    if count:
+        bump_data_version(db, user_id)
+    db.commit()
+    return count
+
+
+def bulk_delete_expenses(db: Session, user_id: int, clauses: List[Any]) -> int:
+    """
+    Delete every matching expense with one DELETE.
+
+    Args:
+        db: Database session
+        user_id: Owner of the expenses
+        clauses: Clauses from selection_clauses
+
+    Returns:
+        Number of deleted expenses
+    """
+    deltas = RollupDeltas()
+    for key, total, count in grouped_deltas(db, clauses):
+        deltas.add(key, total, count)
+
+    statement = delete(Expense).where(*clauses).execution_options(synchronize_session=False)
+    count = db.execute(statement).rowcount
+    apply_deltas(db, deltas)
+    if count:
+        bump_data_version(db, user_id)
+    db.commit()
+    return count
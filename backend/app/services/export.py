@@ -1,53 +1,480 @@
 import csv
 import io
 from datetime import datetime
-from typing import List, Optional, Any
+from functools import lru_cache
+from typing import Any, BinaryIO, Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Sequence, Tuple, Union
 
 from reportlab.lib import colors
 from reportlab.lib.pagesizes import letter
-from reportlab.lib.styles import getSampleStyleSheet
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Table, TableStyle, Spacer
+from reportlab.lib.styles import ParagraphStyle, getSampleStyleSheet
+from reportlab.platypus import SimpleDocTemplate, Paragraph, LongTable, TableStyle, Spacer
+from sqlalchemy import extract, select
 
+from app.models.category import Category
 from app.models.expense import Expense
 from app.models.user import User
+from app.utils.pagination import keyset_after
+from app.utils.period import period_filter
 
 
-def generate_csv(expenses: List[Expense], user: User) -> bytes:
-    """Generate a CSV file with expense data."""
+# Columns read by streamed exports, in CSV order
+CSV_COLUMNS = [
+    Expense.date,
+    Category.name,
+    Expense.description,
+    Expense.amount,
+    Expense.currency,
+    Expense.notes,
+]
+
+
+def _csv_fields(
+    date: datetime,
+    category: Optional[str],
+    description: Optional[str],
+    amount: float,
+    currency: str,
+    notes: Optional[str],
+) -> List[str]:
+    """Format one expense as padded CSV fields."""
+    return [
+        date.strftime("%Y-%m-%d").ljust(15),
+        (category or "N/A").ljust(15),
+        (description or "").ljust(20),
+        f"{amount:.2f}".ljust(10),
+        currency.ljust(10),
+        (notes or "").ljust(20)
+    ]
+
+
+def iter_csv(
+    batches: Iterable[Iterable[Sequence[Any]]],
+    on_error: Optional[Callable[[Exception], None]] = None,
+) -> Iterator[bytes]:
+    """
+    Encode batches of expense rows as CSV, one chunk per batch.
+
+    The header is yielded before the first batch is requested, so callers
+    streaming the chunks send it while the rows are still being read. An
+    error while reading ends the output with an error row.
+
+    Args:
+        batches: Batches of rows in CSV_COLUMNS order
+        on_error: Called with the error before the error row is written
+
+    Returns:
+        Iterator of UTF-8 encoded chunks
+    """
+    output = io.StringIO()
+    writer = csv.writer(output, delimiter='\t')
+
+    def flush() -> bytes:
+        chunk = output.getvalue().encode('utf-8')
+        output.seek(0)
+        output.truncate()
+        return chunk
+
+    # Write header row with proper spacing
+    writer.writerow([
+        "Date".ljust(15),
+        "Category".ljust(15),
+        "Description".ljust(20),
+        "Amount".ljust(10),
+        "Currency".ljust(10),
+        "Notes".ljust(20)
+    ])
+    yield flush()
     try:
-        # Create CSV file in memory
-        output = io.StringIO()
-        writer = csv.writer(output, delimiter='\t')
-        
-        # Write header row with proper spacing
-        writer.writerow([
-            "Date".ljust(15),
-            "Category".ljust(15),
-            "Description".ljust(20),
-            "Amount".ljust(10),
-            "Currency".ljust(10),
-            "Notes".ljust(20)
-        ])
-        
-        # Write expense data in columns with proper spacing
-        for expense in expenses:
-            writer.writerow([
-                expense.date.strftime("%Y-%m-%d").ljust(15),
-                (expense.category.name if expense.category else "N/A").ljust(15),
-                (expense.description or "").ljust(20),
-                f"{expense.amount:.2f}".ljust(10),
-                expense.currency.ljust(10),
-                (expense.notes or "").ljust(20)
-            ])
-        
-        return output.getvalue().encode('utf-8')
+        for batch in batches:
+            writer.writerows(_csv_fields(*row) for row in batch)
+            yield flush()
     except Exception as e:
         print(f"Error generating CSV: {str(e)}")
-        # Return basic CSV with error message if something goes wrong
-        output = io.StringIO()
-        writer = csv.writer(output, delimiter='\t')
+        if on_error is not None:
+            on_error(e)
         writer.writerow(["Error generating report", str(e)])
-        return output.getvalue().encode('utf-8')
+        yield flush()
+
+
+def expense_report_filters(
+    user_id: int,
+    year: Optional[int] = None,
+    month: Optional[int] = None,
+    category_id: Optional[int] = None,
+) -> List[Any]:
+    """
+    Build the WHERE clauses selecting the expenses of a report.
+
+    Args:
+        user_id: Owner of the expenses
+        year: Optional year; with month, restricts to that month
+        month: Optional month (1-12); without a year, that month of every year
+        category_id: Optional category filter
+
+    Returns:
+        List of SQLAlchemy boolean expressions
+
+    Raises:
+        ValueError: If the period is out of range
+    """
+    filters = [Expense.user_id == user_id]
+    if year:
+        filters.append(period_filter(Expense.date, year=year, month=month))
+    elif month:
+        # A month without a year matches that month in every year, which
+        # cannot be expressed as a single date range
+        filters.append(extract('month', Expense.date) == month)
+    if category_id:
+        filters.append(Expense.category_id == category_id)
+    return filters
+
+
+def iter_expense_batches(bind: Any, filters: List[Any], batch_size: int) -> Iterator[List[Any]]:
+    """
+    Read matching expenses in batches, newest first, without loading them all.
+
+    Rows are fetched through a server-side cursor where the driver has one
+    (yield_per), on a connection held only while the iterator runs, so
+    memory stays flat however many expenses match. The query runs when the
+    first batch is requested.
+
+    Args:
+        bind: Engine to read from
+        filters: WHERE clauses on Expense
+        batch_size: Rows per fetch
+
+    Returns:
+        Iterator of row lists in CSV_COLUMNS order
+    """
+    statement = (
+        select(*CSV_COLUMNS)
+        .outerjoin(Category, Category.id == Expense.category_id)
+        .where(*filters)
+        .order_by(Expense.date.desc(), Expense.id.desc())
+    )
+    with bind.connect() as connection:
+        result = connection.execution_options(yield_per=batch_size).execute(statement)
+        yield from result.partitions()
+
+
+def iter_expense_pages(bind: Any, filters: List[Any], page_size: int) -> Iterator[List[Any]]:
+    """
+    Read matching expenses in keyset pages, newest first.
+
+    Unlike iter_expense_batches, no cursor stays open between pages: each
+    page is a complete query, so callers can commit their own writes
+    between pages (SQLite locks out writers while a read is in progress).
+
+    Args:
+        bind: Engine to read from
+        filters: WHERE clauses on Expense
+        page_size: Rows per page
+
+    Returns:
+        Iterator of row lists in CSV_COLUMNS order
+    """
+    statement = (
+        select(*CSV_COLUMNS, Expense.id)
+        .outerjoin(Category, Category.id == Expense.category_id)
+        .where(*filters)
+        .order_by(Expense.date.desc(), Expense.id.desc())
+        .limit(page_size)
+    )
+    position = None
+    while True:
+        page_statement = statement
+        if position is not None:
+            page_statement = statement.where(keyset_after(Expense.date, Expense.id, position))
+        with bind.connect() as connection:
+            rows = connection.execute(page_statement).all()
+        if not rows:
+            return
+        position = (rows[-1].date, rows[-1].id)
+        yield [row[:-1] for row in rows]
+        if len(rows) < page_size:
+            return
+
+
+def stream_expense_csv(
+    bind: Any,
+    filters: List[Any],
+    batch_size: int,
+    on_error: Optional[Callable[[Exception], None]] = None,
+) -> Iterator[bytes]:
+    """
+    Stream matching expenses as CSV without loading them all at once.
+
+    Args:
+        bind: Engine to read from
+        filters: WHERE clauses on Expense
+        batch_size: Rows per fetch and per yielded chunk
+        on_error: Called if reading fails, see iter_csv
+
+    Returns:
+        Iterator of UTF-8 encoded CSV chunks, newest expenses first
+    """
+    return iter_csv(iter_expense_batches(bind, filters, batch_size), on_error)
+
+
+def generate_csv(expenses: List[Expense], user: User) -> bytes:
+    """Generate a CSV file with expense data."""
+    rows = [
+        (
+            expense.date,
+            expense.category.name if expense.category else None,
+            expense.description,
+            expense.amount,
+            expense.currency,
+            expense.notes,
+        )
+        for expense in expenses
+    ]
+    return b"".join(iter_csv([rows]))
+
+
+MONTH_NAMES = ["January", "February", "March", "April", "May", "June",
+               "July", "August", "September", "October", "November", "December"]
+
+# Detail rows per LongTable; splitting a table at a page break costs time in
+# proportion to its length, so bounded chunks keep layout linear overall
+PDF_TABLE_CHUNK_ROWS = 500
+
+# Fixed detail column widths (points, summing to the letter frame width),
+# so the layout never measures every cell to size the columns
+PDF_DETAIL_WIDTHS = [70, 110, 188, 100]
+PDF_DESCRIPTION_CHARS = 36
+
+
+class PdfStyles(NamedTuple):
+    title: ParagraphStyle
+    subtitle: ParagraphStyle
+    normal: ParagraphStyle
+    table: TableStyle
+
+
+@lru_cache(maxsize=None)
+def pdf_styles() -> PdfStyles:
+    """Paragraph and table styles, built once per process."""
+    styles = getSampleStyleSheet()
+    return PdfStyles(
+        title=styles["Heading1"],
+        subtitle=styles["Heading2"],
+        normal=styles["Normal"],
+        table=TableStyle([
+            ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
+            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+            ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
+            ('GRID', (0, 0), (-1, -1), 1, colors.black),
+        ]),
+    )
+
+
+def _detail_cells(
+    date: datetime, category: Optional[str], description: Optional[str], amount: float, currency: str, *_: Any
+) -> List[str]:
+    """Format one expense as a detail table row."""
+    description = description or "N/A"
+    if len(description) > PDF_DESCRIPTION_CHARS:
+        description = description[:PDF_DESCRIPTION_CHARS - 3] + "..."
+    return [
+        date.strftime("%Y-%m-%d"),
+        category or "N/A",
+        description,
+        f"{amount:.2f} {currency}",
+    ]
+
+
+class ReportOwner(NamedTuple):
+    """
+    The user fields shown in a report, as plain data.
+
+    Reports may be rendered in another process, where ORM objects cannot
+    be sent.
+    """
+
+    email: str
+    first_name: Optional[str]
+    last_name: Optional[str]
+    preferred_currency: str
+
+    @classmethod
+    def from_user(cls, user: User) -> "ReportOwner":
+        return cls(user.email, user.first_name, user.last_name, user.preferred_currency)
+
+
+class DetailRows(NamedTuple):
+    """
+    Expenses listed in a report and a per-month summary of those left out.
+    """
+
+    # (date, category, description, amount, currency), newest first
+    listed: List[Tuple[Any, ...]]
+    # (year, month) -> [count, amount] of the expenses not listed
+    omitted: Dict[Tuple[int, int], List[float]]
+
+
+def collect_detail_rows(rows: Iterable[Sequence[Any]], max_rows: Optional[int] = None) -> DetailRows:
+    """
+    Keep the first max_rows expense rows and summarize the rest per month.
+
+    Only the kept rows are held in memory, so rows can be a streamed
+    iterator of any length.
+
+    Args:
+        rows: Expense rows in CSV_COLUMNS order, newest first
+        max_rows: Rows to keep at most; None keeps every row
+
+    Returns:
+        DetailRows
+    """
+    listed: List[Tuple[Any, ...]] = []
+    omitted: Dict[Tuple[int, int], List[float]] = {}
+    for row in rows:
+        if max_rows is not None and len(listed) >= max_rows:
+            totals = omitted.setdefault((row[0].year, row[0].month), [0, 0.0])
+            totals[0] += 1
+            totals[1] += row[3]
+        else:
+            listed.append(tuple(row[:5]))
+    return DetailRows(listed, omitted)
+
+
+def _detail_tables(rows: List[Tuple[Any, ...]]) -> List[Any]:
+    """
+    Lay out detail rows as LongTable chunks with a repeated header.
+    """
+    styles = pdf_styles()
+    header = ["Date", "Category", "Description", "Amount"]
+    return [
+        LongTable(
+            [header] + [_detail_cells(*row) for row in rows[start:start + PDF_TABLE_CHUNK_ROWS]],
+            colWidths=PDF_DETAIL_WIDTHS,
+            repeatRows=1,
+            style=styles.table,
+        )
+        for start in range(0, len(rows), PDF_TABLE_CHUNK_ROWS)
+    ]
+
+
+def write_pdf(
+    output: Union[BinaryIO, str],
+    details: DetailRows,
+    category_summary: List[Any],
+    year: int,
+    month: Optional[int],
+    user: Union[User, ReportOwner],
+) -> None:
+    """
+    Write a PDF report with a category summary and expense details.
+
+    Details are laid out in chunks of PDF_TABLE_CHUNK_ROWS with fixed
+    column widths, so render time grows linearly with the number of rows.
+    Expenses left out of the details are summarized per month in an
+    appendix.
+
+    Args:
+        output: Binary file or path to write the PDF to
+        details: Output of collect_detail_rows
+        category_summary: CategoryTotal items of the period
+        year: Year of the report
+        month: Optional month of the report
+        user: Owner of the expenses
+    """
+    styles = pdf_styles()
+    title_style, subtitle_style, normal_style = styles.title, styles.subtitle, styles.normal
+    period_desc = f"{year}" if not month else f"{MONTH_NAMES[month-1]} {year}"
+    
+    # Calculate total from category summary
+    total_amount = sum(item.total_amount for item in category_summary)
+    
+    doc = SimpleDocTemplate(output, pagesize=letter)
+    
+    # Create elements for PDF
+    elements = []
+    
+    # Add title
+    elements.append(Paragraph(f"Expense Report", title_style))
+    elements.append(Paragraph(f"Period: {period_desc}", subtitle_style))
+    elements.append(Paragraph(f"Generated on: {datetime.now().strftime('%Y-%m-%d %H:%M')}", normal_style))
+    elements.append(Spacer(1, 12))
+    
+    # Add user info if available
+    user_name = f"{user.first_name} {user.last_name}" if user.first_name and user.last_name else user.email
+    elements.append(Paragraph(f"User: {user_name}", normal_style))
+    elements.append(Paragraph(f"Total Expenses: {total_amount:.2f} {user.preferred_currency}", subtitle_style))
+    elements.append(Spacer(1, 12))
+    
+    # Add category summary
+    elements.append(Paragraph("Expenses by Category:", subtitle_style))
+    elements.append(Spacer(1, 6))
+    
+    if category_summary:
+        category_data = [["Category", "Amount", "Percentage"]]
+        for item in category_summary:
+            percentage = (item.total_amount / total_amount * 100) if total_amount > 0 else 0
+            category_data.append([
+                item.name,
+                f"{item.total_amount:.2f} {user.preferred_currency}",
+                f"{percentage:.2f}%",
+            ])
+        elements.append(LongTable(category_data, repeatRows=1, style=styles.table))
+    else:
+        elements.append(Paragraph("No category data available for this period.", normal_style))
+    
+    elements.append(Spacer(1, 20))
+    
+    # Add expense details
+    elements.append(Paragraph("Expense Details:", subtitle_style))
+    elements.append(Spacer(1, 6))
+    
+    tables = _detail_tables(details.listed)
+    omitted = details.omitted
+    if omitted:
+        omitted_count = sum(count for count, _ in omitted.values())
+        elements.append(Paragraph(
+            f"Showing the {len(details.listed)} most recent expenses; {omitted_count} earlier ones "
+            f"are summarized in the appendix.",
+            normal_style,
+        ))
+        elements.append(Spacer(1, 6))
+    if tables:
+        elements.extend(tables)
+    else:
+        elements.append(Paragraph("No expenses found for this period.", normal_style))
+    
+    # Add appendix of the expenses not listed
+    if omitted:
+        elements.append(Spacer(1, 20))
+        elements.append(Paragraph("Appendix: Expenses Not Listed", subtitle_style))
+        elements.append(Spacer(1, 6))
+        appendix_data = [["Month", "Expenses", "Amount"]]
+        for (omitted_year, omitted_month), (count, amount) in sorted(omitted.items(), reverse=True):
+            appendix_data.append([
+                f"{MONTH_NAMES[omitted_month-1]} {omitted_year}",
+                str(count),
+                f"{amount:.2f} {user.preferred_currency}",
+            ])
+        elements.append(LongTable(appendix_data, repeatRows=1, style=styles.table))
+    
+    # Add footer
+    elements.append(Spacer(1, 30))
+    elements.append(Paragraph(f"Report generated by Expense Tracker - {datetime.now().strftime('%Y-%m-%d')}", normal_style))
+    
+    # Build PDF
+    doc.build(elements)
+
+
+def write_error_pdf(output: Union[BinaryIO, str], error: Exception) -> None:
+    """Write a one-page PDF describing an error."""
+    styles = pdf_styles()
+    doc = SimpleDocTemplate(output, pagesize=letter)
+    doc.build([
+        Paragraph("Error Generating Report", styles.title),
+        Paragraph(f"An error occurred: {str(error)}", styles.normal),
+    ])
 
 
 def generate_pdf(
@@ -55,125 +482,27 @@ def generate_pdf(
     category_summary: List[Any],
     year: int, 
     month: Optional[int], 
-    user: User
+    user: User,
+    max_detail_rows: Optional[int] = None,
 ) -> bytes:
     """Generate a PDF report with expense data and category summary."""
+    rows = (
+        (
+            expense.date,
+            expense.category.name if expense.category else None,
+            expense.description,
+            expense.amount,
+            expense.currency,
+        )
+        for expense in expenses
+    )
+    buffer = io.BytesIO()
     try:
-        # Get period description
-        month_names = ["January", "February", "March", "April", "May", "June", 
-                      "July", "August", "September", "October", "November", "December"]
-        period_desc = f"{year}" if not month else f"{month_names[month-1]} {year}"
-        
-        # Calculate total from category summary
-        total_amount = sum(item.total_amount for item in category_summary)
-        
-        # Create PDF file in memory
-        buffer = io.BytesIO()
-        doc = SimpleDocTemplate(buffer, pagesize=letter)
-        
-        # Define styles
-        styles = getSampleStyleSheet()
-        title_style = styles["Heading1"]
-        subtitle_style = styles["Heading2"]
-        normal_style = styles["Normal"]
-        
-        # Create elements for PDF
-        elements = []
-        
-        # Add title
-        elements.append(Paragraph(f"Expense Report", title_style))
-        elements.append(Paragraph(f"Period: {period_desc}", subtitle_style))
-        elements.append(Paragraph(f"Generated on: {datetime.now().strftime('%Y-%m-%d %H:%M')}", normal_style))
-        elements.append(Spacer(1, 12))
-        
-        # Add user info if available
-        user_name = f"{user.first_name} {user.last_name}" if user.first_name and user.last_name else user.email
-        elements.append(Paragraph(f"User: {user_name}", normal_style))
-        elements.append(Paragraph(f"Total Expenses: {total_amount:.2f} {user.preferred_currency}", subtitle_style))
-        elements.append(Spacer(1, 12))
-        
-        # Add category summary
-        elements.append(Paragraph("Expenses by Category:", subtitle_style))
-        elements.append(Spacer(1, 6))
-        
-        if category_summary:
-            category_data = [["Category", "Amount", "Percentage"]]
-            for item in category_summary:
-                percentage = (item.total_amount / total_amount * 100) if total_amount > 0 else 0
-                category_data.append([
-                    item.name,
-                    f"{item.total_amount:.2f} {user.preferred_currency}",
-                    f"{percentage:.2f}%",
-                ])
-            
-            # Create category table
-            category_table = Table(category_data)
-            category_table.setStyle(TableStyle([
-                ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
-                ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-                ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-                ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-                ('GRID', (0, 0), (-1, -1), 1, colors.black),
-            ]))
-            elements.append(category_table)
-        else:
-            elements.append(Paragraph("No category data available for this period.", normal_style))
-        
-        elements.append(Spacer(1, 20))
-        
-        # Add expense details
-        elements.append(Paragraph("Expense Details:", subtitle_style))
-        elements.append(Spacer(1, 6))
-        
-        # Create expense table
-        if expenses:
-            expense_data = [["Date", "Category", "Description", "Amount"]]
-            for expense in expenses:
-                category_name = expense.category.name if expense.category else "N/A"
-                expense_data.append([
-                    expense.date.strftime("%Y-%m-%d"),
-                    category_name,
-                    expense.description or "N/A",
-                    f"{expense.amount:.2f} {expense.currency}",
-                ])
-            
-            expense_table = Table(expense_data)
-            expense_table.setStyle(TableStyle([
-                ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
-                ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-                ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-                ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-                ('GRID', (0, 0), (-1, -1), 1, colors.black),
-            ]))
-            elements.append(expense_table)
-        else:
-            elements.append(Paragraph("No expenses found for this period.", normal_style))
-        
-        # Add footer
-        elements.append(Spacer(1, 30))
-        elements.append(Paragraph(f"Report generated by Expense Tracker - {datetime.now().strftime('%Y-%m-%d')}", normal_style))
-        
-        # Build PDF
-        doc.build(elements)
-        buffer.seek(0)
-        
-        return buffer.getvalue()
-    
+        details = collect_detail_rows(rows, max_detail_rows)
+        write_pdf(buffer, details, category_summary, year, month, user)
     except Exception as e:
         print(f"Error generating PDF: {str(e)}")
         # Create a simple error PDF
         buffer = io.BytesIO()
-        doc = SimpleDocTemplate(buffer, pagesize=letter)
-        styles = getSampleStyleSheet()
-        
-        elements = []
-        elements.append(Paragraph("Error Generating Report", styles["Heading1"]))
-        elements.append(Paragraph(f"An error occurred: {str(e)}", styles["Normal"]))
-        
-        doc.build(elements)
-        buffer.seek(0)
-        return buffer.getvalue() 
\ No newline at end of file
+        write_error_pdf(buffer, e)
+    return buffer.getvalue()
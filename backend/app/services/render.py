@@ -0,0 +1,172 @@
+import io
+import multiprocessing
+import signal
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from typing import Any, Callable, List, Optional, Union
+
+from app.core.config import settings
+from app.services.export import DetailRows, ReportOwner, write_error_pdf, write_pdf
+
+# Extra time the API process waits past a job's own timeout, for the worker
+# to report it, before giving up on the worker
+TIMEOUT_GRACE_SECONDS = 5
+
+# Windows has no SIGALRM; there the API process enforces the timeout alone
+HAS_ALARM = hasattr(signal, "SIGALRM")
+
+
+class RenderTimeoutError(Exception):
+    """A render job did not finish within its timeout."""
+
+
+def _raise_timeout(signum: int, frame: Any) -> None:
+    raise RenderTimeoutError("Report rendering timed out")
+
+
+def _with_timeout(timeout: Optional[float], job: Callable[..., Any], *args: Any) -> Any:
+    """
+    Run a job in a pool worker, interrupting it after timeout seconds.
+
+    Pool workers run jobs on their main thread, so a SIGALRM timer can stop
+    a render stuck in pure-Python layout code. With no timeout the job runs
+    uninterrupted.
+    """
+    if timeout is None:
+        return job(*args)
+    previous = signal.signal(signal.SIGALRM, _raise_timeout)
+    signal.setitimer(signal.ITIMER_REAL, timeout)
+    try:
+        return job(*args)
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous)
+
+
+def render_pdf_job(
+    details: DetailRows,
+    category_summary: List[Any],
+    year: int,
+    month: Optional[int],
+    owner: ReportOwner,
+    path: Optional[str] = None,
+) -> Union[bytes, str]:
+    """
+    Render a PDF report, in whatever process runs the job.
+
+    A rendering error produces a one-page error PDF, like generate_pdf.
+
+    Returns:
+        The path the PDF was written to, or its bytes when path is None
+    """
+    output = path or io.BytesIO()
+    try:
+        write_pdf(output, details, category_summary, year, month, owner)
+    except RenderTimeoutError:
+        raise
+    except Exception as e:
+        print(f"Error generating PDF: {str(e)}")
+        if not path:
+            output = io.BytesIO()
+        write_error_pdf(output, e)
+    return path if path else output.getvalue()
+
+
+class RenderService:
+    """
+    Runs CPU-bound report rendering in a pool of worker processes.
+
+    Rendering in request threads holds the GIL and stalls every other
+    request of the process; in a worker process it only costs a core.
+    Jobs receive plain tuples and NamedTuples, never ORM objects. With
+    max_workers set to 0, jobs run in the calling thread instead, without
+    a timeout.
+    """
+
+    def __init__(
+        self, max_workers: int, timeout_seconds: float, start_method: str = "spawn"
+    ) -> None:
+        self.max_workers = max_workers
+        self.timeout_seconds = timeout_seconds
+        self.start_method = start_method
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._pool_guard = threading.Lock()
+        self.timeouts = 0
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        with self._pool_guard:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context(self.start_method),
+                )
+            return self._pool
+
+    def _discard_pool(self, pool: ProcessPoolExecutor) -> None:
+        """
+        Replace a pool whose worker stopped responding.
+
+        Its queued jobs are cancelled; the stuck worker exits once its job
+        ends, and the next job starts a new pool.
+        """
+        with self._pool_guard:
+            if self._pool is pool:
+                self._pool = None
+        pool.shutdown(wait=False, cancel_futures=True)
+
+    def run(self, job: Callable[..., Any], *args: Any) -> Any:
+        """
+        Run a picklable module-level job and return its result.
+
+        Raises:
+            RenderTimeoutError: If the job takes longer than timeout_seconds
+        """
+        if self.max_workers <= 0:
+            return job(*args)
+        pool = self._get_pool()
+        if HAS_ALARM:
+            future = pool.submit(_with_timeout, self.timeout_seconds, job, *args)
+            wait = self.timeout_seconds + TIMEOUT_GRACE_SECONDS
+        else:
+            future = pool.submit(_with_timeout, None, job, *args)
+            wait = self.timeout_seconds
+        try:
+            return future.result(timeout=wait)
+        except RenderTimeoutError:
+            self.timeouts += 1
+            raise
+        except FutureTimeoutError:
+            self.timeouts += 1
+            self._discard_pool(pool)
+            raise RenderTimeoutError("Report rendering timed out") from None
+
+    def render_pdf(
+        self,
+        details: DetailRows,
+        category_summary: List[Any],
+        year: int,
+        month: Optional[int],
+        owner: ReportOwner,
+        path: Optional[str] = None,
+    ) -> Union[bytes, str]:
+        """
+        Render a PDF report in a worker process, see render_pdf_job.
+
+        Pass a path for large reports, so the document is written to disk by
+        the worker instead of being sent back through a pipe.
+        """
+        return self.run(render_pdf_job, details, category_summary, year, month, owner, path)
+
+    def shutdown(self) -> None:
+        with self._pool_guard:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=True, cancel_futures=True)
+
+
+render_service = RenderService(
+    settings.RENDER_MAX_WORKERS,
+    settings.RENDER_TIMEOUT_SECONDS,
+    settings.RENDER_START_METHOD,
+)
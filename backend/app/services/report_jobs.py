@@ -0,0 +1,352 @@
+import os
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from itertools import chain
+from typing import Any, Callable, Iterator, List, Optional, Tuple
+
+from sqlalchemy import func, or_, select, update
+from sqlalchemy.orm import Session, sessionmaker
+
+import app.services.rollup as rollup_service
+from app.core.artifacts import artifact_cache, artifact_key, link_or_copy
+from app.core.config import settings
+from app.models.expense import Expense
+from app.models.report_job import ReportJob
+from app.models.user import User
+from app.services.export import (
+    ReportOwner,
+    collect_detail_rows,
+    expense_report_filters,
+    iter_csv,
+    iter_expense_batches,
+    iter_expense_pages,
+)
+from app.services.render import render_service
+
+# Shared by all report jobs of the process; PDF layout itself runs in the
+# render worker processes
+_executor = ThreadPoolExecutor(
+    max_workers=settings.REPORT_JOB_WORKERS, thread_name_prefix="report-job"
+)
+
+# Share of a PDF job's progress spent reading expenses; the rest is rendering
+PDF_READ_PROGRESS = 0.5
+
+
+def _counted(
+    batches: Iterator[List[Any]], on_progress: Callable[[int], None]
+) -> Iterator[List[Any]]:
+    """
+    Pass batches through, reporting the number of rows read after each one.
+    """
+    rows = 0
+    for batch in batches:
+        yield batch
+        rows += len(batch)
+        on_progress(rows)
+
+
+def _read_batches(
+    bind: Any, filters: List[Any], on_progress: Optional[Callable[[int], None]]
+) -> Iterator[List[Any]]:
+    """
+    Read expenses in batches; in keyset pages when progress is reported, so
+    the progress writes never wait on an open read.
+    """
+    if on_progress is None:
+        return iter_expense_batches(bind, filters, settings.EXPORT_BATCH_SIZE)
+    return _counted(iter_expense_pages(bind, filters, settings.EXPORT_BATCH_SIZE), on_progress)
+
+
+def write_csv_report(
+    bind: Any,
+    filters: List[Any],
+    path: str,
+    on_progress: Optional[Callable[[int], None]] = None,
+) -> None:
+    """
+    Write the CSV report of the matching expenses to a file, in batches.
+
+    Args:
+        bind: Engine to read from
+        filters: WHERE clauses from expense_report_filters
+        path: File to write
+        on_progress: Called with the number of rows written after each batch
+    """
+    batches = _read_batches(bind, filters, on_progress)
+    with open(path, "wb") as file:
+        for chunk in iter_csv(batches):
+            file.write(chunk)
+
+
+def write_pdf_report(
+    db: Session,
+    user: User,
+    year: int,
+    month: Optional[int],
+    category_id: Optional[int],
+    filters: List[Any],
+    path: str,
+    on_progress: Optional[Callable[[int], None]] = None,
+) -> None:
+    """
+    Render the PDF report of the matching expenses to a file.
+
+    Expenses are read in batches, keeping at most PDF_MAX_DETAIL_ROWS of
+    them, and the layout runs in a render worker process.
+
+    Args:
+        db: Database session
+        user: Owner of the expenses
+        year: Year of the report
+        month: Optional month of the report
+        category_id: Optional category the report is restricted to
+        filters: WHERE clauses from expense_report_filters
+        path: File to write
+        on_progress: Called with the number of rows read after each batch
+
+    Raises:
+        RenderTimeoutError: If rendering takes longer than RENDER_TIMEOUT_SECONDS
+    """
+    # Get category summary from the monthly rollups
+    category_summary = rollup_service.period_breakdown(
+        db, user.id, year, month, category_id
+    ).by_category
+    batches = _read_batches(db.get_bind(), filters, on_progress)
+    details = collect_detail_rows(
+        chain.from_iterable(batches), settings.PDF_MAX_DETAIL_ROWS or None
+    )
+    render_service.render_pdf(
+        details, category_summary, year, month, ReportOwner.from_user(user), path
+    )
+
+
+def report_filename(
+    format: str, year: Optional[int], month: Optional[int], category_id: Optional[int]
+) -> str:
+    """
+    Name offered for a downloaded report file.
+    """
+    period = f"{year or 'all'}" if not month else f"{year or 'all'}_{month:02d}"
+    category_suffix = f"_category_{category_id}" if category_id else ""
+    return f"expense_report_{period}{category_suffix}.{format}"
+
+
+def report_artifact_key(
+    user: User, format: str, year: Optional[int], month: Optional[int], category_id: Optional[int]
+) -> str:
+    """
+    Key of a report in the artifact cache, shared by the synchronous
+    endpoints and report jobs.
+
+    PDF reports also depend on the owner fields printed in them and on
+    PDF_MAX_DETAIL_ROWS, which do not change the data version.
+    """
+    params: Tuple[Any, ...] = (year, month, category_id)
+    if format == "pdf":
+        params += (tuple(ReportOwner.from_user(user)), settings.PDF_MAX_DETAIL_ROWS)
+    return artifact_key(user, format, params)
+
+
+def create_report_job(
+    db: Session,
+    user_id: int,
+    format: str,
+    year: Optional[int] = None,
+    month: Optional[int] = None,
+    category_id: Optional[int] = None,
+) -> ReportJob:
+    """
+    Record a report job and queue it for a worker thread.
+
+    Expired jobs are purged at the same time.
+
+    Args:
+        db: Database session
+        user_id: Owner of the report
+        format: "csv" or "pdf"
+        year: Optional year (required for PDF)
+        month: Optional month (1-12)
+        category_id: Optional category filter
+
+    Returns:
+        The queued job
+    """
+    purge_expired_jobs(db)
+    job = ReportJob(
+        id=uuid.uuid4().hex,
+        user_id=user_id,
+        format=format,
+        year=year,
+        month=month,
+        category_id=category_id,
+        status="queued",
+        progress=0.0,
+        rows=0,
+        filename=report_filename(format, year, month, category_id),
+    )
+    db.add(job)
+    db.commit()
+    db.refresh(job)
+    enqueue_report_job(db.get_bind(), job.id)
+    return job
+
+
+def enqueue_report_job(bind: Any, job_id: str) -> None:
+    """
+    Hand a queued job to a worker thread.
+    """
+    _executor.submit(run_report_job, bind, job_id)
+
+
+def get_report_job(db: Session, user_id: int, job_id: str) -> Optional[ReportJob]:
+    """
+    Get a user's report job.
+    """
+    return db.execute(
+        select(ReportJob).where(ReportJob.id == job_id, ReportJob.user_id == user_id)
+    ).scalar_one_or_none()
+
+
+def run_report_job(bind: Any, job_id: str) -> None:
+    """
+    Render a queued report job to a file, recording progress as it goes.
+
+    The file is written under a temporary name and renamed once complete,
+    so a succeeded job always points to a whole file. A report already in
+    the artifact cache for the user's data version is copied from there
+    instead of being rendered again. Errors mark the job failed with their
+    message.
+
+    Args:
+        bind: Engine holding the report_jobs table and the expenses
+        job_id: Job to run
+    """
+    db = sessionmaker(autocommit=False, autoflush=False, bind=bind)()
+    try:
+        # Claim the job atomically; another process may be queueing it too
+        now = datetime.utcnow()
+        claimed = db.execute(
+            update(ReportJob)
+            .where(ReportJob.id == job_id, ReportJob.status == "queued")
+            .values(status="running", started_at=now, heartbeat_at=now)
+        ).rowcount
+        db.commit()
+        if not claimed:
+            return
+        job = db.get(ReportJob, job_id)
+
+        os.makedirs(settings.REPORT_JOB_DIR, exist_ok=True)
+        path = os.path.join(settings.REPORT_JOB_DIR, f"{job.id}.{job.format}")
+        partial = f"{path}.part"
+        try:
+            filters = expense_report_filters(job.user_id, job.year, job.month, job.category_id)
+            total = db.scalar(select(func.count(Expense.id)).where(*filters))
+            share = PDF_READ_PROGRESS if job.format == "pdf" else 1.0
+
+            def on_progress(rows: int) -> None:
+                job.rows = rows
+                job.heartbeat_at = datetime.utcnow()
+                job.progress = min(rows / total, 1.0) * share if total else share
+                db.commit()
+
+            user = db.get(User, job.user_id)
+            key = report_artifact_key(user, job.format, job.year, job.month, job.category_id)
+            cached = artifact_cache.get(key)
+            if cached:
+                # Same report for the same data version: reuse the file
+                link_or_copy(cached, partial)
+                job.rows = total
+            else:
+                if job.format == "csv":
+                    write_csv_report(bind, filters, partial, on_progress)
+                else:
+                    write_pdf_report(
+                        db,
+                        user,
+                        job.year,
+                        job.month,
+                        job.category_id,
+                        filters,
+                        partial,
+                        on_progress,
+                    )
+                artifact_cache.store_copy(key, partial)
+            os.replace(partial, path)
+        except Exception as e:
+            print(f"Error running report job {job_id}: {str(e)}")
+            if os.path.exists(partial):
+                os.remove(partial)
+            db.rollback()
+            job.status = "failed"
+            job.error = str(e)
+            job.finished_at = datetime.utcnow()
+            db.commit()
+            return
+
+        job.status = "succeeded"
+        job.progress = 1.0
+        job.file_path = path
+        job.finished_at = datetime.utcnow()
+        db.commit()
+    finally:
+        db.close()
+
+
+def resume_report_jobs(bind: Any) -> int:
+    """
+    Queue the jobs left unfinished by a previous run of the application.
+
+    Running jobs are started over only once their heartbeat is older than
+    REPORT_JOB_LEASE_SECONDS, so jobs of other live workers or instances
+    are left alone. Queued jobs may be queued by several processes; the
+    first to claim one runs it.
+
+    Returns:
+        Number of jobs queued
+    """
+    db = sessionmaker(autocommit=False, autoflush=False, bind=bind)()
+    try:
+        cutoff = datetime.utcnow() - timedelta(seconds=settings.REPORT_JOB_LEASE_SECONDS)
+        db.execute(
+            update(ReportJob)
+            .where(
+                ReportJob.status == "running",
+                or_(ReportJob.heartbeat_at.is_(None), ReportJob.heartbeat_at < cutoff),
+            )
+            .values(status="queued", progress=0.0, rows=0)
+        )
+        db.commit()
+        job_ids = (
+            db.execute(
+                select(ReportJob.id)
+                .where(ReportJob.status == "queued")
+                .order_by(ReportJob.created_at)
+            )
+            .scalars()
+            .all()
+        )
+    finally:
+        db.close()
+    for job_id in job_ids:
+        enqueue_report_job(bind, job_id)
+    return len(job_ids)
+
+
+def purge_expired_jobs(db: Session) -> int:
+    """
+    Delete jobs finished more than REPORT_JOB_RETENTION_HOURS ago, and their files.
+
+    Returns:
+        Number of jobs deleted
+    """
+    cutoff = datetime.utcnow() - timedelta(hours=settings.REPORT_JOB_RETENTION_HOURS)
+    jobs = db.execute(select(ReportJob).where(ReportJob.finished_at < cutoff)).scalars().all()
+    for job in jobs:
+        if job.file_path and os.path.exists(job.file_path):
+            os.remove(job.file_path)
+        db.delete(job)
+    if jobs:
+        db.commit()
+    return len(jobs)
@@ -0,0 +1,397 @@
+from collections import defaultdict
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+from sqlalchemy import (
+    Integer,
+    and_,
+    cast,
+    delete,
+    event,
+    extract,
+    func,
+    insert,
+    select,
+    tuple_,
+    update,
+)
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from app.models.category import Category
+from app.models.expense import Expense
+from app.models.expense_rollup import ExpenseRollup
+from app.models.user import User
+
+# Expenses without a currency are rolled up under the column default
+DEFAULT_CURRENCY = "USD"
+
+# (user_id, year, month, category_id, currency)
+RollupKey = Tuple[int, int, int, int, str]
+
+# Columns identifying a rollup row, in RollupKey order
+KEY_COLUMNS = ("user_id", "year", "month", "category_id", "currency")
+
+# Session.info key holding pre-flush rollup keys of changed expenses
+_PENDING_KEY = "rollup_old_rows"
+
+
+class RollupDeltas:
+    """
+    Accumulated (total, count) changes per rollup key.
+    """
+
+    def __init__(self) -> None:
+        self.values: Dict[RollupKey, List[float]] = defaultdict(lambda: [0.0, 0])
+
+    def add(self, key: RollupKey, amount: float, count: int) -> None:
+        entry = self.values[key]
+        entry[0] += amount or 0.0
+        entry[1] += count
+
+    def add_expense(self, user_id, date, category_id, currency, amount, sign: int = 1) -> None:
+        """
+        Add (sign=1) or remove (sign=-1) one expense.
+        """
+        key = (user_id, date.year, date.month, category_id, currency or DEFAULT_CURRENCY)
+        self.add(key, sign * (amount or 0.0), sign)
+
+    def rows(self) -> List[Dict[str, Any]]:
+        """
+        Non-zero deltas as rows for apply_deltas.
+        """
+        return [
+            {**dict(zip(KEY_COLUMNS, key)), "total": total, "count": count}
+            for key, (total, count) in self.values.items()
+            if count or total
+        ]
+
+
+def _rollup_key_columns() -> List[Any]:
+    """
+    SQL expressions computing the rollup key of an expense row.
+    """
+    return [
+        Expense.user_id,
+        cast(extract("year", Expense.date), Integer).label("year"),
+        cast(extract("month", Expense.date), Integer).label("month"),
+        Expense.category_id,
+        func.coalesce(Expense.currency, DEFAULT_CURRENCY).label("currency"),
+    ]
+
+
+def apply_deltas(bind: Any, deltas: RollupDeltas) -> None:
+    """
+    Add deltas to the rollup table and drop rows that became empty.
+
+    Uses a single INSERT ... ON CONFLICT DO UPDATE on SQLite and
+    PostgreSQL, and UPDATE-then-INSERT per key elsewhere.
+
+    Args:
+        bind: Connection or session, inside the caller's transaction
+        deltas: Changes to apply
+    """
+    rows = deltas.rows()
+    if not rows:
+        return
+
+    table = ExpenseRollup.__table__
+    dialect = bind.get_bind().dialect.name if isinstance(bind, Session) else bind.dialect.name
+    upsert_insert = {"sqlite": sqlite.insert, "postgresql": postgresql.insert}.get(dialect)
+    if upsert_insert is not None:
+        statement = upsert_insert(table).values(rows)
+        statement = statement.on_conflict_do_update(
+            index_elements=list(KEY_COLUMNS),
+            set_={
+                "total": table.c.total + statement.excluded.total,
+                "count": table.c.count + statement.excluded.count,
+            },
+        )
+        bind.execute(statement)
+    else:
+        for row in rows:
+            match = and_(*(table.c[name] == row[name] for name in KEY_COLUMNS))
+            updated = bind.execute(
+                update(table)
+                .where(match)
+                .values(total=table.c.total + row["total"], count=table.c.count + row["count"])
+            )
+            if not updated.rowcount:
+                bind.execute(insert(table).values(**row))
+
+    user_ids = {row["user_id"] for row in rows}
+    bind.execute(delete(table).where(table.c.user_id.in_(user_ids), table.c.count <= 0))
+
+
+def grouped_deltas(
+    db: Session, clauses: List[Any], sign: int = -1
+) -> List[Tuple[RollupKey, float, int]]:
+    """
+    Aggregate the expenses matching clauses by rollup key.
+
+    Used by set-based writes, which bypass the ORM flush hooks, to compute
+    their rollup changes with one grouped query before the write.
+
+    Args:
+        db: Database session
+        clauses: WHERE clauses selecting the expenses
+        sign: Multiplier applied to totals and counts
+
+    Returns:
+        List of (key, total, count) tuples
+    """
+    key_columns = _rollup_key_columns()
+    statement = (
+        select(*key_columns, func.sum(Expense.amount), func.count(Expense.id))
+        .where(*clauses)
+        .group_by(*key_columns)
+    )
+    return [
+        (tuple(row[:5]), sign * (row[5] or 0.0), sign * row[6]) for row in db.execute(statement)
+    ]
+
+
+def rebuild_rollups(bind: Any, user_id: Optional[int] = None) -> None:
+    """
+    Recompute rollups from the expenses table.
+
+    Args:
+        bind: Engine, connection or session
+        user_id: Only rebuild this user's rows
+    """
+    if isinstance(bind, Engine):
+        with bind.begin() as conn:
+            return rebuild_rollups(conn, user_id)
+
+    table = ExpenseRollup.__table__
+    key_columns = _rollup_key_columns()
+    source = select(*key_columns, func.sum(Expense.amount), func.count(Expense.id))
+    clear = delete(table)
+    if user_id is not None:
+        source = source.where(Expense.user_id == user_id)
+        clear = clear.where(table.c.user_id == user_id)
+    source = source.group_by(*key_columns)
+
+    bind.execute(clear)
+    bind.execute(insert(table).from_select([*KEY_COLUMNS, "total", "count"], source))
+
+
+@event.listens_for(Session, "before_flush")
+def _remember_old_rows(session: Session, flush_context: Any, instances: Any) -> None:
+    """
+    Read the stored rollup keys of expenses about to be updated or deleted.
+    """
+    ids = [
+        obj.id
+        for obj in list(session.dirty) + list(session.deleted)
+        if isinstance(obj, Expense)
+        and obj.id is not None
+        and (obj in session.deleted or session.is_modified(obj))
+    ]
+    if not ids:
+        return
+    connection = session.connection()
+    rows = connection.execute(
+        select(
+            Expense.id,
+            Expense.user_id,
+            Expense.date,
+            Expense.category_id,
+            Expense.currency,
+            Expense.amount,
+        ).where(Expense.id.in_(ids))
+    )
+    session.info[_PENDING_KEY] = {row[0]: row[1:] for row in rows}
+
+
+@event.listens_for(Session, "after_flush")
+def _update_rollups(session: Session, flush_context: Any) -> None:
+    """
+    Apply the rollup changes of a flush in the same transaction.
+    """
+    old_rows = session.info.pop(_PENDING_KEY, {})
+    new = [obj for obj in session.new if isinstance(obj, Expense)]
+    changed = [obj for obj in session.dirty if isinstance(obj, Expense) and obj.id in old_rows]
+
+    # Rollups of deleted users and categories go with them; SQLite does not
+    # enforce the ON DELETE CASCADE unless foreign keys are switched on
+    table = ExpenseRollup.__table__
+    deleted_users = {obj.id for obj in session.deleted if isinstance(obj, User)}
+    deleted_categories = {obj.id for obj in session.deleted if isinstance(obj, Category)}
+    if deleted_users:
+        session.connection().execute(delete(table).where(table.c.user_id.in_(deleted_users)))
+    if deleted_categories:
+        session.connection().execute(
+            delete(table).where(table.c.category_id.in_(deleted_categories))
+        )
+    if not (old_rows or new):
+        return
+
+    deltas = RollupDeltas()
+    for row in old_rows.values():
+        deltas.add_expense(*row, sign=-1)
+    for obj in new + changed:
+        deltas.add_expense(obj.user_id, obj.date, obj.category_id, obj.currency, obj.amount)
+    # Their expenses were deleted with them; upserting the negative deltas
+    # would recreate rows pointing at the deleted user or category
+    for key in [
+        key for key in deltas.values if key[0] in deleted_users or key[3] in deleted_categories
+    ]:
+        del deltas.values[key]
+    apply_deltas(session.connection(), deltas)
+
+
+class CategoryTotal(NamedTuple):
+    name: str
+    color: Optional[str]
+    total_amount: float
+
+
+class MonthTotal(NamedTuple):
+    month: int
+    total_amount: float
+
+
+class PeriodBreakdown(NamedTuple):
+    """
+    Month x category spending of a period with its marginal totals.
+    """
+
+    # (month, (category name, color)) -> total
+    cells: Dict[Tuple[int, Tuple[str, Optional[str]]], float]
+    # Months with spending, in month order
+    by_month: List[MonthTotal]
+    # Categories with spending, by name
+    by_category: List[CategoryTotal]
+    total: float
+
+
+def period_breakdown(
+    db: Session,
+    user_id: int,
+    year: int,
+    month: Optional[int] = None,
+    category_id: Optional[int] = None,
+) -> PeriodBreakdown:
+    """
+    Spending per month and category of a year or month, in one query.
+
+    Categories are grouped by name and color. On PostgreSQL the monthly,
+    per-category and grand totals come from the same statement through
+    GROUPING SETS; elsewhere the month x category rows are folded in
+    Python.
+
+    Args:
+        db: Database session
+        user_id: User ID
+        year: Year
+        month: Optional month (1-12)
+        category_id: Optional category filter
+
+    Returns:
+        PeriodBreakdown
+    """
+    month_column = ExpenseRollup.month
+    grouping_sets = db.get_bind().dialect.name == "postgresql"
+    columns = [month_column, Category.name, Category.color, func.sum(ExpenseRollup.total)]
+    if grouping_sets:
+        columns += [func.grouping(month_column), func.grouping(Category.name, Category.color)]
+    query = (
+        select(*columns)
+        .join(ExpenseRollup, ExpenseRollup.category_id == Category.id)
+        .where(ExpenseRollup.user_id == user_id, ExpenseRollup.year == year)
+    )
+    if month is not None:
+        query = query.where(month_column == month)
+    if category_id is not None:
+        query = query.where(ExpenseRollup.category_id == category_id)
+    if grouping_sets:
+        query = query.group_by(
+            func.grouping_sets(
+                tuple_(month_column, Category.name, Category.color),
+                tuple_(month_column),
+                tuple_(Category.name, Category.color),
+                tuple_(),
+            )
+        )
+    else:
+        query = query.group_by(month_column, Category.name, Category.color)
+
+    cells: Dict[Tuple[int, Tuple[str, Optional[str]]], float] = {}
+    months: Dict[int, float] = defaultdict(float)
+    categories: Dict[Tuple[str, Optional[str]], float] = defaultdict(float)
+    total = 0.0
+    for row in db.execute(query):
+        row_month, category, amount = row[0], (row[1], row[2]), row[3] or 0.0
+        if not grouping_sets:
+            cells[(row_month, category)] = amount
+            months[row_month] += amount
+            categories[category] += amount
+            total += amount
+        elif not row[4] and not row[5]:
+            cells[(row_month, category)] = amount
+        elif not row[4]:
+            months[row_month] = amount
+        elif not row[5]:
+            categories[category] = amount
+        else:
+            total = amount
+
+    return PeriodBreakdown(
+        cells=cells,
+        by_month=[MonthTotal(m, months[m]) for m in sorted(months)],
+        by_category=[
+            CategoryTotal(name, color, categories[(name, color)])
+            for name, color in sorted(categories, key=lambda key: (key[0], key[1] or ""))
+        ],
+        total=total,
+    )
+
+
+def monthly_summary(db: Session, user_id: int, year: int, month: Optional[int]) -> Dict[str, Any]:
+    """
+    Build the monthly summary payload: spending per category with shares.
+
+    Returns:
+        Dict with year, month, total_amount and categories
+    """
+    breakdown = period_breakdown(db, user_id, year, month)
+    results = breakdown.by_category
+    total_amount = breakdown.total
+
+    # Format the results
+    categories = [
+        {
+            "name": result.name,
+            "color": result.color,
+            "amount": result.total_amount,
+            "percentage": (result.total_amount / total_amount * 100) if total_amount > 0 else 0,
+        }
+        for result in results
+    ]
+
+    return {
+        "year": year,
+        "month": month,
+        "total_amount": total_amount,
+        "categories": categories,
+    }
+
+
+def category_spend_subquery(user_id: int, year: int, month: Optional[int] = None) -> Any:
+    """
+    Subquery of total spending per category in a year or month.
+
+    Meant to be outer-joined on category_id, so callers can attach spend to
+    per-category rows (e.g. budgets) in the same statement.
+
+    Returns:
+        Subquery with category_id and spent columns
+    """
+    query = select(
+        ExpenseRollup.category_id,
+        func.sum(ExpenseRollup.total).label("spent"),
+    ).where(ExpenseRollup.user_id == user_id, ExpenseRollup.year == year)
+    if month:
+        query = query.where(ExpenseRollup.month == month)
+    return query.group_by(ExpenseRollup.category_id).subquery("category_spend")
@@ -0,0 +1,220 @@
+import re
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import Float, Integer, bindparam, column, func, literal_column, or_, text
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.exc import DBAPIError
+
+from app.models.expense import Expense
+
+# Backend names returned by get_search_backend
+FTS5 = "fts5"
+TSVECTOR = "tsvector"
+
+SQLITE_FTS_TABLE = "expenses_fts"
+PG_SEARCH_INDEX = "ix_expenses_search"
+
+# The query must repeat this expression exactly for PostgreSQL to use the index
+PG_SEARCH_VECTOR = (
+    "to_tsvector('simple', coalesce(expenses.description, '') || ' ' || "
+    "coalesce(expenses.notes, ''))"
+)
+
+# External-content FTS5 table kept in sync with expenses by triggers, so every
+# write path (ORM, bulk Core statements, raw SQL) updates the index
+SQLITE_FTS_DDL = [
+    f"""
+    CREATE VIRTUAL TABLE IF NOT EXISTS {SQLITE_FTS_TABLE} USING fts5(
+        description, notes, content='expenses', content_rowid='id'
+    )
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS expenses_fts_ai AFTER INSERT ON expenses BEGIN
+        INSERT INTO {SQLITE_FTS_TABLE}(rowid, description, notes)
+        VALUES (new.id, new.description, new.notes);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS expenses_fts_ad AFTER DELETE ON expenses BEGIN
+        INSERT INTO {SQLITE_FTS_TABLE}({SQLITE_FTS_TABLE}, rowid, description, notes)
+        VALUES ('delete', old.id, old.description, old.notes);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS expenses_fts_au AFTER UPDATE OF description, notes ON expenses
+    BEGIN
+        INSERT INTO {SQLITE_FTS_TABLE}({SQLITE_FTS_TABLE}, rowid, description, notes)
+        VALUES ('delete', old.id, old.description, old.notes);
+        INSERT INTO {SQLITE_FTS_TABLE}(rowid, description, notes)
+        VALUES (new.id, new.description, new.notes);
+    END
+    """,
+]
+
+SQLITE_FTS_DROP = [
+    "DROP TRIGGER IF EXISTS expenses_fts_au",
+    "DROP TRIGGER IF EXISTS expenses_fts_ad",
+    "DROP TRIGGER IF EXISTS expenses_fts_ai",
+    f"DROP TABLE IF EXISTS {SQLITE_FTS_TABLE}",
+]
+
+# PostgreSQL keeps expression indexes up to date on every write by itself
+PG_SEARCH_DDL = [
+    f"""
+    CREATE INDEX IF NOT EXISTS {PG_SEARCH_INDEX} ON expenses
+    USING gin ({PG_SEARCH_VECTOR.replace('expenses.', '')})
+    """,
+]
+
+PG_SEARCH_DROP = [f"DROP INDEX IF EXISTS {PG_SEARCH_INDEX}"]
+
+# Detected backend per database URL
+_backend_cache: Dict[str, Optional[str]] = {}
+
+
+def ensure_search_index(bind: Any) -> bool:
+    """
+    Create the full-text search index for expenses if it does not exist.
+
+    On SQLite this creates an FTS5 table plus sync triggers and indexes any
+    rows that are already present; on PostgreSQL it creates a GIN index over
+    the description/notes tsvector.
+
+    Args:
+        bind: Engine or connection
+
+    Returns:
+        True if the index is available afterwards
+    """
+    if isinstance(bind, Engine):
+        with bind.begin() as conn:
+            return ensure_search_index(conn)
+
+    dialect = bind.dialect.name
+    try:
+        if dialect == "sqlite":
+            exists = bind.execute(
+                text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"),
+                {"name": SQLITE_FTS_TABLE},
+            ).first()
+            for statement in SQLITE_FTS_DDL:
+                bind.exec_driver_sql(statement)
+            if not exists:
+                bind.exec_driver_sql(
+                    f"INSERT INTO {SQLITE_FTS_TABLE}({SQLITE_FTS_TABLE}) VALUES ('rebuild')"
+                )
+        elif dialect == "postgresql":
+            for statement in PG_SEARCH_DDL:
+                bind.exec_driver_sql(statement)
+        else:
+            return False
+    except DBAPIError as e:
+        # e.g. SQLite compiled without FTS5; searches fall back to ILIKE
+        print(f"Full-text search index unavailable: {str(e)}")
+        return False
+
+    _backend_cache.pop(str(bind.engine.url), None)
+    return True
+
+
+def drop_search_index(bind: Connection) -> None:
+    """
+    Drop the full-text search index created by ensure_search_index.
+    """
+    statements = SQLITE_FTS_DROP if bind.dialect.name == "sqlite" else PG_SEARCH_DROP
+    for statement in statements:
+        bind.exec_driver_sql(statement)
+    _backend_cache.pop(str(bind.engine.url), None)
+
+
+def get_search_backend(db: Any) -> Optional[str]:
+    """
+    Detect which full-text backend the database behind a session supports.
+
+    Args:
+        db: Database session
+
+    Returns:
+        FTS5, TSVECTOR, or None when only ILIKE matching is available
+    """
+    bind = db.get_bind()
+    key = str(bind.url)
+    if key not in _backend_cache:
+        backend = None
+        if bind.dialect.name == "sqlite":
+            found = db.execute(
+                text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"),
+                {"name": SQLITE_FTS_TABLE},
+            ).first()
+            backend = FTS5 if found else None
+        elif bind.dialect.name == "postgresql":
+            found = db.execute(
+                text("SELECT 1 FROM pg_indexes WHERE indexname = :name"),
+                {"name": PG_SEARCH_INDEX},
+            ).first()
+            backend = TSVECTOR if found else None
+        _backend_cache[key] = backend
+    return _backend_cache[key]
+
+
+def tokenize(term: str) -> List[str]:
+    """
+    Split a search box value into lower-cased word tokens.
+    """
+    return re.findall(r"\w+", term.lower())
+
+
+def build_match_query(tokens: List[str], backend: str) -> str:
+    """
+    Build a prefix-matching full-text query requiring every token.
+
+    Args:
+        tokens: Tokens from tokenize
+        backend: FTS5 or TSVECTOR
+
+    Returns:
+        Query string for FTS5 MATCH or to_tsquery
+    """
+    if backend == FTS5:
+        return " ".join(f'"{token}"*' for token in tokens)
+    return " & ".join(f"{token}:*" for token in tokens)
+
+
+def search_filter(query: Any, db: Any, term: str) -> Tuple[Any, Optional[Any]]:
+    """
+    Filter an Expense query or select() by a search term over description and notes.
+
+    Uses the full-text index when it exists and falls back to ILIKE
+    otherwise.
+
+    Args:
+        query: ORM query or Core select over Expense
+        db: Database session
+        term: Search box value
+
+    Returns:
+        Tuple containing (filtered query, ordering clause putting the best
+        matches first or None when matches are not ranked)
+    """
+    backend = get_search_backend(db)
+    tokens = tokenize(term)
+
+    if backend is None or not tokens:
+        pattern = f"%{term}%"
+        return query.filter(or_(Expense.description.ilike(pattern), Expense.notes.ilike(pattern))), None
+
+    match = build_match_query(tokens, backend)
+
+    if backend == FTS5:
+        fts = (
+            text(f"SELECT rowid, rank FROM {SQLITE_FTS_TABLE} WHERE {SQLITE_FTS_TABLE} MATCH :match")
+            .bindparams(bindparam("match", match))
+            .columns(column("rowid", Integer), column("rank", Float))
+            .subquery("fts")
+        )
+        return query.join(fts, fts.c.rowid == Expense.id), fts.c.rank
+
+    vector = literal_column(PG_SEARCH_VECTOR)
+    ts_query = func.to_tsquery("simple", match)
+    return query.filter(vector.op("@@")(ts_query)), func.ts_rank(vector, ts_query).desc()
+
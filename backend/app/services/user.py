@@ -1,6 +1,8 @@
 from typing import Optional
 from sqlalchemy.orm import Session
 
+from app.core.artifacts import artifact_cache
+from app.core.cache import invalidate_user
 from app.models.user import User
 
 
@@ -51,4 +53,24 @@ def update_user_last_login(db: Session, user_id: int) -> bool:
     
     user.last_login = datetime.utcnow()
     db.commit()
-    return True 
\ No newline at end of file
+    return True 
+
+def bump_data_version(db: Session, user_id: int) -> None:
+    """
+    Increment a user's data version, invalidating the ETags of their
+    collection and summary endpoints, their cached summaries and their
+    cached report files.
+
+    Call it in the same transaction as the write, before committing.
+    
+    Args:
+        db: Database session
+        user_id: Owner of the changed data
+    """
+    db.query(User).filter(User.id == user_id).update(
+        {User.data_version: User.data_version + 1}, synchronize_session=False
+    )
+    # Entries keyed by the old version are unreachable once this commits;
+    # drop them now instead of waiting for eviction
+    invalidate_user(user_id)
+    artifact_cache.invalidate_user(user_id)
@@ -0,0 +1,81 @@
+import base64
+import json
+from datetime import datetime
+from typing import Any, Optional, Tuple
+
+from sqlalchemy import and_, or_
+
+
+def encode_cursor(date: datetime, row_id: int) -> str:
+    """
+    Encode a (date, id) keyset position into an opaque cursor string.
+
+    Args:
+        date: Date of the last row on the page
+        row_id: ID of the last row on the page
+
+    Returns:
+        URL-safe cursor string
+    """
+    payload = json.dumps([date.isoformat(), row_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """
+    Decode a cursor produced by encode_cursor.
+
+    Args:
+        cursor: Cursor string received from the client
+
+    Returns:
+        Tuple containing (date, id) of the last row of the previous page
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        date_str, row_id = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        return datetime.fromisoformat(date_str), int(row_id)
+    except (TypeError, ValueError, UnicodeError) as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+
+
+def keyset_after(date_column: Any, id_column: Any, cursor: Tuple[datetime, int]) -> Any:
+    """
+    Build the predicate selecting rows that come after a cursor position
+    when ordering by (date DESC, id DESC).
+
+    Args:
+        date_column: Date column of the paginated table
+        id_column: Primary key column of the paginated table
+        cursor: Decoded (date, id) position
+
+    Returns:
+        SQLAlchemy boolean expression
+    """
+    last_date, last_id = cursor
+    return or_(
+        date_column < last_date,
+        and_(date_column == last_date, id_column < last_id),
+    )
+
+
+def next_cursor(rows: list, limit: int) -> Optional[str]:
+    """
+    Get the cursor for the page following rows, or None on the last page.
+
+    Args:
+        rows: Rows of the current page, as dicts or objects with date and id
+        limit: Requested page size
+
+    Returns:
+        Cursor string or None
+    """
+    if not rows or len(rows) < limit:
+        return None
+    last = rows[-1]
+    if isinstance(last, dict):
+        return encode_cursor(last["date"], last["id"])
+    return encode_cursor(last.date, last.id)
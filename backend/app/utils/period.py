@@ -0,0 +1,105 @@
+from datetime import MAXYEAR, date, datetime, timedelta
+from typing import Any, Optional, Tuple, Union
+
+from sqlalchemy import and_
+
+from app.utils.date import get_month_date_range
+
+
+def _to_datetime(value: Union[date, datetime]) -> datetime:
+    if isinstance(value, datetime):
+        return value
+    return datetime(value.year, value.month, value.day)
+
+
+def get_period_range(
+    year: Optional[int] = None,
+    month: Optional[int] = None,
+    quarter: Optional[int] = None,
+    start_date: Optional[Union[date, datetime]] = None,
+    end_date: Optional[Union[date, datetime]] = None,
+) -> Tuple[datetime, datetime]:
+    """
+    Resolve a reporting period into a half-open [start, end) datetime range.
+
+    Exactly one kind of period is used, in this order of precedence:
+    year + month, year + quarter, year, or a custom start_date/end_date
+    range where end_date is inclusive when it has no time component.
+
+    Args:
+        year: The year
+        month: The month (1-12), requires year
+        quarter: The quarter (1-4), requires year
+        start_date: Start of a custom range
+        end_date: End of a custom range
+
+    Returns:
+        Tuple containing (start, end) where end is exclusive
+
+    Raises:
+        ValueError: If the period is incomplete or out of range
+    """
+    if year is not None:
+        # The exclusive end of year 9999 is past datetime.max
+        if year < 1 or year >= MAXYEAR:
+            raise ValueError(f"Year must be between 1 and {MAXYEAR - 1}")
+        if month is not None:
+            first_day, last_day = get_month_date_range(year, month)
+        elif quarter is not None:
+            if quarter < 1 or quarter > 4:
+                raise ValueError("Quarter must be between 1 and 4")
+            first_day, _ = get_month_date_range(year, quarter * 3 - 2)
+            _, last_day = get_month_date_range(year, quarter * 3)
+        else:
+            first_day, _ = get_month_date_range(year, 1)
+            _, last_day = get_month_date_range(year, 12)
+        start = datetime.fromisoformat(first_day)
+        end = datetime.fromisoformat(last_day) + timedelta(days=1)
+        return start, end
+
+    if start_date is None or end_date is None:
+        raise ValueError("Either a year or both start_date and end_date are required")
+
+    start = _to_datetime(start_date)
+    end = _to_datetime(end_date)
+    if not isinstance(end_date, datetime) or end.time() == datetime.min.time():
+        # A bare date (or midnight) end covers the whole day
+        if end.date() == date.max:
+            raise ValueError("end_date is out of range")
+        end += timedelta(days=1)
+    if end <= start:
+        raise ValueError("end_date must not be before start_date")
+    return start, end
+
+
+def date_range_filter(column: Any, start: datetime, end: datetime) -> Any:
+    """
+    Build a sargable `column >= start AND column < end` predicate.
+
+    Args:
+        column: Date or datetime column
+        start: Inclusive lower bound
+        end: Exclusive upper bound
+
+    Returns:
+        SQLAlchemy boolean expression
+    """
+    return and_(column >= start, column < end)
+
+
+def period_filter(
+    column: Any,
+    year: Optional[int] = None,
+    month: Optional[int] = None,
+    quarter: Optional[int] = None,
+    start_date: Optional[Union[date, datetime]] = None,
+    end_date: Optional[Union[date, datetime]] = None,
+) -> Any:
+    """
+    Build a date range predicate for a period, see get_period_range.
+
+    Unlike extract('year', column) == year, the resulting predicate can be
+    answered from an index on column.
+    """
+    start, end = get_period_range(year, month, quarter, start_date, end_date)
+    return date_range_filter(column, start, end)
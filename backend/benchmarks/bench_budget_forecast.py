@@ -0,0 +1,66 @@
+"""
+Cost of the month-end budget forecasts in GET /api/budgets/overview/current:
+the daily per-category aggregate query plus the vectorized linear,
+weekday and exponentially weighted projections for all of a user's
+budgets at once.
+
+    python benchmarks/bench_budget_forecast.py --rows 1000000 --categories 20
+"""
+
+import argparse
+import os
+import tempfile
+from datetime import date, timedelta
+
+import numpy as np
+from common import make_engine, measure, report, seed
+from sqlalchemy.orm import sessionmaker
+
+from app.services import analytics
+from app.services.budget import get_budgets_with_stats
+from app.services.rollup import rebuild_rollups
+
+TODAY = date(2024, 6, 15)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=1000000)
+    parser.add_argument("--categories", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    path = os.path.join(tempfile.gettempdir(), "bench_budget_forecast.db")
+    engine = make_engine(path)
+    seed(engine, args.rows, categories=args.categories)
+    # seed() bypasses the ORM, so fill the rollups it would have maintained
+    rebuild_rollups(engine)
+    db = sessionmaker(bind=engine)()
+
+    budgets = get_budgets_with_stats(db, 1, year=TODAY.year, month=TODAY.month)
+    category_ids = [budget["category_id"] for budget in budgets]
+    history_start = TODAY - timedelta(days=analytics.FORECAST_HISTORY_DAYS - 1)
+    history = analytics.category_daily_spend(db, 1, category_ids, history_start, TODAY)
+    spent = np.array([budget["spent_amount"] for budget in budgets])
+    print(f"user 1: {len(budgets)} budgets, {int(np.count_nonzero(history)):,} non-empty category days")
+
+    report("budget stats query", measure(
+        lambda: get_budgets_with_stats(db, 1, year=TODAY.year, month=TODAY.month), args.repeat
+    ))
+    report("daily aggregate query", measure(
+        lambda: analytics.category_daily_spend(db, 1, category_ids, history_start, TODAY), args.repeat
+    ))
+    report("vectorized projections", measure(
+        lambda: analytics.forecast_month_end(history, spent, history_start, TODAY), args.repeat
+    ))
+    report("add_budget_forecasts total", measure(
+        lambda: analytics.add_budget_forecasts(db, 1, [dict(b) for b in budgets], TODAY), args.repeat
+    ))
+
+    db.close()
+    engine.dispose()
+    os.remove(path)
+
+
+if __name__ == "__main__":
+    main()
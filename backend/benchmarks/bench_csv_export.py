@@ -0,0 +1,71 @@
+"""
+Time to first byte, total time and peak Python memory of the CSV export:
+streaming batches with yield_per versus loading every expense with .all()
+and building the file in memory.
+
+    python benchmarks/bench_csv_export.py --rows 1000000
+"""
+
+import argparse
+import os
+import tempfile
+import time
+import tracemalloc
+
+from common import make_engine, seed
+from sqlalchemy.orm import joinedload, sessionmaker
+
+from app.models.expense import Expense
+from app.services.export import generate_csv, stream_expense_csv
+
+
+def run(name, make_chunks):
+    started = time.perf_counter()
+    chunks = make_chunks()
+    first = next(chunks)
+    first_byte = time.perf_counter() - started
+    size = len(first) + sum(len(chunk) for chunk in chunks)
+    total = time.perf_counter() - started
+
+    # Second pass for memory, as tracing slows everything down
+    tracemalloc.start()
+    for _ in make_chunks():
+        pass
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{name:<20} first byte {first_byte * 1000:9.1f} ms   total {total * 1000:9.1f} ms   "
+          f"peak {peak / 2 ** 20:8.1f} MiB   size {size / 2 ** 20:7.1f} MiB")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=1000000)
+    parser.add_argument("--batch-size", type=int, default=1000)
+    args = parser.parse_args()
+
+    path = os.path.join(tempfile.gettempdir(), "bench_csv_export.db")
+    engine = make_engine(path)
+    # One user, so the export covers every row
+    seed(engine, args.rows, users=1)
+    filters = [Expense.user_id == 1]
+
+    def load_all():
+        db = sessionmaker(bind=engine)()
+        try:
+            expenses = (
+                db.query(Expense).filter(*filters).options(joinedload(Expense.category))
+                .order_by(Expense.date.desc()).all()
+            )
+            yield generate_csv(expenses, None)
+        finally:
+            db.close()
+
+    run("load all", load_all)
+    run("stream", lambda: stream_expense_csv(engine, filters, args.batch_size))
+
+    engine.dispose()
+    os.remove(path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""
+Rows/sec of the GET /api/expenses read path: ORM hydration with
+joinedload plus response-model validation (before) versus the Core
+projection serialized through a precompiled TypeAdapter (after), and
+the embedded shape versus shape=normalized&include=categories.
+
+    python benchmarks/bench_expense_listing.py
+"""
+
+import argparse
+import json
+import os
+import tempfile
+from typing import List
+
+from common import Expense, make_engine, measure, seed
+from pydantic import TypeAdapter
+from sqlalchemy.orm import joinedload, sessionmaker
+
+from app.schemas.expense import ExpenseWithCategory
+from app.services import expense as expense_service
+
+response_adapter = TypeAdapter(List[ExpenseWithCategory])
+
+
+def orm_path(db, limit):
+    expenses = (
+        db.query(Expense)
+        .filter(Expense.user_id == 1)
+        .order_by(Expense.date.desc(), Expense.id.desc())
+        .options(joinedload(Expense.category))
+        .limit(limit)
+        .all()
+    )
+    for expense in expenses:
+        if not expense.category:
+            print(f"Warning: Expense id={expense.id} has missing category")
+    # What FastAPI does with response_model=List[ExpenseWithCategory]
+    validated = response_adapter.validate_python(expenses, from_attributes=True)
+    body = json.dumps(response_adapter.dump_python(validated, mode="json")).encode("utf-8")
+    db.expunge_all()
+    return body
+
+
+def projection_path(db, limit):
+    filters = expense_service.build_expense_filters(user_id=1)
+    rows = expense_service.list_expense_rows(db, filters, limit=limit)
+    return expense_service.serialize_expense_rows(rows)
+
+
+def normalized_path(db, limit):
+    filters = expense_service.build_expense_filters(user_id=1)
+    rows = expense_service.list_expense_rows(db, filters, limit=limit, with_category=False)
+    categories = expense_service.load_categories(db, (row["category_id"] for row in rows))
+    return expense_service.serialize_expense_page(rows, normalized=True, categories=categories)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    path = os.path.join(tempfile.gettempdir(), "bench_expense_listing.db")
+    engine = make_engine(path)
+    seed(engine, rows=20000, users=1)
+    db = sessionmaker(bind=engine)()
+
+    for limit in (100, 1000, 10000):
+        assert json.loads(orm_path(db, limit)) == json.loads(projection_path(db, limit))
+        before = measure(lambda: orm_path(db, limit), args.repeat)
+        after = measure(lambda: projection_path(db, limit), args.repeat)
+        print(f"page size {limit:>6}: before {limit / before['median'] * 1000:>10,.0f} rows/s   "
+              f"after {limit / after['median'] * 1000:>10,.0f} rows/s   "
+              f"speedup {before['median'] / after['median']:.1f}x")
+
+    for limit in (100, 1000, 10000):
+        embedded = measure(lambda: projection_path(db, limit), args.repeat)
+        normalized = measure(lambda: normalized_path(db, limit), args.repeat)
+        print(f"page size {limit:>6}: embedded {len(projection_path(db, limit)):>10,} B "
+              f"{embedded['median']:7.2f} ms   normalized {len(normalized_path(db, limit)):>10,} B "
+              f"{normalized['median']:7.2f} ms")
+
+    db.close()
+    engine.dispose()
+    os.remove(path)
+
+
+if __name__ == "__main__":
+    main()
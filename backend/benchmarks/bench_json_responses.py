@@ -0,0 +1,107 @@
+"""
+Compare the stdlib JSONResponse with the orjson-based default response
+class on payloads shaped like /api/budgets/stats,
+/api/reports/summary/annual and a 1,000 row expense list: raw encode time
+and end-to-end p99 latency through FastAPI.
+
+    python benchmarks/bench_json_responses.py
+"""
+
+import argparse
+import time
+from datetime import datetime, timedelta
+from typing import Any, Dict, List
+
+import common  # noqa: F401 - sets up the import path
+from fastapi import FastAPI
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, ORJSONResponse
+from fastapi.testclient import TestClient
+
+from app.schemas.expense import ExpenseWithCategory
+
+
+def budget_stats(n=20):
+    return [
+        {"id": i, "amount": 500.0, "year": 2024, "month": 5, "period": "monthly",
+         "currency": "USD", "category_id": i, "category_name": f"Category {i}",
+         "category_color": "#3498db", "spent_amount": 123.45 * i,
+         "remaining_amount": 500.0 - 123.45 * i, "percentage_used": 24.69 * i}
+        for i in range(n)
+    ]
+
+
+def annual_summary():
+    return {
+        "year": 2024,
+        "total_amount": 54321.0,
+        "monthly_data": [{"month": m, "amount": 4500.5 + m, "percentage": 8.3} for m in range(1, 13)],
+        "category_data": [{"name": f"Category {c}", "color": "#3498db", "amount": 5432.1,
+                           "percentage": 10.0} for c in range(10)],
+    }
+
+
+def expense_list(n=1000):
+    now = datetime(2024, 5, 1)
+    return [
+        {"id": i, "amount": 12.5 + i, "description": f"Expense {i}", "date": now - timedelta(hours=i),
+         "currency": "USD", "notes": None, "attachment_url": None, "category_id": i % 10,
+         "user_id": 1, "created_at": now, "updated_at": now,
+         "category": {"id": i % 10, "name": f"Category {i % 10}", "description": None,
+                      "color": "#3498db", "icon": "tag", "user_id": 1,
+                      "created_at": now, "updated_at": now}}
+        for i in range(n)
+    ]
+
+
+PAYLOADS = {
+    "budget stats (20 rows)": (budget_stats(), List[Dict[str, Any]]),
+    "annual summary": (annual_summary(), Dict[str, Any]),
+    "expense list (1000 rows)": (expense_list(), List[ExpenseWithCategory]),
+}
+
+
+def encode_ms(response_class, content, repeat):
+    started = time.perf_counter()
+    for _ in range(repeat):
+        response_class(content)
+    return (time.perf_counter() - started) / repeat * 1000
+
+
+def latency_p99(response_class, payload, model, requests):
+    app = FastAPI(default_response_class=response_class)
+
+    @app.get("/payload", response_model=model)
+    def endpoint():
+        return payload
+
+    client = TestClient(app)
+    client.get("/payload")
+    samples = []
+    for _ in range(requests):
+        started = time.perf_counter()
+        client.get("/payload")
+        samples.append((time.perf_counter() - started) * 1000)
+    samples.sort()
+    return samples[int(len(samples) * 0.99) - 1]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=200)
+    parser.add_argument("--requests", type=int, default=300)
+    args = parser.parse_args()
+
+    for name, (payload, model) in PAYLOADS.items():
+        # Encoders receive what FastAPI produces after response_model serialization
+        content = jsonable_encoder(payload)
+        std = encode_ms(JSONResponse, content, args.repeat)
+        fast = encode_ms(ORJSONResponse, content, args.repeat)
+        std_p99 = latency_p99(JSONResponse, payload, model, args.requests)
+        fast_p99 = latency_p99(ORJSONResponse, payload, model, args.requests)
+        print(f"{name:<26} encode json {std:7.3f} ms  orjson {fast:7.3f} ms ({std / fast:4.1f}x)   "
+              f"p99 json {std_p99:7.2f} ms  orjson {fast_p99:7.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
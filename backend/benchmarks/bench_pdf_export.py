@@ -0,0 +1,91 @@
+"""
+Render time and peak Python memory of the PDF report for 1k, 10k and 100k
+expenses: one Table holding every row (the previous layout) versus
+LongTable chunks with fixed column widths, with and without a cap on the
+listed rows.
+
+Rows are generated in memory, so only the rendering is measured.
+
+    python benchmarks/bench_pdf_export.py --sizes 1000 10000 100000
+"""
+
+import argparse
+import io
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+import common  # noqa: F401  (makes the backend package importable)
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import letter
+from reportlab.lib.styles import getSampleStyleSheet
+from reportlab.platypus import SimpleDocTemplate, Table, TableStyle
+
+from app.models.user import User
+from app.services.export import write_pdf
+from app.services.rollup import CategoryTotal
+
+USER = User(email="bench@example.com", preferred_currency="USD")
+
+
+def make_rows(count):
+    start = datetime(2024, 12, 31)
+    return [
+        (start - timedelta(minutes=5 * i), f"Category {i % 10}", "Groceries", 12.5, "USD", None)
+        for i in range(count)
+    ]
+
+
+def single_table(rows):
+    """The previous layout: every row in one auto-sized Table."""
+    doc = SimpleDocTemplate(io.BytesIO(), pagesize=letter)
+    data = [["Date", "Category", "Description", "Amount"]] + [
+        [date.strftime("%Y-%m-%d"), category, description, f"{amount:.2f} {currency}"]
+        for date, category, description, amount, currency, _ in rows
+    ]
+    table = Table(data)
+    table.setStyle(TableStyle([
+        ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
+        ('GRID', (0, 0), (-1, -1), 1, colors.black),
+    ]))
+    getSampleStyleSheet()
+    doc.build([table])
+
+
+def chunked(rows, max_rows=None):
+    summary = [CategoryTotal(f"Category {i}", None, 1000.0) for i in range(10)]
+    write_pdf(io.BytesIO(), rows, summary, 2024, None, USER, max_detail_rows=max_rows)
+
+
+def run(name, render):
+    started = time.perf_counter()
+    render()
+    elapsed = time.perf_counter() - started
+
+    # Second pass for memory, as tracing slows everything down
+    tracemalloc.start()
+    render()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{name:<32} {elapsed * 1000:10.0f} ms   peak {peak / 2 ** 20:8.1f} MiB")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--max-rows", type=int, default=10000)
+    parser.add_argument("--single-table-max", type=int, default=10000,
+                        help="Largest size rendered with the single-table layout")
+    args = parser.parse_args()
+
+    for size in args.sizes:
+        rows = make_rows(size)
+        if size <= args.single_table_max:
+            run(f"single table [{size:,}]", lambda: single_table(rows))
+        run(f"chunked [{size:,}]", lambda: chunked(rows))
+        if size > args.max_rows:
+            run(f"chunked, {args.max_rows:,} listed [{size:,}]", lambda: chunked(rows, args.max_rows))
+
+
+if __name__ == "__main__":
+    main()
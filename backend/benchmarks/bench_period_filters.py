@@ -0,0 +1,81 @@
+"""
+Compare extract('year'/'month') filters with the half-open date ranges
+produced by app.utils.period on the aggregate queries used by the summary,
+report and budget-stats endpoints.
+
+    python benchmarks/bench_period_filters.py --rows 1000000
+"""
+
+import argparse
+import os
+import tempfile
+
+from common import Category, Expense, make_engine, measure, report, seed
+from sqlalchemy import extract, func, select
+
+from app.utils.period import period_filter
+
+
+def extract_filter(year, month=None):
+    filters = [extract("year", Expense.date) == year]
+    if month:
+        filters.append(extract("month", Expense.date) == month)
+    return filters
+
+
+def range_filter(year, month=None):
+    return [period_filter(Expense.date, year=year, month=month)]
+
+
+def monthly_summary(date_filters, user_id):
+    return (
+        select(Category.name, Category.color, func.sum(Expense.amount))
+        .join(Expense, Expense.category_id == Category.id)
+        .where(Expense.user_id == user_id, *date_filters)
+        .group_by(Category.name, Category.color)
+    )
+
+
+def annual_by_month(date_filters, user_id):
+    return (
+        select(extract("month", Expense.date), func.sum(Expense.amount))
+        .where(Expense.user_id == user_id, *date_filters)
+        .group_by(extract("month", Expense.date))
+    )
+
+
+def category_spend(date_filters, user_id, category_id):
+    return select(func.sum(Expense.amount)).where(
+        Expense.user_id == user_id, Expense.category_id == category_id, *date_filters
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=1000000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    path = os.path.join(tempfile.gettempdir(), "bench_period_filters.db")
+    engine = make_engine(path)
+    seed(engine, args.rows)
+
+    cases = [
+        ("monthly summary (year+month)", lambda f: monthly_summary(f(2023, 6), 1)),
+        ("monthly summary (year)", lambda f: monthly_summary(f(2023), 1)),
+        ("annual summary by month", lambda f: annual_by_month(f(2023), 1)),
+        ("budget stats category spend", lambda f: category_spend(f(2023, 6), 1, 3)),
+    ]
+    with engine.connect() as conn:
+        for name, build in cases:
+            for label, filters in (("extract", extract_filter), ("range", range_filter)):
+                statement = build(filters)
+                report(f"{name} [{label}]",
+                       measure(lambda: conn.execute(statement).all(), args.repeat))
+
+    engine.dispose()
+    os.remove(path)
+
+
+if __name__ == "__main__":
+    main()
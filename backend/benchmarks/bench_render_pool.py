@@ -0,0 +1,74 @@
+"""
+Responsiveness of the API process while reports render: latency of a small
+pure-Python task (standing in for a cheap request) while several threads
+render PDF reports in-process versus through the render worker pool.
+
+    python benchmarks/bench_render_pool.py --reports 4 --rows 5000
+"""
+
+import argparse
+import statistics
+import threading
+import time
+from datetime import datetime, timedelta
+
+import common  # noqa: F401  (makes the backend package importable)
+
+from app.services.export import ReportOwner, collect_detail_rows
+from app.services.render import RenderService
+from app.services.rollup import CategoryTotal
+
+OWNER = ReportOwner("bench@example.com", None, None, "USD")
+SUMMARY = [CategoryTotal(f"Category {i}", None, 1000.0) for i in range(10)]
+
+
+def probe():
+    """A cheap request: a few milliseconds of dict operations."""
+    started = time.perf_counter()
+    sum({i: i for i in range(50000)}.values())
+    return (time.perf_counter() - started) * 1000
+
+
+def run(name, service, details, reports):
+    threads = [
+        threading.Thread(target=service.render_pdf, args=(details, SUMMARY, 2024, None, OWNER))
+        for _ in range(reports)
+    ]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    latencies = []
+    while any(thread.is_alive() for thread in threads):
+        latencies.append(probe())
+        time.sleep(0.005)
+    elapsed = time.perf_counter() - started
+    latencies.sort()
+    print(
+        f"{name:<12} {reports} reports in {elapsed:6.2f} s   probe median {statistics.median(latencies):7.2f} ms"
+        f"   p99 {latencies[int(len(latencies) * 0.99)]:8.2f} ms   max {latencies[-1]:8.2f} ms"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--reports", type=int, default=4)
+    parser.add_argument("--rows", type=int, default=5000)
+    parser.add_argument("--workers", type=int, default=2)
+    args = parser.parse_args()
+
+    start = datetime(2024, 12, 31)
+    details = collect_detail_rows(
+        (start - timedelta(minutes=5 * i), "Food", "Groceries", 12.5, "USD")
+        for i in range(args.rows)
+    )
+    print(f"idle probe median {statistics.median(probe() for _ in range(200)):.2f} ms")
+
+    run("in-process", RenderService(0, 600), details, args.reports)
+    pool = RenderService(args.workers, 600)
+    pool.run(sum, [0])  # start the workers before measuring
+    run("worker pool", pool, details, args.reports)
+    pool.shutdown()
+
+
+if __name__ == "__main__":
+    main()
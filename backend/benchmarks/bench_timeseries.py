@@ -0,0 +1,61 @@
+"""
+Latency of GET /api/expenses/timeseries over the five-year seed range:
+the daily GROUP BY in the database (or the monthly rollups) versus
+zero-filling, bucketing and the cumulative/moving-average series in
+pandas/NumPy.
+
+    python benchmarks/bench_timeseries.py --rows 1000000
+"""
+
+import argparse
+import os
+import tempfile
+from datetime import timedelta
+
+from common import DAYS, START_DATE, make_engine, measure, report, seed
+from sqlalchemy.orm import sessionmaker
+
+from app.services import analytics
+from app.services.rollup import rebuild_rollups
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=1000000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    path = os.path.join(tempfile.gettempdir(), "bench_timeseries.db")
+    engine = make_engine(path)
+    seed(engine, args.rows)
+    # seed() bypasses the ORM, so fill the rollups it would have maintained
+    rebuild_rollups(engine)
+    db = sessionmaker(bind=engine)()
+
+    # Whole months, so monthly buckets can be read from the rollups
+    start = START_DATE.date()
+    end = (start + timedelta(days=DAYS)).replace(day=1) - timedelta(days=1)
+    daily = analytics.daily_totals(db, 1, start, end)
+    print(f"user 1: {int(daily['count'].sum()):,} expenses on {len(daily):,} days")
+
+    report("database daily aggregate", measure(lambda: analytics.daily_totals(db, 1, start, end), args.repeat))
+    report("rollup monthly aggregate", measure(
+        lambda: analytics.monthly_rollup_totals(db, 1, start, end), args.repeat
+    ))
+    for granularity in analytics.GRANULARITIES:
+        report(f"fill + bucket [{granularity}]", measure(
+            lambda: analytics.build_timeseries(daily, granularity, start, end, True, 7), args.repeat
+        ))
+        report(f"endpoint total [{granularity}]", measure(
+            lambda: analytics.expense_timeseries(db, 1, granularity, start, end, cumulative=True,
+                                                 moving_average=7),
+            args.repeat,
+        ))
+
+    db.close()
+    engine.dispose()
+    os.remove(path)
+
+
+if __name__ == "__main__":
+    main()
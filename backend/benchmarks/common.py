@@ -0,0 +1,114 @@
+"""
+Shared helpers for the benchmark scripts in this directory.
+
+Benchmarks build their own SQLite database file, so they never touch the
+application database. Run them from the backend directory, e.g.:
+
+    python benchmarks/bench_period_filters.py --rows 1000000
+"""
+
+import os
+import random
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List
+
+# Make the backend package importable and keep app.core.database on SQLite
+backend_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if backend_dir not in sys.path:
+    sys.path.insert(0, backend_dir)
+os.environ.setdefault("DATABASE_URL", "sqlite:///./benchmark_app.db")
+
+from sqlalchemy import create_engine, insert  # noqa: E402
+from sqlalchemy.engine import Engine  # noqa: E402
+
+from app.core.database import Base  # noqa: E402
+from app.models.budget import Budget  # noqa: E402
+from app.models.category import Category  # noqa: E402
+from app.models.expense import Expense  # noqa: E402
+from app.models.user import User  # noqa: E402
+
+START_DATE = datetime(2020, 1, 1)
+DAYS = 5 * 365
+
+
+def make_engine(path: str) -> Engine:
+    """Create a fresh SQLite database with the application schema."""
+    if os.path.exists(path):
+        os.remove(path)
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(bind=engine)
+    return engine
+
+
+def seed(engine: Engine, rows: int, users: int = 10, categories: int = 10,
+         seed_value: int = 42, chunk: int = 50000) -> None:
+    """
+    Insert users, categories, one monthly budget per category and `rows`
+    expenses spread evenly over users and five years.
+    """
+    rng = random.Random(seed_value)
+    now = datetime.utcnow()
+    with engine.begin() as conn:
+        conn.execute(insert(User), [
+            {"id": u, "email": f"bench{u}@example.com", "hashed_password": "x",
+             "is_active": True, "created_at": now, "updated_at": now}
+            for u in range(1, users + 1)
+        ])
+        conn.execute(insert(Category), [
+            {"id": (u - 1) * categories + c, "name": f"Category {c}", "user_id": u,
+             "color": "#3498db", "icon": "tag", "created_at": now, "updated_at": now}
+            for u in range(1, users + 1) for c in range(1, categories + 1)
+        ])
+        conn.execute(insert(Budget), [
+            {"amount": 500.0, "year": year, "month": month, "period": "monthly",
+             "currency": "USD", "category_id": (u - 1) * categories + c, "user_id": u,
+             "created_at": now, "updated_at": now}
+            for u in range(1, users + 1) for c in range(1, categories + 1)
+            for year in range(2020, 2025) for month in range(1, 13)
+        ])
+
+    print(f"Seeding {rows:,} expenses...")
+    started = time.perf_counter()
+    for offset in range(0, rows, chunk):
+        batch = []
+        for _ in range(min(chunk, rows - offset)):
+            user_id = rng.randint(1, users)
+            batch.append({
+                "amount": round(rng.uniform(1, 200), 2),
+                "description": rng.choice(["Coffee", "Groceries", "Fuel", "Rent", "Cinema"]),
+                "date": START_DATE + timedelta(seconds=rng.randint(0, DAYS * 86400)),
+                "currency": "USD",
+                "user_id": user_id,
+                "category_id": (user_id - 1) * categories + rng.randint(1, categories),
+                "created_at": now,
+                "updated_at": now,
+            })
+        with engine.begin() as conn:
+            conn.execute(insert(Expense), batch)
+    with engine.begin() as conn:
+        conn.exec_driver_sql("ANALYZE")
+    print(f"Seeded in {time.perf_counter() - started:.1f}s")
+
+
+def measure(fn: Callable[[], object], repeat: int = 20) -> Dict[str, float]:
+    """Run fn repeatedly and return timing statistics in milliseconds."""
+    fn()  # warm up caches
+    samples: List[float] = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    samples.sort()
+    return {
+        "median": statistics.median(samples),
+        "p99": samples[min(len(samples) - 1, int(len(samples) * 0.99))],
+        "min": samples[0],
+    }
+
+
+def report(name: str, stats: Dict[str, float]) -> None:
+    print(f"{name:<45} median {stats['median']:9.2f} ms   "
+          f"p99 {stats['p99']:9.2f} ms   min {stats['min']:9.2f} ms")
@@ -0,0 +1,101 @@
+"""initial schema
+
+Revision ID: 0001
+Revises: 
+Create Date: 2025-05-10 12:00:00.000000
+
+Tables that already exist (for example because init_db() created them on
+application startup) are left untouched, so existing databases can be
+brought under Alembic with a plain `alembic upgrade head`.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0001"
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    existing = set(sa.inspect(op.get_bind()).get_table_names())
+
+    if "users" not in existing:
+        op.create_table(
+            "users",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("email", sa.String(), nullable=False),
+            sa.Column("first_name", sa.String(), nullable=True),
+            sa.Column("last_name", sa.String(), nullable=True),
+            sa.Column("hashed_password", sa.String(), nullable=False),
+            sa.Column("is_active", sa.Boolean(), nullable=True),
+            sa.Column("is_admin", sa.Boolean(), nullable=True),
+            sa.Column("preferred_currency", sa.String(), nullable=True),
+            sa.Column("created_at", sa.DateTime(), nullable=True),
+            sa.Column("updated_at", sa.DateTime(), nullable=True),
+            sa.Column("last_login", sa.DateTime(), nullable=True),
+        )
+        op.create_index("ix_users_id", "users", ["id"])
+        op.create_index("ix_users_email", "users", ["email"], unique=True)
+
+    if "categories" not in existing:
+        op.create_table(
+            "categories",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("name", sa.String(), nullable=False),
+            sa.Column("description", sa.String(), nullable=True),
+            sa.Column("color", sa.String(), nullable=True),
+            sa.Column("icon", sa.String(), nullable=True),
+            sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id"), nullable=False),
+            sa.Column("created_at", sa.DateTime(), nullable=True),
+            sa.Column("updated_at", sa.DateTime(), nullable=True),
+        )
+        op.create_index("ix_categories_id", "categories", ["id"])
+
+    if "expenses" not in existing:
+        op.create_table(
+            "expenses",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("amount", sa.Float(), nullable=False),
+            sa.Column("description", sa.String(), nullable=True),
+            sa.Column("date", sa.DateTime(), nullable=False),
+            sa.Column("currency", sa.String(), nullable=True),
+            sa.Column("notes", sa.Text(), nullable=True),
+            sa.Column("attachment_url", sa.String(), nullable=True),
+            sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id"), nullable=False),
+            sa.Column(
+                "category_id", sa.Integer(), sa.ForeignKey("categories.id"), nullable=False
+            ),
+            sa.Column("created_at", sa.DateTime(), nullable=True),
+            sa.Column("updated_at", sa.DateTime(), nullable=True),
+        )
+        op.create_index("ix_expenses_id", "expenses", ["id"])
+
+    if "budgets" not in existing:
+        op.create_table(
+            "budgets",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("amount", sa.Float(), nullable=False),
+            sa.Column("year", sa.Integer(), nullable=False),
+            sa.Column("month", sa.Integer(), nullable=True),
+            sa.Column("period", sa.String(), nullable=True),
+            sa.Column("currency", sa.String(), nullable=True),
+            sa.Column(
+                "category_id", sa.Integer(), sa.ForeignKey("categories.id"), nullable=False
+            ),
+            sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id"), nullable=False),
+            sa.Column("created_at", sa.DateTime(), nullable=True),
+            sa.Column("updated_at", sa.DateTime(), nullable=True),
+        )
+        op.create_index("ix_budgets_id", "budgets", ["id"])
+
+
+def downgrade() -> None:
+    op.drop_table("budgets")
+    op.drop_table("expenses")
+    op.drop_table("categories")
+    op.drop_table("users")
@@ -0,0 +1,58 @@
+"""composite indexes for per-user queries
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2025-05-10 12:30:00.000000
+
+Every hot query filters on user_id and then orders or groups by date or
+category_id, but only primary keys were indexed. These indexes back:
+
+- expense listings: ORDER BY date DESC, id DESC (keyset pagination)
+- per-category spend over a date range (summaries, budget stats)
+- budget lookups by period and category
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0002"
+down_revision: Union[str, None] = "0001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_expenses_user_date_id",
+        "expenses",
+        ["user_id", sa.text("date DESC"), sa.text("id DESC")],
+        if_not_exists=True,
+    )
+    op.create_index(
+        "ix_expenses_user_category_date",
+        "expenses",
+        ["user_id", "category_id", "date"],
+        if_not_exists=True,
+    )
+    op.create_index(
+        "ix_budgets_user_year_month_category",
+        "budgets",
+        ["user_id", "year", "month", "category_id"],
+        if_not_exists=True,
+    )
+    op.create_index(
+        "ix_categories_user_name",
+        "categories",
+        ["user_id", "name"],
+        if_not_exists=True,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_categories_user_name", table_name="categories")
+    op.drop_index("ix_budgets_user_year_month_category", table_name="budgets")
+    op.drop_index("ix_expenses_user_category_date", table_name="expenses")
+    op.drop_index("ix_expenses_user_date_id", table_name="expenses")
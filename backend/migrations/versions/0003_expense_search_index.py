@@ -0,0 +1,102 @@
+"""full-text search index for expense description and notes
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2025-05-12 09:00:00.000000
+
+SQLite gets an external-content FTS5 table kept in sync by triggers;
+PostgreSQL gets a GIN index over a tsvector of description and notes.
+The DDL is a copy of app/services/search.py as of this revision, so that
+later changes to the app do not alter this migration.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+from sqlalchemy.exc import DBAPIError
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0003"
+down_revision: Union[str, None] = "0002"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+SQLITE_UPGRADE = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS expenses_fts USING fts5(
+        description, notes, content='expenses', content_rowid='id'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS expenses_fts_ai AFTER INSERT ON expenses BEGIN
+        INSERT INTO expenses_fts(rowid, description, notes)
+        VALUES (new.id, new.description, new.notes);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS expenses_fts_ad AFTER DELETE ON expenses BEGIN
+        INSERT INTO expenses_fts(expenses_fts, rowid, description, notes)
+        VALUES ('delete', old.id, old.description, old.notes);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS expenses_fts_au AFTER UPDATE OF description, notes ON expenses
+    BEGIN
+        INSERT INTO expenses_fts(expenses_fts, rowid, description, notes)
+        VALUES ('delete', old.id, old.description, old.notes);
+        INSERT INTO expenses_fts(rowid, description, notes)
+        VALUES (new.id, new.description, new.notes);
+    END
+    """,
+    # Index the rows that already exist
+    "INSERT INTO expenses_fts(expenses_fts) VALUES ('rebuild')",
+]
+
+SQLITE_DOWNGRADE = [
+    "DROP TRIGGER IF EXISTS expenses_fts_au",
+    "DROP TRIGGER IF EXISTS expenses_fts_ad",
+    "DROP TRIGGER IF EXISTS expenses_fts_ai",
+    "DROP TABLE IF EXISTS expenses_fts",
+]
+
+PG_UPGRADE = [
+    """
+    CREATE INDEX IF NOT EXISTS ix_expenses_search ON expenses
+    USING gin (to_tsvector('simple', coalesce(description, '') || ' ' || coalesce(notes, '')))
+    """,
+]
+
+PG_DOWNGRADE = ["DROP INDEX IF EXISTS ix_expenses_search"]
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name == "sqlite":
+        exists = bind.exec_driver_sql(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'expenses_fts'"
+        ).first()
+        if exists:
+            # Created by init_db() already
+            return
+        try:
+            for statement in SQLITE_UPGRADE:
+                bind.exec_driver_sql(statement)
+        except DBAPIError as e:
+            # e.g. SQLite compiled without FTS5; searches fall back to ILIKE
+            print(f"Full-text search index unavailable: {str(e)}")
+    elif bind.dialect.name == "postgresql":
+        for statement in PG_UPGRADE:
+            bind.exec_driver_sql(statement)
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name == "sqlite":
+        statements = SQLITE_DOWNGRADE
+    elif bind.dialect.name == "postgresql":
+        statements = PG_DOWNGRADE
+    else:
+        return
+    for statement in statements:
+        bind.exec_driver_sql(statement)
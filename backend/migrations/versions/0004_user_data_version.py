@@ -0,0 +1,37 @@
+"""per-user data version for conditional GETs
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2025-05-14 10:00:00.000000
+
+users.data_version is incremented by every write to a user's expenses,
+categories or budgets and is part of the ETag of their collection and
+summary endpoints (see app/core/etag.py).
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0004"
+down_revision: Union[str, None] = "0003"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Databases created by init_db() already have the column
+    columns = {column["name"] for column in sa.inspect(op.get_bind()).get_columns("users")}
+    if "data_version" in columns:
+        return
+    with op.batch_alter_table("users") as batch_op:
+        batch_op.add_column(
+            sa.Column("data_version", sa.Integer(), nullable=False, server_default="0")
+        )
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("users") as batch_op:
+        batch_op.drop_column("data_version")
@@ -0,0 +1,60 @@
+"""monthly expense rollups
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2025-05-16 09:30:00.000000
+
+expense_rollups holds per-user totals and counts by (year, month,
+category, currency). It is maintained on every expense write by
+app/services/rollup.py and read by the summary endpoints. The table is
+filled from the existing expenses here, with SQL copied from the app as
+of this revision; run rebuild_rollups.py to recompute it later.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0005"
+down_revision: Union[str, None] = "0004"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Totals by rollup key; expenses without a currency count as USD
+BACKFILL = """
+    INSERT INTO expense_rollups (user_id, year, month, category_id, currency, total, count)
+    SELECT user_id, {year}, {month}, category_id, coalesce(currency, 'USD'),
+           sum(amount), count(id)
+    FROM expenses
+    GROUP BY user_id, {year}, {month}, category_id, coalesce(currency, 'USD')
+"""
+
+SQLITE_DATE_PARTS = ("CAST(strftime('%Y', date) AS INTEGER)", "CAST(strftime('%m', date) AS INTEGER)")
+DATE_PARTS = ("CAST(EXTRACT(year FROM date) AS INTEGER)", "CAST(EXTRACT(month FROM date) AS INTEGER)")
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    # Databases created by init_db() already have the table
+    if not sa.inspect(bind).has_table("expense_rollups"):
+        op.create_table(
+            "expense_rollups",
+            sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id", ondelete="CASCADE"), nullable=False),
+            sa.Column("year", sa.Integer(), nullable=False),
+            sa.Column("month", sa.Integer(), nullable=False),
+            sa.Column("category_id", sa.Integer(), sa.ForeignKey("categories.id", ondelete="CASCADE"), nullable=False),
+            sa.Column("currency", sa.String(), nullable=False),
+            sa.Column("total", sa.Float(), nullable=False),
+            sa.Column("count", sa.Integer(), nullable=False),
+            sa.PrimaryKeyConstraint("user_id", "year", "month", "category_id", "currency"),
+        )
+    year, month = SQLITE_DATE_PARTS if bind.dialect.name == "sqlite" else DATE_PARTS
+    op.execute("DELETE FROM expense_rollups")
+    op.execute(BACKFILL.format(year=year, month=month))
+
+
+def downgrade() -> None:
+    op.drop_table("expense_rollups")
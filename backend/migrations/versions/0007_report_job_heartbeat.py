@@ -0,0 +1,34 @@
+"""heartbeat of running report jobs
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2025-06-09 10:00:00.000000
+
+report_jobs.heartbeat_at is refreshed by the process running a job, so
+that on startup only jobs whose runner stopped are queued again.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0007"
+down_revision: Union[str, None] = "0006"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Databases created by init_db() already have the column
+    columns = {column["name"] for column in sa.inspect(op.get_bind()).get_columns("report_jobs")}
+    if "heartbeat_at" in columns:
+        return
+    with op.batch_alter_table("report_jobs") as batch_op:
+        batch_op.add_column(sa.Column("heartbeat_at", sa.DateTime(), nullable=True))
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("report_jobs") as batch_op:
+        batch_op.drop_column("heartbeat_at")
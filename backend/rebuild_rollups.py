@@ -0,0 +1,29 @@
+"""
+Recompute the expense_rollups table from the expenses table.
+
+Rollups are kept up to date by every write through the API; run this
+after editing expenses directly in the database or restoring a backup.
+
+    python rebuild_rollups.py [--user-id ID]
+"""
+import argparse
+
+from app.core.database import engine
+from app.services.rollup import rebuild_rollups
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rebuild monthly expense rollups")
+    parser.add_argument(
+        "--user-id", type=int, default=None, help="Only rebuild this user's rollups"
+    )
+    args = parser.parse_args()
+
+    scope = f"user_id={args.user_id}" if args.user_id is not None else "all users"
+    print(f"Rebuilding expense rollups for {scope}...")
+    rebuild_rollups(engine, user_id=args.user_id)
+    print("Rollups rebuilt")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+import os
+import sys
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+
+@pytest.fixture(autouse=True)
+def clear_summary_cache(tmp_path, monkeypatch):
+    """
+    Start every test with empty summary and report caches.
+
+    Test modules create fresh databases whose user IDs and data versions
+    repeat, so entries cached by one test would otherwise be served to the
+    next. Report files go to a directory of the test's own instead of the
+    configured ARTIFACT_CACHE_DIR. Only touches the caches if a test module
+    already imported the app.
+    """
+    cache = sys.modules.get("app.core.cache")
+    if cache is not None:
+        cache.summary_cache.clear()
+    artifacts = sys.modules.get("app.core.artifacts")
+    if artifacts is not None:
+        monkeypatch.setattr(artifacts.artifact_cache, "directory", str(tmp_path / "artifacts"))
+        artifacts.artifact_cache.clear()
+    yield
+
+
+@pytest.fixture
+def engine(request, tmp_path):
+    """
+    Database of one test, with every table created.
+
+    A SQLite file in tmp_path by default; parametrize indirectly with
+    "postgresql" to use the scratch database at TEST_POSTGRES_URL instead.
+    """
+    # Imported here, after the test module loaded the app with test settings
+    from app.models.expense import Expense
+
+    backend = getattr(request, "param", "sqlite")
+    if backend == "postgresql":
+        engine = create_engine(os.environ["TEST_POSTGRES_URL"])
+    else:
+        engine = create_engine(
+            f"sqlite:///{tmp_path / 'test.db'}", connect_args={"check_same_thread": False}
+        )
+    # test_config reloads app.core.database, so use the metadata the models are bound to
+    Expense.metadata.create_all(bind=engine)
+    yield engine
+    if backend == "postgresql":
+        Expense.metadata.drop_all(bind=engine)
+    engine.dispose()
+
+
+@pytest.fixture
+def session_factory(engine):
+    """
+    Session factory bound to the test's database.
+    """
+    return sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+@pytest.fixture
+def override_db(session_factory):
+    """
+    Serve the API's database sessions from the test's database.
+    """
+    from app.core.deps import get_db
+    from app.main import app
+
+    def override_get_db():
+        session = session_factory()
+        try:
+            yield session
+        finally:
+            session.close()
+
+    app.dependency_overrides[get_db] = override_get_db
+    yield
+    app.dependency_overrides.pop(get_db, None)
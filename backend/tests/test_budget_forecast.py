@@ -0,0 +1,121 @@
+import pytest
+import numpy as np
+from datetime import date, datetime, timedelta
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+# Import the test configuration
+from test_config import get_auth_headers, setup_test_environment
+
+# Set up the test environment
+with setup_test_environment():
+    # Import the app with test settings
+    from app.main import app
+
+from app.models.budget import Budget
+from app.models.category import Category
+from app.models.expense import Expense
+from app.models.user import User
+from app.services.analytics import forecast_month_end
+
+# A Wednesday in a 30-day month, 20 days left
+TODAY = date(2024, 4, 10)
+
+
+def history_for(daily, days=56):
+    """History window ending TODAY built from a function of the day."""
+    start = TODAY - timedelta(days=days - 1)
+    return np.array([[daily(start + timedelta(days=i)) for i in range(days)]]), start
+
+
+def test_constant_spending_is_projected_identically_by_all_models():
+    history, start = history_for(lambda day: 10.0)
+    forecast = forecast_month_end(history, np.array([100.0]), start, TODAY)
+    assert forecast["daily_burn_rate"][0] == pytest.approx(10)
+    assert forecast["days_remaining"][0] == 20
+    for model in ("linear", "weekday", "ewma"):
+        assert forecast[model][0] == pytest.approx(300)
+
+
+def test_weekday_model_follows_weekly_pattern():
+    # Only Saturdays: 70 each
+    history, start = history_for(lambda day: 70.0 if day.weekday() == 5 else 0.0)
+    forecast = forecast_month_end(history, np.array([70.0]), start, TODAY)
+    # Three Saturdays left in April 2024 (13th, 20th, 27th)
+    assert forecast["weekday"][0] == pytest.approx(70 + 3 * 70)
+    # The month-to-date rate spreads the one Saturday over ten days
+    assert forecast["linear"][0] == pytest.approx(70 + 7 * 20)
+
+
+def test_ewma_model_favours_recent_days():
+    history, start = history_for(lambda day: 20.0 if day > TODAY - timedelta(days=7) else 0.0)
+    forecast = forecast_month_end(history, np.array([140.0]), start, TODAY)
+    assert forecast["ewma"][0] > forecast["linear"][0]
+    assert forecast["ewma"][0] < 140 + 20 * 20
+
+
+def test_categories_are_projected_independently():
+    start = TODAY - timedelta(days=55)
+    history = np.vstack([np.full(56, 5.0), np.zeros(56)])
+    forecast = forecast_month_end(history, np.array([50.0, 0.0]), start, TODAY)
+    assert forecast["linear"].tolist() == pytest.approx([150, 0])
+
+
+@pytest.fixture(scope="function")
+def env(session_factory, override_db):
+    now = datetime.now()
+    db = session_factory()
+    user = User(email="forecast@example.com", hashed_password="x", is_active=True)
+    db.add(user)
+    db.commit()
+    categories = [Category(name=f"Category {i}", user_id=user.id) for i in range(10)]
+    db.add_all(categories)
+    db.commit()
+    db.add_all([
+        Budget(amount=500, year=now.year, month=now.month, category_id=c.id, user_id=user.id)
+        for c in categories
+    ])
+    # 12 per day on every day of the month so far, for the first category
+    db.add_all([
+        Expense(amount=12, date=datetime(now.year, now.month, day, 8), user_id=user.id,
+                category_id=categories[0].id)
+        for day in range(1, now.day + 1)
+    ])
+    db.commit()
+    ids = {"user_id": user.id, "first": categories[0].id}
+    db.close()
+
+    yield {"client": TestClient(app), "headers": get_auth_headers(ids["user_id"]), **ids}
+
+
+def test_current_overview_includes_forecasts(env):
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            statements.append(statement)
+
+    event.listen(Engine, "before_cursor_execute", record)
+    try:
+        response = env["client"].get("/api/budgets/overview/current", headers=env["headers"])
+    finally:
+        event.remove(Engine, "before_cursor_execute", record)
+
+    assert response.status_code == 200
+    budgets = {item["category_id"]: item for item in response.json()}
+    assert len(budgets) == 10
+
+    now = datetime.now()
+    days_in_month = (date(now.year + now.month // 12, now.month % 12 + 1, 1) - timedelta(days=1)).day
+    first = budgets[env["first"]]
+    assert first["spent_amount"] == 12 * now.day
+    assert first["daily_burn_rate"] == 12
+    assert first["days_remaining"] == days_in_month - now.day
+    assert first["forecast"]["linear"] == pytest.approx(12 * days_in_month)
+    assert set(first["forecast"]) == {"linear", "weekday", "ewma"}
+    other = budgets[env["first"] + 1]
+    assert other["forecast"] == {"linear": 0, "weekday": 0, "ewma": 0}
+
+    # User lookup, budget stats and one daily aggregate for all ten budgets
+    assert len(statements) == 3
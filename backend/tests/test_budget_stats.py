@@ -0,0 +1,100 @@
+import pytest
+from datetime import datetime
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+# Import the test configuration
+from test_config import get_auth_headers, setup_test_environment
+
+# Set up the test environment
+with setup_test_environment():
+    # Import the app with test settings
+    from app.main import app
+
+from app.models.budget import Budget
+from app.models.category import Category
+from app.models.expense import Expense
+from app.models.user import User
+
+CATEGORIES = 20
+
+
+@pytest.fixture(scope="function")
+def env(session_factory, override_db):
+    db = session_factory()
+    user = User(email="budget-stats@example.com", hashed_password="x", is_active=True)
+    db.add(user)
+    db.commit()
+    categories = [
+        Category(name=f"Category {i}", color=f"#0000{i:02d}", user_id=user.id)
+        for i in range(CATEGORIES)
+    ]
+    db.add_all(categories)
+    db.commit()
+    # Every category has a budget in March and April 2024; only even ones have spending
+    db.add_all([
+        Budget(amount=100.0, year=2024, month=month, category_id=c.id, user_id=user.id)
+        for c in categories for month in (3, 4)
+    ])
+    db.add_all([
+        Expense(amount=float(i + 1), date=datetime(2024, month, 10), user_id=user.id,
+                category_id=c.id)
+        for i, c in enumerate(categories) if i % 2 == 0 for month in (3, 4)
+    ])
+    db.commit()
+    ids = {"user_id": user.id, "category_ids": [c.id for c in categories]}
+    db.close()
+
+    yield {"client": TestClient(app), "headers": get_auth_headers(ids["user_id"]), **ids}
+
+
+def test_budget_stats_values(env):
+    response = env["client"].get("/api/budgets/stats?year=2024&month=3", headers=env["headers"])
+    assert response.status_code == 200
+    stats = sorted(response.json(), key=lambda item: item["category_id"])
+    assert len(stats) == CATEGORIES
+
+    first, second = stats[0], stats[1]
+    assert first["category_name"] == "Category 0"
+    assert first["category_color"] == "#000000"
+    assert first["spent_amount"] == 1.0
+    assert first["remaining_amount"] == 99.0
+    assert first["percentage_used"] == 1.0
+    assert second["spent_amount"] == 0.0
+    assert second["remaining_amount"] == 100.0
+    assert second["percentage_used"] == 0
+
+
+def test_budget_stats_for_year_sum_all_months(env):
+    response = env["client"].get(
+        f"/api/budgets/stats?year=2024&category_id={env['category_ids'][4]}",
+        headers=env["headers"],
+    )
+    assert response.status_code == 200
+    stats = response.json()
+    # One budget per month, each compared with the whole year's spending
+    assert sorted(item["month"] for item in stats) == [3, 4]
+    assert all(item["spent_amount"] == 10.0 for item in stats)
+
+
+@pytest.mark.parametrize("url", ["/api/budgets/stats?year=2024&month=3", "/api/budgets/overview/current"])
+def test_budget_stats_query_count_is_constant(env, url):
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            statements.append(statement)
+
+    event.listen(Engine, "before_cursor_execute", record)
+    try:
+        response = env["client"].get(url, headers=env["headers"])
+    finally:
+        event.remove(Engine, "before_cursor_execute", record)
+
+    assert response.status_code == 200
+    # One statement for the stats themselves, whatever the number of budgets
+    stats_statements = [s for s in statements if "budgets" in s.lower()]
+    assert len(stats_statements) == 1
+    # Plus the authenticated user lookup
+    assert len(statements) <= 2
@@ -89,4 +89,20 @@ def setup_test_environment():
             for p in reversed(patches):
                 p.__exit__(*args, **kwargs)
     
-    return MultiPatch() 
\ No newline at end of file
+    return MultiPatch() 
+
+def get_auth_headers(user_id):
+    """
+    Build a bearer token header for user_id.
+    
+    The token is signed with the settings object the auth dependency actually
+    reads, which may differ from app.core.security.settings depending on the
+    order in which test modules were imported.
+    """
+    from jose import jwt
+    from app.core import deps
+    
+    token = jwt.encode(
+        {"sub": str(user_id)}, deps.settings.SECRET_KEY, algorithm=deps.settings.ALGORITHM
+    )
+    return {"Authorization": f"Bearer {token}"}
@@ -0,0 +1,105 @@
+import pytest
+from datetime import datetime, timedelta
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+
+# Import the test configuration
+from test_config import get_auth_headers, setup_test_environment
+
+# Set up the test environment
+with setup_test_environment():
+    # Import the app with test settings
+    from app.main import app
+
+from app.models.category import Category
+from app.models.expense import Expense
+from app.models.user import User
+from app.services.export import stream_expense_csv
+
+
+@pytest.fixture(scope="function")
+def env(engine, session_factory, override_db):
+    db = session_factory()
+    user = User(email="export@example.com", hashed_password="x", is_active=True)
+    other = User(email="other@example.com", hashed_password="x", is_active=True)
+    db.add_all([user, other])
+    db.commit()
+    food = Category(name="Food", user_id=user.id)
+    travel = Category(name="Travel", user_id=user.id)
+    foreign = Category(name="Foreign", user_id=other.id)
+    db.add_all([food, travel, foreign])
+    db.commit()
+    start = datetime(2024, 1, 1, 12)
+    db.add_all([
+        Expense(amount=day + 0.5, description=f"Day {day}", notes="note" if day == 0 else None,
+                date=start + timedelta(days=day), user_id=user.id,
+                category_id=(food if day % 2 else travel).id)
+        for day in range(35)
+    ])
+    db.add(Expense(amount=1, date=start, user_id=other.id, category_id=foreign.id))
+    db.commit()
+    ids = {"user_id": user.id, "food": food.id}
+    db.close()
+
+    yield {"client": TestClient(app), "headers": get_auth_headers(ids["user_id"]),
+           "engine": engine, **ids}
+
+
+def download(env, **params):
+    response = env["client"].get("/api/reports/csv", params=params, headers=env["headers"])
+    assert response.status_code == 200, response.text
+    assert response.headers["content-type"].startswith("text/csv")
+    return [line.split("\t") for line in response.content.decode("utf-8").splitlines()]
+
+
+def test_csv_export_contains_every_matching_expense(env):
+    lines = download(env)
+    header, rows = lines[0], lines[1:]
+    assert [field.strip() for field in header] == [
+        "Date", "Category", "Description", "Amount", "Currency", "Notes"
+    ]
+    assert len(rows) == 35
+    # Newest first, padded like the previous export
+    assert [field.strip() for field in rows[0]] == ["2024-02-04", "Travel", "Day 34", "34.50", "USD", ""]
+    assert rows[0][0] == "2024-02-04".ljust(15)
+    assert [field.strip() for field in rows[-1]] == ["2024-01-01", "Travel", "Day 0", "0.50", "USD", "note"]
+
+
+def test_csv_export_filters(env):
+    assert len(download(env, year=2024, month=2)) == 1 + 4
+    assert len(download(env, month=1)) == 1 + 31
+    assert len(download(env, year=2023)) == 1
+    rows = download(env, category_id=env["food"])[1:]
+    assert len(rows) == 17
+    assert {row[1].strip() for row in rows} == {"Food"}
+
+
+def test_csv_export_rejects_invalid_month(env):
+    response = env["client"].get("/api/reports/csv?year=2024&month=13", headers=env["headers"])
+    assert response.status_code == 400
+
+
+def test_csv_export_rejects_out_of_range_year(env):
+    response = env["client"].get("/api/reports/csv?year=9999", headers=env["headers"])
+    assert response.status_code == 400
+
+
+def test_csv_is_streamed_in_batches(env):
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(env["engine"], "before_cursor_execute", record)
+    try:
+        chunks = stream_expense_csv(env["engine"], [Expense.user_id == env["user_id"]], batch_size=10)
+        # The header goes out before the query runs
+        header = next(chunks)
+        assert header.startswith(b"Date") and header.count(b"\n") == 1
+        assert statements == []
+        rest = list(chunks)
+    finally:
+        event.remove(env["engine"], "before_cursor_execute", record)
+
+    assert len(statements) == 1
+    assert [chunk.count(b"\n") for chunk in rest] == [10, 10, 10, 5]
@@ -0,0 +1,144 @@
+import threading
+from datetime import datetime
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+# Import the test configuration
+from test_config import get_auth_headers, setup_test_environment
+
+# Set up the test environment
+with setup_test_environment():
+    # Import the app with test settings
+    from app.main import app
+
+from app.models.budget import Budget
+from app.models.category import Category
+from app.models.expense import Expense
+from app.models.user import User
+
+SECTIONS = ["budgets", "summary", "recent_expenses", "categories"]
+
+
+@pytest.fixture(scope="function")
+def env(session_factory, override_db):
+    db = session_factory()
+    user = User(email="dashboard@example.com", hashed_password="x", is_active=True)
+    db.add(user)
+    db.commit()
+    food = Category(name="Food", color="#111111", user_id=user.id)
+    travel = Category(name="Travel", color="#222222", user_id=user.id)
+    db.add_all([food, travel])
+    db.commit()
+    db.add_all(
+        [
+            Expense(
+                amount=float(day),
+                description=f"Day {day}",
+                date=datetime(2024, 3, day),
+                user_id=user.id,
+                category_id=(food if day % 2 else travel).id,
+            )
+            for day in range(1, 11)
+        ]
+    )
+    db.add(Budget(amount=100, year=2024, month=3, category_id=food.id, user_id=user.id))
+    now = datetime.now()
+    db.add(
+        Budget(amount=50, year=now.year, month=now.month, category_id=travel.id, user_id=user.id)
+    )
+    db.add(
+        Expense(
+            amount=5,
+            description="This month",
+            date=now.replace(day=1),
+            user_id=user.id,
+            category_id=travel.id,
+        )
+    )
+    db.commit()
+    ids = {"user_id": user.id}
+    db.close()
+
+    yield {"client": TestClient(app), "headers": get_auth_headers(ids["user_id"]), **ids}
+
+
+def test_dashboard_matches_individual_endpoints(env):
+    client, headers = env["client"], env["headers"]
+    response = client.get("/api/dashboard?year=2024&month=3&recent=3", headers=headers)
+    assert response.status_code == 200
+    dashboard = response.json()
+
+    assert dashboard["year"] == 2024 and dashboard["month"] == 3
+    assert (
+        dashboard["budgets"]
+        == client.get("/api/budgets/stats?year=2024&month=3", headers=headers).json()
+    )
+    assert (
+        dashboard["summary"]
+        == client.get("/api/expenses/summary/monthly?year=2024&month=3", headers=headers).json()
+    )
+    assert dashboard["categories"] == client.get("/api/categories/", headers=headers).json()
+    assert (
+        dashboard["recent_expenses"] == client.get("/api/expenses/?limit=3", headers=headers).json()
+    )
+    assert [e["description"] for e in dashboard["recent_expenses"]] == [
+        "This month",
+        "Day 10",
+        "Day 9",
+    ]
+
+
+def test_current_month_budgets_include_forecasts(env):
+    client, headers = env["client"], env["headers"]
+    dashboard = client.get("/api/dashboard", headers=headers).json()
+    overview = client.get("/api/budgets/overview/current", headers=headers).json()
+    assert dashboard["budgets"] == overview
+    assert [budget["amount"] for budget in overview] == [50]
+    assert set(overview[0]["forecast"]) == {"linear", "weekday", "ewma"}
+
+
+def test_dashboard_reports_server_timing(env):
+    response = env["client"].get("/api/dashboard?year=2024&month=3", headers=env["headers"])
+    entries = [entry.strip() for entry in response.headers["Server-Timing"].split(",")]
+    names = [entry.split(";")[0] for entry in entries]
+    assert names == SECTIONS + ["total"]
+    assert all(";dur=" in entry for entry in entries)
+
+
+def test_dashboard_authenticates_once_and_reads_concurrently(env):
+    user_lookups = []
+    threads = set()
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if "from users" in statement.lower():
+            user_lookups.append(statement)
+        else:
+            threads.add(threading.current_thread().name)
+
+    event.listen(Engine, "before_cursor_execute", record)
+    try:
+        response = env["client"].get("/api/dashboard?year=2024&month=3", headers=env["headers"])
+    finally:
+        event.remove(Engine, "before_cursor_execute", record)
+
+    assert response.status_code == 200
+    assert len(user_lookups) == 1
+    assert threads and all(name.startswith("dashboard") for name in threads)
+
+
+def test_dashboard_supports_conditional_requests(env):
+    client, headers = env["client"], env["headers"]
+    first = client.get("/api/dashboard?year=2024&month=3", headers=headers)
+    cached = client.get(
+        "/api/dashboard?year=2024&month=3",
+        headers={**headers, "If-None-Match": first.headers["ETag"]},
+    )
+    assert cached.status_code == 304
+
+
+def test_dashboard_rejects_invalid_month(env):
+    response = env["client"].get("/api/dashboard?year=2024&month=13", headers=env["headers"])
+    assert response.status_code == 400
@@ -0,0 +1,136 @@
+import pytest
+from datetime import datetime
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+# Import the test configuration
+from test_config import get_auth_headers, setup_test_environment
+
+# Set up the test environment
+with setup_test_environment():
+    # Import the app with test settings
+    from app.main import app
+
+from app.core.etag import etag_matches
+from app.models.category import Category
+from app.models.expense import Expense
+from app.models.user import User
+
+
+@pytest.fixture(scope="function")
+def env(session_factory, override_db):
+    db = session_factory()
+    user = User(email="etag@example.com", hashed_password="x", is_active=True)
+    db.add(user)
+    db.commit()
+    category = Category(name="Food", user_id=user.id)
+    db.add(category)
+    db.commit()
+    db.add(Expense(amount=10, description="Lunch", date=datetime(2024, 1, 1),
+                   user_id=user.id, category_id=category.id))
+    db.commit()
+    user_id = user.id
+    category_id = category.id
+    db.close()
+
+    yield {"client": TestClient(app), "headers": get_auth_headers(user_id), "category_id": category_id}
+
+
+def _revalidate(env, url, etag, **params):
+    return env["client"].get(
+        url, params=params, headers={**env["headers"], "If-None-Match": etag}
+    )
+
+
+def test_etag_matching():
+    assert etag_matches('"a"', '"a"')
+    assert etag_matches('"b", W/"a"', '"a"')
+    assert etag_matches("*", '"a"')
+    assert not etag_matches('"b"', '"a"')
+    assert not etag_matches(None, '"a"')
+
+
+@pytest.mark.parametrize("url, params", [
+    ("/api/expenses/", {}),
+    ("/api/expenses/summary/monthly", {"year": 2024}),
+    ("/api/categories/", {}),
+    ("/api/budgets/stats", {"year": 2024}),
+    ("/api/budgets/overview/current", {}),
+    ("/api/reports/summary/annual", {"year": 2024}),
+])
+def test_unchanged_collection_is_not_modified(env, url, params):
+    response = env["client"].get(url, params=params, headers=env["headers"])
+    assert response.status_code == 200
+    etag = response.headers["ETag"]
+    assert response.headers["Cache-Control"] == "private, no-cache"
+
+    not_modified = _revalidate(env, url, etag, **params)
+    assert not_modified.status_code == 304
+    assert not_modified.content == b""
+    assert not_modified.headers["ETag"] == etag
+
+
+def test_not_modified_skips_the_query(env):
+    etag = env["client"].get("/api/expenses/", headers=env["headers"]).headers["ETag"]
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(Engine, "before_cursor_execute", record)
+    try:
+        assert _revalidate(env, "/api/expenses/", etag).status_code == 304
+    finally:
+        event.remove(Engine, "before_cursor_execute", record)
+
+    # Only the current user lookup
+    assert len(statements) == 1
+    assert "FROM users" in statements[0]
+
+
+def test_etag_depends_on_query(env):
+    client, headers = env["client"], env["headers"]
+    first = client.get("/api/expenses/", params={"limit": 5}, headers=headers).headers["ETag"]
+    second = client.get("/api/expenses/", params={"limit": 6}, headers=headers).headers["ETag"]
+    assert first != second
+    assert _revalidate(env, "/api/expenses/", first, limit=6).status_code == 200
+
+
+def test_writes_invalidate_etags(env):
+    client, headers = env["client"], env["headers"]
+
+    def etag():
+        return client.get("/api/expenses/", headers=headers).headers["ETag"]
+
+    before = etag()
+    created = client.post(
+        "/api/expenses/",
+        json={"amount": 5, "description": "Coffee", "date": "2024-01-02T00:00:00",
+              "category_id": env["category_id"]},
+        headers=headers,
+    ).json()
+    after_create = etag()
+    assert after_create != before
+    assert _revalidate(env, "/api/expenses/", before).status_code == 200
+
+    client.put(f"/api/expenses/{created['id']}", json={"amount": 6}, headers=headers)
+    after_update = etag()
+    assert after_update != after_create
+
+    client.delete(f"/api/expenses/{created['id']}", headers=headers)
+    after_delete = etag()
+    assert after_delete != after_update
+
+    client.post("/api/categories/", json={"name": "Travel"}, headers=headers)
+    after_category = etag()
+    assert after_category != after_delete
+
+    response = client.post(
+        "/api/budgets",
+        json={"amount": 100, "year": 2024, "month": 1, "period": "monthly",
+              "category_id": env["category_id"]},
+        headers=headers,
+    )
+    assert response.status_code == 200, response.text
+    assert etag() != after_category
@@ -0,0 +1,250 @@
+import pytest
+from datetime import datetime
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+# Import the test configuration
+from test_config import get_auth_headers, setup_test_environment
+
+# Set up the test environment
+with setup_test_environment():
+    # Import the app with test settings
+    from app.main import app
+
+from app.core.config import settings
+from app.models.category import Category
+from app.models.expense import Expense
+from app.models.user import User
+
+
+@pytest.fixture(scope="function")
+def env(session_factory, override_db):
+    db = session_factory()
+    user = User(email="bulk@example.com", hashed_password="x", is_active=True)
+    other = User(email="other@example.com", hashed_password="x", is_active=True)
+    db.add_all([user, other])
+    db.commit()
+    category = Category(name="Food", user_id=user.id)
+    foreign = Category(name="Theirs", user_id=other.id)
+    db.add_all([category, foreign])
+    db.commit()
+    ids = {"user_id": user.id, "category_id": category.id, "foreign_category_id": foreign.id}
+    db.close()
+
+    yield {
+        "client": TestClient(app),
+        "headers": get_auth_headers(ids["user_id"]),
+        "session": session_factory,
+        **ids,
+    }
+
+
+def _item(env, amount=10.0, day=1, **overrides):
+    return {
+        "amount": amount,
+        "description": f"Import {amount}",
+        "date": f"2024-03-{day:02d}T00:00:00",
+        "category_id": env["category_id"],
+        **overrides,
+    }
+
+
+def test_bulk_create_reports_item_errors(env):
+    items = [
+        _item(env, 1),
+        _item(env, -5),
+        _item(env, 2, category_id=env["foreign_category_id"]),
+        {"description": "no amount"},
+        _item(env, 3, day=2),
+    ]
+    response = env["client"].post("/api/expenses/bulk", json={"items": items}, headers=env["headers"])
+    assert response.status_code == 200, response.text
+    body = response.json()
+
+    assert [item["amount"] for item in body["created"]] == [1, 3]
+    assert all(item["user_id"] == env["user_id"] and item["id"] for item in body["created"])
+    assert [error["index"] for error in body["errors"]] == [1, 2, 3]
+    assert "amount" in body["errors"][0]["detail"]
+    assert "Category not found" in body["errors"][1]["detail"]
+
+    db = env["session"]()
+    try:
+        stored = db.query(Expense).order_by(Expense.id).all()
+        assert [expense.id for expense in stored] == [item["id"] for item in body["created"]]
+    finally:
+        db.close()
+
+
+def test_bulk_create_uses_one_insert(env):
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("INSERT INTO EXPENSES "):
+            statements.append(statement)
+
+    items = [_item(env, i + 1, day=i % 28 + 1) for i in range(40)]
+    items[3]["notes"] = "from the bank export"
+    event.listen(Engine, "before_cursor_execute", record)
+    try:
+        response = env["client"].post(
+            "/api/expenses/bulk", json={"items": items}, headers=env["headers"]
+        )
+    finally:
+        event.remove(Engine, "before_cursor_execute", record)
+
+    assert response.status_code == 200
+    created = response.json()["created"]
+    assert [item["amount"] for item in created] == list(range(1, 41))
+    assert created[3]["notes"] == "from the bank export"
+    assert len(statements) == 1
+
+
+def test_bulk_create_all_invalid(env):
+    response = env["client"].post(
+        "/api/expenses/bulk",
+        json={"items": [_item(env, category_id=env["foreign_category_id"])]},
+        headers=env["headers"],
+    )
+    assert response.status_code == 200
+    assert response.json() == {
+        "created": [],
+        "errors": [{"index": 0, "detail": "Category not found or doesn't belong to the user"}],
+    }
+
+
+def test_bulk_create_limit(env):
+    items = [_item(env)] * (settings.EXPENSE_BULK_MAX_ITEMS + 1)
+    response = env["client"].post("/api/expenses/bulk", json={"items": items}, headers=env["headers"])
+    assert response.status_code == 400
+
+
+def _seed(env, count=10):
+    items = [_item(env, i + 1, day=i + 1) for i in range(count)]
+    response = env["client"].post("/api/expenses/bulk", json={"items": items}, headers=env["headers"])
+    return [item["id"] for item in response.json()["created"]]
+
+
+def _foreign_expense(env):
+    db = env["session"]()
+    try:
+        category = db.get(Category, env["foreign_category_id"])
+        expense = Expense(amount=1, description="Import 1", date=datetime(2024, 3, 1),
+                          user_id=category.user_id, category_id=category.id)
+        db.add(expense)
+        db.commit()
+        return expense.id
+    finally:
+        db.close()
+
+
+def test_bulk_update_by_ids_is_scoped_to_user(env):
+    ids = _seed(env)
+    foreign_id = _foreign_expense(env)
+    travel = env["client"].post(
+        "/api/categories/", json={"name": "Travel"}, headers=env["headers"]
+    ).json()
+
+    response = env["client"].patch(
+        "/api/expenses/bulk",
+        json={"ids": ids[:3] + [foreign_id], "changes": {"category_id": travel["id"]}},
+        headers=env["headers"],
+    )
+    assert response.status_code == 200, response.text
+    assert response.json() == {"affected": 3}
+
+    db = env["session"]()
+    try:
+        moved = db.query(Expense.id).filter(Expense.category_id == travel["id"]).all()
+        assert sorted(row.id for row in moved) == sorted(ids[:3])
+        assert db.get(Expense, foreign_id).category_id == env["foreign_category_id"]
+    finally:
+        db.close()
+
+
+def test_bulk_update_by_filters_is_one_statement(env):
+    _seed(env)
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("UPDATE EXPENSES"):
+            statements.append(statement)
+
+    event.listen(Engine, "before_cursor_execute", record)
+    try:
+        response = env["client"].patch(
+            "/api/expenses/bulk",
+            json={"min_amount": 6, "changes": {"notes": "reviewed"}},
+            headers=env["headers"],
+        )
+    finally:
+        event.remove(Engine, "before_cursor_execute", record)
+
+    assert response.json() == {"affected": 5}
+    assert len(statements) == 1
+    listed = env["client"].get("/api/expenses/", headers=env["headers"]).json()
+    assert sorted(item["amount"] for item in listed if item["notes"] == "reviewed") == [6, 7, 8, 9, 10]
+
+
+def test_bulk_update_rejects_foreign_category_and_empty_changes(env):
+    ids = _seed(env, 2)
+    client, headers = env["client"], env["headers"]
+    response = client.patch(
+        "/api/expenses/bulk",
+        json={"ids": ids, "changes": {"category_id": env["foreign_category_id"]}},
+        headers=headers,
+    )
+    assert response.status_code == 404
+    response = client.patch("/api/expenses/bulk", json={"ids": ids, "changes": {}}, headers=headers)
+    assert response.status_code == 400
+
+
+@pytest.mark.parametrize("changes", [
+    {"amount": None},
+    {"date": None},
+    {"category_id": None},
+    {"description": None},
+    {"amount": 0},
+    {"amount": -5},
+])
+def test_bulk_update_rejects_null_required_fields_and_non_positive_amounts(env, changes):
+    ids = _seed(env, 2)
+    response = env["client"].patch(
+        "/api/expenses/bulk", json={"ids": ids, "changes": changes}, headers=env["headers"]
+    )
+    assert response.status_code == 422
+    listed = env["client"].get("/api/expenses/", headers=env["headers"]).json()
+    assert all(item["amount"] > 0 and item["date"] for item in listed)
+
+
+def test_bulk_delete_by_date_range_and_search(env):
+    ids = _seed(env)
+    client, headers = env["client"], env["headers"]
+    foreign_id = _foreign_expense(env)
+
+    response = client.request(
+        "DELETE",
+        "/api/expenses/bulk",
+        json={"start_date": "2024-03-01T00:00:00", "end_date": "2024-03-03T00:00:00"},
+        headers=headers,
+    )
+    assert response.json() == {"affected": 3}
+
+    response = client.request(
+        "DELETE", "/api/expenses/bulk", json={"search": "Import 1"}, headers=headers
+    )
+    # "Import 10" is left; "Import 1" itself was in the date range
+    assert response.json() == {"affected": 1}
+
+    remaining = [item["id"] for item in client.get("/api/expenses/", headers=headers).json()]
+    assert sorted(remaining) == sorted(ids[3:9])
+    db = env["session"]()
+    try:
+        assert db.get(Expense, foreign_id) is not None
+    finally:
+        db.close()
+
+
+def test_bulk_delete_requires_a_selection(env):
+    response = env["client"].request("DELETE", "/api/expenses/bulk", json={}, headers=env["headers"])
+    assert response.status_code == 422
@@ -0,0 +1,124 @@
+import pytest
+from datetime import datetime
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+# Import the test configuration
+from test_config import get_auth_headers, setup_test_environment
+
+# Set up the test environment
+with setup_test_environment():
+    # Import the app with test settings
+    from app.main import app
+
+from app.models.category import Category
+from app.models.expense import Expense
+from app.models.user import User
+from app.services.analytics import parse_period
+
+
+@pytest.fixture(scope="function")
+def env(session_factory, override_db):
+    db = session_factory()
+    user = User(email="compare@example.com", hashed_password="x", is_active=True)
+    db.add(user)
+    db.commit()
+    food = Category(name="Food", color="#111111", user_id=user.id)
+    travel = Category(name="Travel", color="#222222", user_id=user.id)
+    db.add_all([food, travel])
+    db.commit()
+    db.add_all([
+        Expense(amount=150, date=datetime(2024, 5, 3), user_id=user.id, category_id=food.id),
+        Expense(amount=50, date=datetime(2024, 5, 31, 23, 59), user_id=user.id, category_id=travel.id),
+        Expense(amount=100, date=datetime(2024, 4, 10), user_id=user.id, category_id=food.id),
+        Expense(amount=200, date=datetime(2023, 5, 20), user_id=user.id, category_id=food.id),
+        # Inside the queried span but outside every period
+        Expense(amount=999, date=datetime(2023, 9, 1), user_id=user.id, category_id=travel.id),
+    ])
+    db.commit()
+    ids = {"user_id": user.id, "food": food.id}
+    db.close()
+
+    yield {"client": TestClient(app), "headers": get_auth_headers(ids["user_id"]), **ids}
+
+
+def compare(env, periods):
+    response = env["client"].get(
+        "/api/expenses/summary/compare", params={"periods": periods}, headers=env["headers"]
+    )
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def test_month_over_month_and_year_over_year(env):
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if "expense_rollups" in statement:
+            statements.append(statement)
+
+    event.listen(Engine, "before_cursor_execute", record)
+    try:
+        result = compare(env, "2024-05,2024-04,2023-05")
+    finally:
+        event.remove(Engine, "before_cursor_execute", record)
+
+    assert len(statements) == 1
+    assert result["base"] == "2024-05"
+    assert [p["period"] for p in result["periods"]] == ["2024-05", "2024-04", "2023-05"]
+    assert [p["total_amount"] for p in result["periods"]] == [200, 100, 200]
+    assert result["periods"][0]["start"] == "2024-05-01"
+    assert result["periods"][0]["end"] == "2024-05-31"
+
+    food, travel = result["categories"]
+    assert food["name"] == "Food" and food["color"] == "#111111"
+    assert food["amounts"] == [150, 100, 200]
+    assert food["deltas"] == [0, 50, -50]
+    assert food["percent_changes"] == [0, 50, -25]
+    # No spending to compare with
+    assert travel["amounts"] == [50, 0, 0]
+    assert travel["percent_changes"] == [0, None, None]
+
+    assert result["totals"]["amounts"] == [200, 100, 200]
+    assert result["totals"]["deltas"] == [0, 100, 0]
+    assert result["totals"]["percent_changes"] == [0, 100, 0]
+
+
+def test_years_quarters_and_overlapping_periods(env):
+    result = compare(env, "2024,2024-Q2,2023")
+    assert [p["period"] for p in result["periods"]] == ["2024", "2024-Q2", "2023"]
+    assert [p["total_amount"] for p in result["periods"]] == [300, 300, 1199]
+    assert result["periods"][1]["end"] == "2024-06-30"
+
+
+def test_categories_without_spending_in_any_period_are_omitted(env):
+    result = compare(env, "2024-05,2024-04")
+    assert [c["name"] for c in result["categories"]] == ["Food", "Travel"]
+    result = compare(env, "2024-04,2023-05")
+    assert [c["name"] for c in result["categories"]] == ["Food"]
+
+
+def test_comparison_reflects_new_expenses(env):
+    assert compare(env, "2024-04")["totals"]["amounts"] == [100]
+    response = env["client"].post(
+        "/api/expenses/",
+        json={"amount": 25, "description": "Lunch", "date": "2024-04-11T12:00:00", "category_id": env["food"]},
+        headers=env["headers"],
+    )
+    assert response.status_code == 200, response.text
+    assert compare(env, "2024-04")["totals"]["amounts"] == [125]
+
+
+def test_parse_period():
+    assert parse_period("2024-05") == ("2024-05", 2024 * 12 + 4, 2024 * 12 + 4)
+    assert parse_period(" 2024-q4 ").label == "2024-Q4"
+    assert parse_period("2024").end.isoformat() == "2024-12-31"
+
+
+@pytest.mark.parametrize("periods", ["", "2024-13", "2024-Q5", "24-05", "2024-05-01", "may"])
+def test_invalid_periods(env, periods):
+    response = env["client"].get(
+        "/api/expenses/summary/compare", params={"periods": periods}, headers=env["headers"]
+    )
+    assert response.status_code == 400
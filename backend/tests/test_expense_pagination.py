@@ -0,0 +1,201 @@
+import pytest
+from datetime import datetime, timedelta
+from typing import List
+from fastapi.testclient import TestClient
+from pydantic import TypeAdapter
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+# Import the test configuration
+from test_config import get_auth_headers, setup_test_environment
+
+# Set up the test environment
+with setup_test_environment():
+    # Import the app with test settings
+    from app.main import app
+
+from app.core.security import get_password_hash
+from app.models.category import Category
+from app.models.expense import Expense
+from app.models.user import User
+from app.schemas.expense import Expense as ExpenseSchema, ExpenseWithCategory
+from app.utils.pagination import decode_cursor, encode_cursor
+
+
+@pytest.fixture(scope="function")
+def client(session_factory, override_db):
+    db = session_factory()
+    user = User(
+        email="pager@example.com",
+        hashed_password=get_password_hash("password123"),
+        is_active=True,
+        is_admin=True,
+    )
+    db.add(user)
+    db.commit()
+    category = Category(name="Food", user_id=user.id)
+    db.add(category)
+    db.commit()
+
+    # Several expenses share a date so the id tie-breaker is exercised
+    start = datetime(2024, 1, 1)
+    db.add_all([
+        Expense(
+            amount=float(i + 1),
+            description=f"Expense {i}",
+            date=start + timedelta(days=i // 3),
+            user_id=user.id,
+            category_id=category.id,
+        )
+        for i in range(25)
+    ])
+    db.commit()
+    user_id = user.id
+    db.close()
+
+    return TestClient(app), get_auth_headers(user_id)
+
+
+def _walk(test_client, headers, url, limit):
+    ids = []
+    cursor = None
+    while True:
+        params = {"limit": limit}
+        if cursor:
+            params["cursor"] = cursor
+        response = test_client.get(url, params=params, headers=headers)
+        assert response.status_code == 200
+        ids.extend(item["id"] for item in response.json())
+        cursor = response.headers.get("X-Next-Cursor")
+        if not cursor:
+            return ids
+
+
+def test_cursor_round_trip():
+    cursor = encode_cursor(datetime(2024, 5, 17, 13, 45), 42)
+    assert decode_cursor(cursor) == (datetime(2024, 5, 17, 13, 45), 42)
+
+
+def test_cursor_pages_match_offset_order(client):
+    test_client, headers = client
+    full = test_client.get("/api/expenses/", params={"limit": 100}, headers=headers).json()
+    expected = [item["id"] for item in full]
+
+    assert _walk(test_client, headers, "/api/expenses/", limit=4) == expected
+    assert len(expected) == 25
+
+
+def test_admin_listing_supports_cursor(client):
+    test_client, headers = client
+    assert len(_walk(test_client, headers, "/api/expenses/admin/all", limit=10)) == 25
+
+
+def test_skip_still_works(client):
+    test_client, headers = client
+    first = test_client.get("/api/expenses/", params={"limit": 5}, headers=headers).json()
+    second = test_client.get(
+        "/api/expenses/", params={"limit": 5, "skip": 5}, headers=headers
+    ).json()
+    assert not {item["id"] for item in first} & {item["id"] for item in second}
+
+
+def test_invalid_cursor_is_rejected(client):
+    test_client, headers = client
+    response = test_client.get("/api/expenses/", params={"cursor": "garbage"}, headers=headers)
+    assert response.status_code == 400
+
+
+def test_listing_rows_match_response_model(client):
+    test_client, headers = client
+    body = test_client.get("/api/expenses/", params={"limit": 3}, headers=headers).json()
+    validated = TypeAdapter(List[ExpenseWithCategory]).validate_python(body)
+    assert [item.model_dump(mode="json") for item in validated] == [
+        {key: item[key] for key in ExpenseWithCategory.model_fields} for item in body
+    ]
+    assert body[0]["category"]["name"] == "Food"
+
+
+def test_normalized_shape_side_loads_categories(client):
+    test_client, headers = client
+    embedded = test_client.get("/api/expenses/", params={"limit": 10}, headers=headers).json()
+    body = test_client.get(
+        "/api/expenses/",
+        params={"limit": 10, "shape": "normalized", "include": "categories"},
+        headers=headers,
+    ).json()
+
+    assert set(body) == {"expenses", "categories"}
+    assert [item["id"] for item in body["expenses"]] == [item["id"] for item in embedded]
+    assert all("category" not in item for item in body["expenses"])
+    # Every expense shares one category, which is sent once
+    category = embedded[0]["category"]
+    assert body["categories"] == {str(category["id"]): category}
+    TypeAdapter(List[ExpenseSchema]).validate_python(body["expenses"])
+
+
+def test_normalized_shape_without_categories(client):
+    test_client, headers = client
+    response = test_client.get(
+        "/api/expenses/admin/all", params={"limit": 10, "shape": "normalized"}, headers=headers
+    )
+    assert response.status_code == 200
+    assert set(response.json()) == {"expenses"}
+    assert response.headers.get("X-Next-Cursor")
+
+
+def test_unknown_shape_or_include_is_rejected(client):
+    test_client, headers = client
+    for params in ({"shape": "flat"}, {"include": "categories,owner"}):
+        response = test_client.get("/api/expenses/", params=params, headers=headers)
+        assert response.status_code == 400
+
+
+def test_totals_cover_the_whole_filter_set(client):
+    test_client, headers = client
+    response = test_client.get(
+        "/api/expenses/", params={"limit": 4, "include": "totals"}, headers=headers
+    )
+    assert response.status_code == 200
+    body = response.json()
+    full = test_client.get("/api/expenses/", params={"limit": 100}, headers=headers).json()
+
+    assert [item["id"] for item in body["expenses"]] == [item["id"] for item in full[:4]]
+    assert body["expenses"][0]["category"]["name"] == "Food"
+    assert body["total_count"] == 25
+    assert body["total_amount"] == sum(range(1, 26))
+    assert body["facets"] == [
+        {"category_id": full[0]["category_id"], "count": 25, "amount": sum(range(1, 26))}
+    ]
+
+    # The cursor moves the page but not the totals
+    following = test_client.get(
+        "/api/expenses/",
+        params={"limit": 4, "include": "totals", "cursor": response.headers["X-Next-Cursor"]},
+        headers=headers,
+    ).json()
+    assert [item["id"] for item in following["expenses"]] == [item["id"] for item in full[4:8]]
+    assert following["total_count"] == 25
+
+
+def test_totals_follow_filters_in_one_query(client):
+    test_client, headers = client
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            statements.append(statement)
+
+    event.listen(Engine, "before_cursor_execute", record)
+    try:
+        body = test_client.get(
+            "/api/expenses/",
+            params={"min_amount": 20, "shape": "normalized", "include": "totals"},
+            headers=headers,
+        ).json()
+    finally:
+        event.remove(Engine, "before_cursor_execute", record)
+
+    assert body["total_count"] == len(body["expenses"]) == 6
+    assert body["total_amount"] == sum(range(20, 26))
+    # One for the current user, one for the page with its totals
+    assert len(statements) == 2
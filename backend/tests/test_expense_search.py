@@ -0,0 +1,145 @@
+import pytest
+from datetime import datetime
+from fastapi.testclient import TestClient
+
+# Import the test configuration
+from test_config import get_auth_headers, setup_test_environment
+
+# Set up the test environment
+with setup_test_environment():
+    # Import the app with test settings
+    from app.main import app
+
+from app.models.category import Category
+from app.models.expense import Expense
+from app.models.user import User
+from app.services.search import (
+    FTS5,
+    build_match_query,
+    drop_search_index,
+    ensure_search_index,
+    get_search_backend,
+    tokenize,
+)
+
+
+@pytest.fixture(scope="function")
+def env(engine, session_factory, override_db):
+    db = session_factory()
+    user = User(email="search@example.com", hashed_password="x", is_active=True)
+    db.add(user)
+    db.commit()
+    category = Category(name="Food", description="groceries", user_id=user.id)
+    db.add(category)
+    db.commit()
+    db.add_all([
+        Expense(amount=10, description="Groceries at the market", date=datetime(2024, 1, 1),
+                user_id=user.id, category_id=category.id),
+        Expense(amount=20, description="Dinner", notes="birthday dinner with grandparents",
+                date=datetime(2024, 1, 2), user_id=user.id, category_id=category.id),
+        Expense(amount=30, description="Fuel", date=datetime(2024, 1, 3),
+                user_id=user.id, category_id=category.id),
+    ])
+    db.commit()
+    user_id = user.id
+    category_id = category.id
+    db.close()
+
+    # Built after the rows exist, so the initial rebuild is exercised too
+    assert ensure_search_index(engine)
+
+    yield {
+        "client": TestClient(app),
+        "headers": get_auth_headers(user_id),
+        "engine": engine,
+        "session": session_factory,
+        "category_id": category_id,
+    }
+
+
+def _search(env, term, **params):
+    response = env["client"].get(
+        "/api/expenses/", params={"search": term, **params}, headers=env["headers"]
+    )
+    assert response.status_code == 200, response.text
+    return [item["description"] for item in response.json()]
+
+
+def test_match_query_building():
+    assert tokenize("Gro-cer  MARKET") == ["gro", "cer", "market"]
+    assert build_match_query(["gro", "mar"], FTS5) == '"gro"* "mar"*'
+    assert build_match_query(["gro", "mar"], "tsvector") == "gro:* & mar:*"
+
+
+def test_fts_backend_detected(env):
+    db = env["session"]()
+    try:
+        assert get_search_backend(db) == FTS5
+    finally:
+        db.close()
+
+
+def test_prefix_match_on_description(env):
+    assert _search(env, "groc") == ["Groceries at the market"]
+
+
+def test_notes_are_searched(env):
+    assert _search(env, "grandpar") == ["Dinner"]
+
+
+def test_index_follows_create_update_delete(env):
+    client, headers = env["client"], env["headers"]
+    created = client.post(
+        "/api/expenses/",
+        json={"amount": 5, "description": "Cinema tickets", "date": "2024-02-01T00:00:00",
+              "category_id": env["category_id"]},
+        headers=headers,
+    ).json()
+    assert _search(env, "cinem") == ["Cinema tickets"]
+
+    client.put(f"/api/expenses/{created['id']}", json={"description": "Theatre"}, headers=headers)
+    assert _search(env, "cinem") == []
+    assert _search(env, "theat") == ["Theatre"]
+
+    client.delete(f"/api/expenses/{created['id']}", headers=headers)
+    assert _search(env, "theat") == []
+
+
+def test_relevance_ordering(env):
+    # "dinner" appears twice in the second row and not at all elsewhere
+    client, headers = env["client"], env["headers"]
+    client.post(
+        "/api/expenses/",
+        json={"amount": 5, "description": "Snacks", "notes": "before dinner",
+              "date": "2024-03-01T00:00:00", "category_id": env["category_id"]},
+        headers=headers,
+    )
+    assert _search(env, "dinner", sort="relevance") == ["Dinner", "Snacks"]
+    assert _search(env, "dinner") == ["Snacks", "Dinner"]
+
+
+def test_relevance_requires_search(env):
+    response = env["client"].get(
+        "/api/expenses/", params={"sort": "relevance"}, headers=env["headers"]
+    )
+    assert response.status_code == 400
+
+
+def test_falls_back_to_ilike_without_index(env):
+    with env["engine"].begin() as conn:
+        drop_search_index(conn)
+    assert _search(env, "arket") == ["Groceries at the market"]
+    assert _search(env, "grandparents") == ["Dinner"]
+
+
+def test_totals_with_search(env):
+    response = env["client"].get(
+        "/api/expenses/",
+        params={"search": "dinner", "sort": "relevance", "include": "totals"},
+        headers=env["headers"],
+    )
+    assert response.status_code == 200
+    body = response.json()
+    assert [item["description"] for item in body["expenses"]] == ["Dinner"]
+    assert body["total_count"] == 1
+    assert body["total_amount"] == 20
@@ -0,0 +1,114 @@
+import pytest
+from datetime import datetime, timedelta
+from fastapi.testclient import TestClient
+
+# Import the test configuration
+from test_config import get_auth_headers, setup_test_environment
+
+# Set up the test environment
+with setup_test_environment():
+    # Import the app with test settings
+    from app.main import app
+
+from app.models.category import Category
+from app.models.expense import Expense
+from app.models.user import User
+
+
+@pytest.fixture(scope="function")
+def env(session_factory, override_db):
+    db = session_factory()
+    user = User(email="timeseries@example.com", hashed_password="x", is_active=True)
+    db.add(user)
+    db.commit()
+    food = Category(name="Food", user_id=user.id)
+    travel = Category(name="Travel", user_id=user.id)
+    db.add_all([food, travel])
+    db.commit()
+    db.add_all([
+        # Mon 2024-01-01 twice (one late in the day), Wed 2024-01-03, Mon 2024-01-08
+        Expense(amount=10, date=datetime(2024, 1, 1, 9), user_id=user.id, category_id=food.id),
+        Expense(amount=5, date=datetime(2024, 1, 1, 23, 59), user_id=user.id, category_id=travel.id),
+        Expense(amount=20, date=datetime(2024, 1, 3), user_id=user.id, category_id=food.id),
+        Expense(amount=40, date=datetime(2024, 1, 8), user_id=user.id, category_id=food.id),
+        Expense(amount=100, date=datetime(2024, 3, 15), user_id=user.id, category_id=travel.id),
+        # Outside the ranges used below
+        Expense(amount=999, date=datetime(2023, 12, 31, 23, 59), user_id=user.id, category_id=food.id),
+    ])
+    db.commit()
+    ids = {"user_id": user.id, "food": food.id, "session": session_factory}
+    db.close()
+
+    yield {"client": TestClient(app), "headers": get_auth_headers(ids["user_id"]), **ids}
+
+
+def get(env, **params):
+    response = env["client"].get("/api/expenses/timeseries", params=params, headers=env["headers"])
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def test_daily_buckets_are_zero_filled(env):
+    series = get(env, granularity="day", start="2024-01-01", end="2024-01-05")
+    assert series["buckets"] == ["2024-01-01", "2024-01-02", "2024-01-03", "2024-01-04", "2024-01-05"]
+    assert series["amounts"] == [15, 0, 20, 0, 0]
+    assert series["counts"] == [2, 0, 1, 0, 0]
+    assert "cumulative" not in series and "moving_average" not in series
+
+
+def test_weekly_buckets_start_on_monday(env):
+    series = get(env, granularity="week", start="2024-01-01", end="2024-01-21")
+    assert series["buckets"] == ["2024-01-01", "2024-01-08", "2024-01-15"]
+    assert series["amounts"] == [35, 40, 0]
+
+
+def test_monthly_buckets_with_cumulative_and_moving_average(env):
+    series = get(env, granularity="month", start="2024-01-01", end="2024-04-30",
+                 cumulative=True, moving_average=2)
+    assert series["buckets"] == ["2024-01-01", "2024-02-01", "2024-03-01", "2024-04-01"]
+    assert series["amounts"] == [75, 0, 100, 0]
+    assert series["cumulative"] == [75, 75, 175, 175]
+    assert series["moving_average"] == [75, 37.5, 50, 50]
+
+
+def test_monthly_rollup_path_matches_daily_aggregation(env):
+    # Whole months are read from the rollups, partial ones from expenses
+    whole = get(env, granularity="month", start="2024-01-01", end="2024-03-31", category_id=env["food"])
+    partial = get(env, granularity="month", start="2024-01-01", end="2024-03-30", category_id=env["food"])
+    assert whole["buckets"] == partial["buckets"]
+    assert whole["amounts"] == partial["amounts"] == [70, 0, 0]
+    assert whole["counts"] == partial["counts"] == [3, 0, 0]
+
+
+def test_category_filter_and_empty_range(env):
+    series = get(env, granularity="day", start="2024-01-01", end="2024-01-03", category_id=env["food"])
+    assert series["amounts"] == [10, 0, 20]
+
+    empty = get(env, granularity="month", start="2022-01-01", end="2022-03-31")
+    assert empty["amounts"] == [0, 0, 0]
+    assert empty["counts"] == [0, 0, 0]
+
+
+def test_multi_year_daily_range(env):
+    db = env["session"]()
+    start = datetime(2019, 1, 1)
+    db.add_all([
+        Expense(amount=1, date=start + timedelta(days=day), user_id=env["user_id"], category_id=env["food"])
+        for day in range(0, 5 * 365, 3)
+    ])
+    db.commit()
+    db.close()
+
+    series = get(env, granularity="day", start="2019-01-01", end="2023-12-31", cumulative=True)
+    assert len(series["buckets"]) == 1826
+    assert series["cumulative"][-1] == len(range(0, 5 * 365, 3)) + 999
+
+
+@pytest.mark.parametrize("params", [
+    {"granularity": "hour"},
+    {"start": "2024-02-01", "end": "2024-01-01"},
+    {"start": "1900-01-01", "end": "2024-01-01"},
+])
+def test_invalid_parameters(env, params):
+    response = env["client"].get("/api/expenses/timeseries", params=params, headers=env["headers"])
+    assert response.status_code == 400
@@ -0,0 +1,92 @@
+from datetime import datetime
+
+import pytest
+from fastapi.testclient import TestClient
+
+# Import the test configuration
+from test_config import get_auth_headers, setup_test_environment
+
+# Set up the test environment
+with setup_test_environment():
+    # Import the app with test settings
+    from app.main import app
+
+from app.models.category import Category
+from app.models.expense import Expense
+from app.models.user import User
+
+
+@pytest.fixture(scope="function")
+def env(session_factory, override_db):
+    db = session_factory()
+    user = User(email="filters@example.com", hashed_password="x", is_active=True)
+    db.add(user)
+    db.commit()
+    category = Category(name="Food", user_id=user.id)
+    db.add(category)
+    db.commit()
+    db.add_all([
+        Expense(amount=5, description="Lunch", date=datetime(2024, 3, 1),
+                user_id=user.id, category_id=category.id),
+        Expense(amount=10, description="Dinner", date=datetime(2024, 3, 2),
+                user_id=user.id, category_id=category.id),
+    ])
+    db.commit()
+    user_id = user.id
+    db.close()
+
+    yield {"client": TestClient(app), "headers": get_auth_headers(user_id), "session": session_factory}
+
+
+def _amounts(env):
+    db = env["session"]()
+    try:
+        return sorted(amount for (amount,) in db.query(Expense.amount))
+    finally:
+        db.close()
+
+
+@pytest.mark.parametrize("selection", [
+    {"max_amount": 0},
+    {"category_id": 0},
+    {"ids": []},
+])
+def test_falsy_filters_narrow_bulk_deletes(env, selection):
+    response = env["client"].request("DELETE", "/api/expenses/bulk", json=selection, headers=env["headers"])
+    assert response.status_code == 200, response.text
+    assert response.json() == {"affected": 0}
+    assert _amounts(env) == [5, 10]
+
+
+@pytest.mark.parametrize("selection", [
+    {"max_amount": 0},
+    {"category_id": 0},
+])
+def test_falsy_filters_narrow_bulk_updates(env, selection):
+    response = env["client"].patch(
+        "/api/expenses/bulk", json={**selection, "changes": {"amount": 1}}, headers=env["headers"]
+    )
+    assert response.status_code == 200, response.text
+    assert response.json() == {"affected": 0}
+    assert _amounts(env) == [5, 10]
+
+
+@pytest.mark.parametrize("selection", [
+    {"min_amount": 0},
+    {"search": ""},
+    {"search": "   "},
+])
+def test_filters_selecting_everything_are_rejected(env, selection):
+    client, headers = env["client"], env["headers"]
+    response = client.request("DELETE", "/api/expenses/bulk", json=selection, headers=headers)
+    assert response.status_code == 422
+    response = client.patch("/api/expenses/bulk", json={**selection, "changes": {"amount": 1}}, headers=headers)
+    assert response.status_code == 422
+    assert _amounts(env) == [5, 10]
+
+
+def test_zero_max_amount_narrows_the_listing(env):
+    client, headers = env["client"], env["headers"]
+    assert client.get("/api/expenses/?max_amount=0", headers=headers).json() == []
+    assert client.get("/api/expenses/?category_id=0", headers=headers).json() == []
+    assert len(client.get("/api/expenses/?max_amount=5", headers=headers).json()) == 1
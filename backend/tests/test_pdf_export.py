@@ -0,0 +1,106 @@
+import glob
+import io
+import os
+import tempfile
+
+import pytest
+from datetime import datetime, timedelta
+from fastapi.testclient import TestClient
+
+# Import the test configuration
+from test_config import get_auth_headers, setup_test_environment
+
+# Set up the test environment
+with setup_test_environment():
+    # Import the app with test settings
+    from app.main import app
+
+from app.models.category import Category
+from app.models.expense import Expense
+from app.models.user import User
+from app.services import export
+from app.services.rollup import CategoryTotal
+
+
+def make_rows(count, start=datetime(2024, 12, 31)):
+    """Expense rows in CSV_COLUMNS order, newest first, one per day."""
+    return [
+        (start - timedelta(days=day), "Food", f"Expense {day}", 1.5, "USD", None)
+        for day in range(count)
+    ]
+
+
+def test_details_are_split_into_chunks_with_repeated_headers(monkeypatch):
+    monkeypatch.setattr(export, "PDF_TABLE_CHUNK_ROWS", 10)
+    details = export.collect_detail_rows(make_rows(25))
+    assert details.omitted == {}
+    tables = export._detail_tables(details.listed)
+    assert [len(table._cellvalues) for table in tables] == [11, 11, 6]
+    assert all(table._cellvalues[0] == ["Date", "Category", "Description", "Amount"] for table in tables)
+    assert all(table.repeatRows == 1 for table in tables)
+
+
+def test_rows_past_the_cap_are_summarized_per_month():
+    # 2024-12-31 back to 2024-10-23
+    details = export.collect_detail_rows(iter(make_rows(70)), max_rows=40)
+    assert len(details.listed) == 40
+    assert details.listed[0] == make_rows(1)[0][:5]
+    # The 30 oldest: 2024-11-21 back to 2024-10-23
+    assert details.omitted == {(2024, 11): [21, 31.5], (2024, 10): [9, 13.5]}
+
+
+def test_long_descriptions_are_truncated():
+    row = (datetime(2024, 1, 1), None, "x" * 100, 2, "EUR")
+    cells = export._detail_cells(*row)
+    assert cells == ["2024-01-01", "N/A", "x" * 33 + "...", "2.00 EUR"]
+
+
+def test_styles_are_built_once():
+    assert export.pdf_styles() is export.pdf_styles()
+
+
+def test_write_pdf_with_appendix():
+    owner = export.ReportOwner("pdf@example.com", None, None, "USD")
+    output = io.BytesIO()
+    details = export.collect_detail_rows(make_rows(1200), max_rows=1000)
+    export.write_pdf(output, details, [CategoryTotal("Food", None, 1800.0)], 2024, None, owner)
+    assert output.getvalue().startswith(b"%PDF")
+
+
+@pytest.fixture(scope="function")
+def env(session_factory, override_db):
+    db = session_factory()
+    user = User(email="pdf@example.com", hashed_password="x", is_active=True, preferred_currency="USD")
+    db.add(user)
+    db.commit()
+    food = Category(name="Food", user_id=user.id)
+    db.add(food)
+    db.commit()
+    # More expenses than the test PDF_MAX_DETAIL_ROWS
+    db.add_all([
+        Expense(amount=2, description=f"Day {day}", date=datetime(2024, 1, 1) + timedelta(days=day),
+                user_id=user.id, category_id=food.id)
+        for day in range(45)
+    ])
+    db.commit()
+    ids = {"user_id": user.id}
+    db.close()
+
+    yield {"client": TestClient(app), "headers": get_auth_headers(ids["user_id"]), **ids}
+
+
+def test_pdf_report_download(env):
+    pattern = os.path.join(tempfile.gettempdir(), "expense_report_*.pdf")
+    leftovers = set(glob.glob(pattern))
+    response = env["client"].get("/api/reports/pdf?year=2024", headers=env["headers"])
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/pdf"
+    assert "expense_report_2024.pdf" in response.headers["content-disposition"]
+    assert response.content.startswith(b"%PDF")
+    # The rendered file is removed once sent
+    assert set(glob.glob(pattern)) == leftovers
+
+
+def test_pdf_report_rejects_invalid_month(env):
+    response = env["client"].get("/api/reports/pdf?year=2024&month=13", headers=env["headers"])
+    assert response.status_code == 400
@@ -0,0 +1,62 @@
+import pytest
+from datetime import date, datetime
+
+from sqlalchemy import Column, DateTime, MetaData, Table, select
+from sqlalchemy.dialects import sqlite
+
+from app.utils.period import get_period_range, period_filter
+
+
+def test_month_range_is_half_open():
+    assert get_period_range(2024, month=2) == (datetime(2024, 2, 1), datetime(2024, 3, 1))
+
+
+def test_december_rolls_into_next_year():
+    assert get_period_range(2023, month=12) == (datetime(2023, 12, 1), datetime(2024, 1, 1))
+
+
+def test_quarter_range():
+    assert get_period_range(2024, quarter=3) == (datetime(2024, 7, 1), datetime(2024, 10, 1))
+
+
+def test_year_range():
+    assert get_period_range(2024) == (datetime(2024, 1, 1), datetime(2025, 1, 1))
+
+
+def test_custom_range_includes_end_day():
+    start, end = get_period_range(start_date=date(2024, 1, 10), end_date=date(2024, 1, 20))
+    assert (start, end) == (datetime(2024, 1, 10), datetime(2024, 1, 21))
+
+
+def test_custom_range_keeps_explicit_end_time():
+    start, end = get_period_range(
+        start_date=datetime(2024, 1, 10), end_date=datetime(2024, 1, 20, 12, 30)
+    )
+    assert end == datetime(2024, 1, 20, 12, 30)
+
+
+@pytest.mark.parametrize("kwargs", [
+    {"year": 2024, "month": 13},
+    {"year": 2024, "quarter": 5},
+    {"start_date": date(2024, 1, 1)},
+    {"start_date": date(2024, 2, 1), "end_date": date(2024, 1, 1)},
+    {"year": 9999},
+    {"year": 9999, "month": 12},
+    {"year": 0},
+    {"start_date": date(2024, 1, 1), "end_date": date(9999, 12, 31)},
+])
+def test_invalid_periods(kwargs):
+    with pytest.raises(ValueError):
+        get_period_range(**kwargs)
+
+
+def test_filter_does_not_wrap_the_column():
+    expenses = Table("expenses", MetaData(), Column("date", DateTime))
+    sql = str(
+        select(expenses.c.date)
+        .where(period_filter(expenses.c.date, year=2024, month=5))
+        .compile(dialect=sqlite.dialect())
+    )
+    assert "expenses.date >= ?" in sql
+    assert "expenses.date < ?" in sql
+    assert "strftime" not in sql.lower()
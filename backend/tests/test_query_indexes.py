@@ -0,0 +1,130 @@
+"""
+EXPLAIN-based checks that the hot per-user queries use the composite indexes
+added in migrations/versions/0002_query_indexes.py.
+
+The statements are captured from real requests, so the check follows the
+queries the routers actually emit. SQLite always runs; PostgreSQL runs when
+TEST_POSTGRES_URL points at a scratch database.
+"""
+
+import os
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+
+# Import the test configuration
+from test_config import get_auth_headers, setup_test_environment
+
+# Set up the test environment
+with setup_test_environment():
+    # Import the app with test settings
+    from app.main import app
+
+from app.models.budget import Budget
+from app.models.category import Category
+from app.models.expense import Expense
+from app.models.user import User
+
+BACKENDS = ["sqlite"]
+if os.environ.get("TEST_POSTGRES_URL"):
+    BACKENDS.append("postgresql")
+
+# Every test runs against each backend's engine fixture (see conftest.py)
+pytestmark = pytest.mark.parametrize("engine", BACKENDS, indirect=True)
+
+
+@pytest.fixture
+def captured(engine, session_factory, override_db):
+    db = session_factory()
+    user = User(email="plans@example.com", hashed_password="x", is_active=True)
+    db.add(user)
+    db.commit()
+    categories = [Category(name=f"Category {i}", user_id=user.id) for i in range(3)]
+    db.add_all(categories)
+    db.commit()
+    db.add_all([
+        Expense(
+            amount=10.0,
+            date=datetime(2024, 1, 1) + timedelta(hours=i * 7),
+            user_id=user.id,
+            category_id=categories[i % 3].id,
+        )
+        for i in range(300)
+    ])
+    db.add_all([
+        Budget(amount=100.0, year=2024, month=1, category_id=c.id, user_id=user.id)
+        for c in categories
+    ])
+    db.commit()
+    user_id = user.id
+    db.close()
+
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            statements.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", record)
+    client = TestClient(app)
+    headers = get_auth_headers(user_id)
+
+    def run(url):
+        del statements[:]
+        response = client.get(url, headers=headers)
+        assert response.status_code == 200
+        return list(statements)
+
+    yield run
+    event.remove(engine, "before_cursor_execute", record)
+
+
+def explain(engine, statement, parameters):
+    """
+    Return the query plan of a captured statement as one lower-cased string.
+    """
+    with engine.connect() as conn:
+        if engine.dialect.name == "sqlite":
+            rows = conn.exec_driver_sql("EXPLAIN QUERY PLAN " + statement, parameters)
+            return " | ".join(str(row[-1]) for row in rows).lower()
+        # Tiny test tables would otherwise always be sequentially scanned
+        conn.exec_driver_sql("SET enable_seqscan = off")
+        rows = conn.exec_driver_sql("EXPLAIN " + statement, parameters)
+        return " | ".join(row[0] for row in rows).lower()
+
+
+def plans_for(engine, statements, table):
+    return [explain(engine, s, p) for s, p in statements if f"from {table}" in s.lower()]
+
+
+def test_expense_list_uses_date_index(engine, captured):
+    plans = plans_for(engine, captured("/api/expenses/?limit=20"), "expenses")
+    assert plans
+    for plan in plans:
+        assert "ix_expenses_user_date_id" in plan
+        assert "temp b-tree for order by" not in plan
+
+
+def uses_rollup_key(plan):
+    # The composite primary key index of expense_rollups
+    return "autoindex_expense_rollups" in plan or "expense_rollups_pkey" in plan
+
+
+def test_monthly_summary_reads_rollups(engine, captured):
+    statements = captured("/api/expenses/summary/monthly?year=2024&month=1")
+    assert not plans_for(engine, statements, "expenses")
+    plans = plans_for(engine, statements, "categories")
+    assert plans
+    assert all(uses_rollup_key(plan) for plan in plans)
+
+
+def test_budget_stats_use_budget_index_and_rollups(engine, captured):
+    statements = captured("/api/budgets/stats?year=2024&month=1")
+    budget_plans = plans_for(engine, statements, "budgets")
+    rollup_plans = plans_for(engine, statements, "expense_rollups")
+    assert budget_plans and rollup_plans
+    assert not plans_for(engine, statements, "expenses")
+    assert all("ix_budgets_user_year_month_category" in plan for plan in budget_plans)
+    assert all(uses_rollup_key(plan) for plan in rollup_plans)
@@ -0,0 +1,74 @@
+import os
+import time
+from datetime import datetime
+
+import pytest
+
+# Import the test configuration
+from test_config import setup_test_environment
+
+# Set up the test environment
+with setup_test_environment():
+    from app.services.render import RenderService, RenderTimeoutError
+
+from app.services.export import DetailRows, ReportOwner
+from app.services.rollup import CategoryTotal
+
+OWNER = ReportOwner("render@example.com", "Render", "Test", "USD")
+DETAILS = DetailRows(
+    listed=[(datetime(2024, 3, day), "Food", f"Day {day}", 10.0, "USD") for day in range(1, 29)],
+    omitted={(2024, 2): [3, 30.0]},
+)
+SUMMARY = [CategoryTotal("Food", "#111111", 310.0)]
+
+
+@pytest.fixture(scope="module")
+def service():
+    # One worker process shared by the tests of this module
+    service = RenderService(max_workers=1, timeout_seconds=2)
+    yield service
+    service.shutdown()
+
+
+def test_renders_pdf_bytes_in_a_worker_process(service):
+    pdf = service.render_pdf(DETAILS, SUMMARY, 2024, 3, OWNER)
+    assert pdf.startswith(b"%PDF")
+    assert service.run(os.getpid) != os.getpid()
+
+
+def test_renders_pdf_to_a_file(service, tmp_path):
+    path = str(tmp_path / "report.pdf")
+    assert service.render_pdf(DETAILS, SUMMARY, 2024, None, OWNER, path) == path
+    with open(path, "rb") as file:
+        assert file.read(4) == b"%PDF"
+
+
+def test_jobs_are_interrupted_after_the_timeout(service):
+    started = time.perf_counter()
+    with pytest.raises(RenderTimeoutError):
+        service.run(time.sleep, 30)
+    assert time.perf_counter() - started < 10
+    assert service.timeouts == 1
+    # The worker is still usable
+    assert service.run(sum, [1, 2]) == 3
+
+
+def test_timeout_is_enforced_by_the_api_process_without_sigalrm(monkeypatch):
+    import app.services.render as render_module
+
+    monkeypatch.setattr(render_module, "HAS_ALARM", False)
+    service = RenderService(max_workers=1, timeout_seconds=1)
+    try:
+        with pytest.raises(RenderTimeoutError):
+            service.run(time.sleep, 3)
+        assert service.timeouts == 1
+        # A new pool takes over from the one with the stuck worker
+        assert service.run(sum, [1, 2]) == 3
+    finally:
+        service.shutdown()
+
+
+def test_without_workers_jobs_run_in_process():
+    service = RenderService(max_workers=0, timeout_seconds=1)
+    assert service.run(os.getpid) == os.getpid()
+    assert service.render_pdf(DETAILS, SUMMARY, 2024, 3, OWNER).startswith(b"%PDF")
@@ -0,0 +1,211 @@
+import os
+import time
+
+import pytest
+from datetime import datetime, timedelta
+from fastapi.testclient import TestClient
+
+# Import the test configuration
+from test_config import get_auth_headers, setup_test_environment
+
+# Set up the test environment
+with setup_test_environment():
+    # Import the app with test settings
+    from app.main import app
+
+from app.core.artifacts import ArtifactCache, artifact_cache
+from app.models.category import Category
+from app.models.expense import Expense
+from app.models.user import User
+import app.services.report_jobs as report_jobs_service
+
+
+def writer(data):
+    def produce(path):
+        with open(path, "wb") as file:
+            file.write(data)
+    return produce
+
+
+def test_identical_keys_are_served_from_disk(tmp_path):
+    cache = ArtifactCache(str(tmp_path), max_bytes=1000)
+    key = cache.make_key(1, 3, "csv", (2024, None, None))
+    assert key == cache.make_key(1, 3, "csv", (2024, None, None))
+    assert key.startswith("u1-") and key.endswith(".csv")
+    assert key != cache.make_key(1, 4, "csv", (2024, None, None))
+
+    first = cache.get_or_create(key, writer(b"report"))
+    assert not first.hit and not first.temporary
+    second = cache.get_or_create(key, lambda path: pytest.fail("rendered twice"))
+    assert second.hit and second.path == first.path
+    with open(second.path, "rb") as file:
+        assert file.read() == b"report"
+
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["stores"]) == (1, 1, 1)
+    assert stats["hit_rate"] == 0.5
+    assert stats["bytes"] == len(b"report")
+
+
+def test_least_recently_used_files_are_evicted(tmp_path):
+    cache = ArtifactCache(str(tmp_path), max_bytes=250)
+    keys = [cache.make_key(1, 1, "csv", (i,)) for i in range(3)]
+    cache.get_or_create(keys[0], writer(b"a" * 100))
+    cache.get_or_create(keys[1], writer(b"b" * 100))
+    assert cache.get(keys[0])
+    cache.get_or_create(keys[2], writer(b"c" * 100))
+
+    assert cache.get(keys[1]) is None
+    assert not os.path.exists(cache.path(keys[1]))
+    assert cache.get(keys[0]) and cache.get(keys[2])
+    assert cache.stats()["evictions"] == 1
+    assert cache.stats()["bytes"] == 200
+
+
+def test_files_larger_than_the_cache_are_not_kept(tmp_path):
+    cache = ArtifactCache(str(tmp_path), max_bytes=10)
+    artifact = cache.get_or_create(cache.make_key(1, 1, "pdf", ()), writer(b"x" * 11))
+    assert artifact.temporary and os.path.exists(artifact.path)
+    assert cache.stats()["entries"] == 0
+
+
+def test_invalidate_user_removes_only_their_files(tmp_path):
+    cache = ArtifactCache(str(tmp_path), max_bytes=1000)
+    mine = cache.get_or_create(cache.make_key(1, 1, "csv", ()), writer(b"mine")).path
+    theirs = cache.get_or_create(cache.make_key(12, 1, "csv", ()), writer(b"theirs")).path
+
+    assert cache.invalidate_user(1) == 1
+    assert not os.path.exists(mine) and os.path.exists(theirs)
+    assert cache.stats()["invalidations"] == 1
+
+
+def test_index_is_rebuilt_from_the_directory(tmp_path):
+    key = ArtifactCache.make_key(1, 1, "csv", ())
+    ArtifactCache(str(tmp_path), max_bytes=1000).get_or_create(key, writer(b"kept"))
+    (tmp_path / f"{key}.0123.part").write_bytes(b"unfinished")
+
+    restarted = ArtifactCache(str(tmp_path), max_bytes=1000)
+    assert restarted.get(key) == restarted.path(key)
+    assert restarted.stats()["entries"] == 1
+
+
+def test_workers_sharing_a_directory_see_each_others_files(tmp_path):
+    first = ArtifactCache(str(tmp_path), max_bytes=250)
+    second = ArtifactCache(str(tmp_path), max_bytes=250)
+    mine = first.make_key(1, 1, "csv", ())
+    first.get_or_create(mine, writer(b"a" * 100))
+
+    assert second.get_or_create(mine, lambda path: pytest.fail("rendered twice")).hit
+    # Eviction counts the other worker's files against the shared limit
+    second.get_or_create(second.make_key(2, 1, "csv", ()), writer(b"b" * 100))
+    second.get_or_create(second.make_key(3, 1, "csv", ()), writer(b"c" * 100))
+    assert first.stats()["bytes"] == 200
+    assert second.stats()["evictions"] == 1
+
+    assert first.invalidate_user(3) == 1
+    assert second.get(second.make_key(3, 1, "csv", ())) is None
+
+
+def test_tee_stores_only_complete_streams(tmp_path):
+    cache = ArtifactCache(str(tmp_path), max_bytes=1000)
+    key = cache.make_key(1, 1, "csv", ())
+
+    assert b"".join(cache.tee(key, [b"a", b"b"], lambda: False)) == b"ab"
+    assert cache.get(key) is None
+    stream = cache.tee(key, [b"a", b"b"])
+    next(stream)
+    stream.close()
+    assert cache.get(key) is None
+    assert os.listdir(tmp_path) == []
+
+    assert b"".join(cache.tee(key, [b"a", b"b"])) == b"ab"
+    with open(cache.get(key), "rb") as file:
+        assert file.read() == b"ab"
+
+
+def test_disabled_cache_produces_temporary_files(tmp_path):
+    cache = ArtifactCache(str(tmp_path / "cache"), max_bytes=0)
+    artifact = cache.get_or_create(cache.make_key(1, 1, "pdf", ()), writer(b"pdf"))
+    assert artifact.temporary
+    os.remove(artifact.path)
+    assert b"".join(cache.tee("key", [b"a"])) == b"a"
+    assert not os.path.exists(tmp_path / "cache")
+
+
+@pytest.fixture(scope="function")
+def env(tmp_path, monkeypatch, session_factory, override_db):
+    monkeypatch.setattr(report_jobs_service.settings, "REPORT_JOB_DIR", str(tmp_path / "reports"))
+
+    db = session_factory()
+    user = User(email="cache@example.com", hashed_password="x", is_active=True, preferred_currency="USD")
+    db.add(user)
+    db.commit()
+    food = Category(name="Food", user_id=user.id)
+    db.add(food)
+    db.commit()
+    db.add_all([
+        Expense(amount=2, description=f"Day {day}", date=datetime(2024, 1, 1) + timedelta(days=day),
+                user_id=user.id, category_id=food.id)
+        for day in range(15)
+    ])
+    db.commit()
+    ids = {"user_id": user.id, "food": food.id}
+    db.close()
+
+    yield {"client": TestClient(app), "headers": get_auth_headers(ids["user_id"]), **ids}
+
+
+def test_csv_report_is_cached_until_expenses_change(env):
+    client, headers = env["client"], env["headers"]
+    first = client.get("/api/reports/csv?year=2024", headers=headers)
+    second = client.get("/api/reports/csv?year=2024", headers=headers)
+    assert first.status_code == second.status_code == 200
+    assert second.content == first.content
+    assert second.headers["content-type"].startswith("text/csv")
+    assert artifact_cache.stats()["hits"] == 1
+
+    response = client.post("/api/expenses/", headers=headers, json={
+        "amount": 5, "description": "New", "date": "2024-02-01T10:00:00", "category_id": env["food"],
+    })
+    assert response.status_code in (200, 201), response.text
+    assert artifact_cache.stats()["invalidations"] == 1
+
+    third = client.get("/api/reports/csv?year=2024", headers=headers)
+    assert len(third.content.decode("utf-8").splitlines()) == 1 + 16
+    assert artifact_cache.stats()["misses"] == 2
+
+
+def test_pdf_report_is_rendered_once(env, monkeypatch):
+    renders = []
+    write_pdf_report = report_jobs_service.write_pdf_report
+
+    def counted(*args, **kwargs):
+        renders.append(args)
+        return write_pdf_report(*args, **kwargs)
+
+    monkeypatch.setattr(report_jobs_service, "write_pdf_report", counted)
+    client, headers = env["client"], env["headers"]
+    first = client.get("/api/reports/pdf?year=2024&month=1", headers=headers)
+    second = client.get("/api/reports/pdf?year=2024&month=1", headers=headers)
+    assert first.status_code == second.status_code == 200
+    assert second.content == first.content and first.content.startswith(b"%PDF")
+    assert len(renders) == 1
+    # A different period is a different artifact
+    client.get("/api/reports/pdf?year=2024&month=2", headers=headers)
+    assert len(renders) == 2
+
+
+def test_report_job_reuses_the_cached_report(env):
+    client, headers = env["client"], env["headers"]
+    cached = client.get("/api/reports/csv?year=2024", headers=headers).content
+
+    job = client.post("/api/reports/jobs", json={"format": "csv", "year": 2024}, headers=headers).json()
+    deadline = time.monotonic() + 20
+    while job["status"] not in ("succeeded", "failed") and time.monotonic() < deadline:
+        time.sleep(0.05)
+        job = client.get(f"/api/reports/jobs/{job['id']}", headers=headers).json()
+
+    assert job["status"] == "succeeded" and job["rows"] == 15
+    assert client.get(job["download_url"], headers=headers).content == cached
+    assert artifact_cache.stats()["hits"] == 1
+
@@ -0,0 +1,235 @@
+import os
+import time
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi.testclient import TestClient
+
+# Import the test configuration
+from test_config import get_auth_headers, setup_test_environment
+
+# Set up the test environment
+with setup_test_environment():
+    # Import the app with test settings
+    from app.main import app
+
+import app.services.report_jobs as report_jobs_service
+from app.models.category import Category
+from app.models.expense import Expense
+from app.models.report_job import ReportJob
+from app.models.user import User
+
+
+@pytest.fixture(scope="function")
+def env(tmp_path, monkeypatch, engine, session_factory, override_db):
+    monkeypatch.setattr(report_jobs_service.settings, "REPORT_JOB_DIR", str(tmp_path / "reports"))
+
+    db = session_factory()
+    user = User(
+        email="jobs@example.com", hashed_password="x", is_active=True, preferred_currency="USD"
+    )
+    other = User(email="other@example.com", hashed_password="x", is_active=True)
+    db.add_all([user, other])
+    db.commit()
+    food = Category(name="Food", user_id=user.id)
+    db.add(food)
+    db.commit()
+    # Several export batches in the test settings
+    db.add_all(
+        [
+            Expense(
+                amount=2,
+                description=f"Day {day}",
+                date=datetime(2024, 1, 1) + timedelta(days=day),
+                user_id=user.id,
+                category_id=food.id,
+            )
+            for day in range(45)
+        ]
+    )
+    db.commit()
+    ids = {"user_id": user.id, "other_id": other.id}
+    db.close()
+
+    yield {
+        "client": TestClient(app),
+        "headers": get_auth_headers(ids["user_id"]),
+        "engine": engine,
+        "session": session_factory,
+        **ids,
+    }
+
+
+def wait_for(env, job_id, timeout=20):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        job = env["client"].get(f"/api/reports/jobs/{job_id}", headers=env["headers"]).json()
+        if job["status"] in ("succeeded", "failed"):
+            return job
+        time.sleep(0.05)
+    raise AssertionError(f"Job {job_id} did not finish")
+
+
+def create(env, **body):
+    response = env["client"].post("/api/reports/jobs", json=body, headers=env["headers"])
+    assert response.status_code == 202, response.text
+    return response.json()
+
+
+def test_csv_job_runs_in_the_background_and_serves_the_file(env):
+    job = create(env, format="csv", year=2024)
+    assert job["status"] in ("queued", "running", "succeeded")
+    assert job["filename"] == "expense_report_2024.csv"
+
+    job = wait_for(env, job["id"])
+    assert job["status"] == "succeeded"
+    assert job["progress"] == 1 and job["rows"] == 45
+    assert job["download_url"] == f"/api/reports/jobs/{job['id']}/download"
+
+    response = env["client"].get(job["download_url"], headers=env["headers"])
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/csv")
+    assert "expense_report_2024.csv" in response.headers["content-disposition"]
+    lines = response.content.decode("utf-8").splitlines()
+    assert len(lines) == 46
+    assert lines[1].startswith("2024-02-14")
+
+
+def test_pdf_job(env):
+    job = wait_for(env, create(env, format="pdf", year=2024, month=1)["id"])
+    assert job["status"] == "succeeded"
+    assert job["rows"] == 31
+    response = env["client"].get(job["download_url"], headers=env["headers"])
+    assert response.headers["content-type"] == "application/pdf"
+    assert response.content.startswith(b"%PDF")
+
+
+def test_jobs_are_private(env):
+    job = wait_for(env, create(env, format="csv")["id"])
+    other = get_auth_headers(env["other_id"])
+    assert env["client"].get(f"/api/reports/jobs/{job['id']}", headers=other).status_code == 404
+    assert env["client"].get(job["download_url"], headers=other).status_code == 404
+
+
+def test_unfinished_job_cannot_be_downloaded(env):
+    db = env["session"]()
+    db.add(
+        ReportJob(
+            id="a" * 32,
+            user_id=env["user_id"],
+            format="csv",
+            status="queued",
+            progress=0,
+            rows=0,
+            filename="expense_report_all.csv",
+        )
+    )
+    db.commit()
+    db.close()
+    response = env["client"].get(f"/api/reports/jobs/{'a' * 32}/download", headers=env["headers"])
+    assert response.status_code == 409
+
+
+def test_interrupted_jobs_are_resumed(env):
+    db = env["session"]()
+    stale = datetime.utcnow() - timedelta(hours=1)
+    db.add(
+        ReportJob(
+            id="b" * 32,
+            user_id=env["user_id"],
+            format="csv",
+            year=2024,
+            month=2,
+            status="running",
+            progress=0.3,
+            rows=10,
+            filename="expense_report_2024_02.csv",
+            heartbeat_at=stale,
+        )
+    )
+    # Still being rendered by another live process
+    db.add(
+        ReportJob(
+            id="c" * 32,
+            user_id=env["user_id"],
+            format="csv",
+            year=2024,
+            month=2,
+            status="running",
+            progress=0.3,
+            rows=10,
+            filename="expense_report_2024_02.csv",
+            heartbeat_at=datetime.utcnow(),
+        )
+    )
+    db.commit()
+    db.close()
+    assert report_jobs_service.resume_report_jobs(env["engine"]) == 1
+    job = wait_for(env, "b" * 32)
+    assert job["status"] == "succeeded" and job["rows"] == 14
+    live = env["client"].get(f"/api/reports/jobs/{'c' * 32}", headers=env["headers"]).json()
+    assert live["status"] == "running" and live["rows"] == 10
+
+
+def test_a_job_runs_once_when_queued_twice(env, monkeypatch):
+    runs = []
+    write_csv_report = report_jobs_service.write_csv_report
+
+    def counted(*args, **kwargs):
+        runs.append(args)
+        return write_csv_report(*args, **kwargs)
+
+    monkeypatch.setattr(report_jobs_service, "write_csv_report", counted)
+    db = env["session"]()
+    db.add(
+        ReportJob(
+            id="d" * 32,
+            user_id=env["user_id"],
+            format="csv",
+            status="queued",
+            progress=0,
+            rows=0,
+            filename="expense_report_all.csv",
+        )
+    )
+    db.commit()
+    db.close()
+    report_jobs_service.run_report_job(env["engine"], "d" * 32)
+    report_jobs_service.run_report_job(env["engine"], "d" * 32)
+    assert len(runs) == 1
+
+
+def test_expired_jobs_are_purged(env):
+    job = wait_for(env, create(env, format="csv")["id"])
+    db = env["session"]()
+    stored = db.get(ReportJob, job["id"])
+    path = stored.file_path
+    assert os.path.exists(path)
+    stored.finished_at = datetime.utcnow() - timedelta(days=2)
+    db.commit()
+    assert report_jobs_service.purge_expired_jobs(db) == 1
+    db.close()
+    assert not os.path.exists(path)
+    assert (
+        env["client"].get(f"/api/reports/jobs/{job['id']}", headers=env["headers"]).status_code
+        == 404
+    )
+
+
+@pytest.mark.parametrize(
+    "body",
+    [
+        {"format": "pdf"},
+        {"format": "csv", "month": 13},
+    ],
+)
+def test_invalid_jobs_are_rejected(env, body):
+    response = env["client"].post("/api/reports/jobs", json=body, headers=env["headers"])
+    assert response.status_code == 400
+
+
+def test_unknown_format_is_rejected(env):
+    response = env["client"].post(
+        "/api/reports/jobs", json={"format": "xlsx"}, headers=env["headers"]
+    )
+    assert response.status_code == 422
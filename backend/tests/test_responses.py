@@ -0,0 +1,62 @@
+import json
+from datetime import datetime
+from decimal import Decimal
+
+import numpy as np
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import JSONResponse
+from fastapi.testclient import TestClient
+
+from app.core import responses
+from app.core.responses import ORJSONResponse, get_default_response_class
+
+
+def test_orjson_responses_encode_route_values():
+    app = FastAPI(default_response_class=get_default_response_class("orjson"))
+
+    @app.get("/values")
+    def values():
+        return {
+            "when": datetime(2024, 5, 1, 12, 30),
+            "amount": Decimal("12.50"),
+            "by_id": {1: "Food"},
+        }
+
+    assert TestClient(app).get("/values").json() == {
+        "when": "2024-05-01T12:30:00",
+        "amount": 12.5,
+        "by_id": {"1": "Food"},
+    }
+    assert json.loads(ORJSONResponse({"series": np.array([1.5, 2.0])}).body) == {
+        "series": [1.5, 2.0]
+    }
+
+
+def test_unknown_encoder_is_rejected():
+    with pytest.raises(ValueError):
+        get_default_response_class("yaml")
+
+
+def test_falls_back_without_orjson(monkeypatch):
+    monkeypatch.setattr(responses, "orjson", None)
+    assert get_default_response_class("orjson") is JSONResponse
+
+
+def test_routes_can_opt_out():
+    app = FastAPI(default_response_class=get_default_response_class("orjson"))
+
+    @app.get("/fast")
+    def fast():
+        return {"ok": True}
+
+    @app.get("/plain", response_class=JSONResponse)
+    def plain():
+        return {"ok": True}
+
+    routes = {route.path: route for route in app.routes}
+    assert routes["/fast"].response_class is ORJSONResponse
+    assert routes["/plain"].response_class is JSONResponse
+
+    client = TestClient(app)
+    assert client.get("/fast").json() == client.get("/plain").json() == {"ok": True}
@@ -0,0 +1,315 @@
+import os
+from datetime import datetime
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+# Import the test configuration
+from test_config import get_auth_headers, setup_test_environment
+
+# Set up the test environment
+with setup_test_environment():
+    # Import the app with test settings
+    from app.main import app
+
+from app.models.category import Category
+from app.models.expense import Expense
+from app.models.expense_rollup import ExpenseRollup
+from app.models.user import User
+from app.services.rollup import (
+    CategoryTotal,
+    MonthTotal,
+    grouped_deltas,
+    period_breakdown,
+    rebuild_rollups,
+)
+
+BACKENDS = ["sqlite"]
+if os.environ.get("TEST_POSTGRES_URL"):
+    BACKENDS.append("postgresql")
+
+
+@pytest.fixture(scope="function")
+def env(engine, session_factory, override_db):
+    db = session_factory()
+    user = User(email="rollups@example.com", hashed_password="x", is_active=True)
+    db.add(user)
+    db.commit()
+    food = Category(name="Food", color="#111111", user_id=user.id)
+    travel = Category(name="Travel", color="#222222", user_id=user.id)
+    db.add_all([food, travel])
+    db.commit()
+    db.add_all(
+        [
+            Expense(amount=10, date=datetime(2024, 1, 5), user_id=user.id, category_id=food.id),
+            Expense(
+                amount=20, date=datetime(2024, 1, 31, 23, 59), user_id=user.id, category_id=food.id
+            ),
+            Expense(amount=30, date=datetime(2024, 2, 1), user_id=user.id, category_id=travel.id),
+            Expense(
+                amount=40,
+                date=datetime(2024, 2, 2),
+                currency="EUR",
+                user_id=user.id,
+                category_id=travel.id,
+            ),
+        ]
+    )
+    db.commit()
+    ids = {"user_id": user.id, "food": food.id, "travel": travel.id}
+    db.close()
+
+    yield {
+        "client": TestClient(app),
+        "headers": get_auth_headers(ids["user_id"]),
+        "session": session_factory,
+        "engine": engine,
+        **ids,
+    }
+
+
+def stored(env):
+    db = env["session"]()
+    try:
+        return sorted(
+            ((r.user_id, r.year, r.month, r.category_id, r.currency), round(r.total, 6), r.count)
+            for r in db.query(ExpenseRollup)
+        )
+    finally:
+        db.close()
+
+
+def expected(env):
+    db = env["session"]()
+    try:
+        return sorted(
+            (key, round(total, 6), count) for key, total, count in grouped_deltas(db, [], sign=1)
+        )
+    finally:
+        db.close()
+
+
+def test_orm_writes_keep_rollups_in_sync(env):
+    assert stored(env) == expected(env)
+    assert len(stored(env)) == 3
+
+    client, headers = env["client"], env["headers"]
+    created = client.post(
+        "/api/expenses/",
+        json={"amount": 5, "date": "2024-03-01T00:00:00", "category_id": env["food"]},
+        headers=headers,
+    ).json()
+    assert stored(env) == expected(env)
+
+    client.put(
+        f"/api/expenses/{created['id']}",
+        json={"amount": 7, "date": "2024-01-15T00:00:00", "category_id": env["travel"]},
+        headers=headers,
+    )
+    assert stored(env) == expected(env)
+
+    client.delete(f"/api/expenses/{created['id']}", headers=headers)
+    assert stored(env) == expected(env)
+    assert len(stored(env)) == 3
+
+
+def test_bulk_writes_keep_rollups_in_sync(env):
+    client, headers = env["client"], env["headers"]
+    client.post(
+        "/api/expenses/bulk",
+        json={
+            "items": [
+                {
+                    "amount": i + 1,
+                    "date": f"2024-0{i % 3 + 1}-10T00:00:00",
+                    "category_id": env["food"] if i % 2 else env["travel"],
+                }
+                for i in range(9)
+            ]
+        },
+        headers=headers,
+    )
+    assert stored(env) == expected(env)
+
+    client.patch(
+        "/api/expenses/bulk",
+        json={"category_id": env["food"], "changes": {"category_id": env["travel"]}},
+        headers=headers,
+    )
+    assert stored(env) == expected(env)
+
+    client.patch(
+        "/api/expenses/bulk",
+        json={"min_amount": 5, "changes": {"amount": 3, "date": "2024-06-01T00:00:00"}},
+        headers=headers,
+    )
+    assert stored(env) == expected(env)
+
+    client.request("DELETE", "/api/expenses/bulk", json={"max_amount": 4}, headers=headers)
+    assert stored(env) == expected(env)
+
+
+def test_summaries_match_raw_expenses(env):
+    client, headers = env["client"], env["headers"]
+    monthly = client.get(
+        "/api/expenses/summary/monthly", params={"year": 2024, "month": 1}, headers=headers
+    ).json()
+    assert monthly["total_amount"] == 30
+    assert monthly["categories"] == [
+        {"name": "Food", "color": "#111111", "amount": 30, "percentage": 100.0}
+    ]
+
+    annual = client.get(
+        "/api/reports/summary/annual", params={"year": 2024}, headers=headers
+    ).json()
+    assert annual["total_amount"] == 100
+    assert [(m["month"], m["amount"]) for m in annual["monthly_data"]] == [(1, 30), (2, 70)]
+    assert sorted((c["name"], c["amount"]) for c in annual["category_data"]) == [
+        ("Food", 30),
+        ("Travel", 70),
+    ]
+
+    client.post(
+        "/api/budgets",
+        json={
+            "amount": 100,
+            "year": 2024,
+            "month": 2,
+            "period": "monthly",
+            "category_id": env["travel"],
+        },
+        headers=headers,
+    )
+    stats = client.get(
+        "/api/budgets/stats", params={"year": 2024, "month": 2}, headers=headers
+    ).json()
+    assert [(s["category_name"], s["spent_amount"]) for s in stats] == [("Travel", 70)]
+
+
+def test_invalid_month_is_rejected(env):
+    response = env["client"].get(
+        "/api/expenses/summary/monthly", params={"year": 2024, "month": 13}, headers=env["headers"]
+    )
+    assert response.status_code == 400
+
+
+def test_rebuild_repairs_drift(env):
+    with env["engine"].begin() as conn:
+        conn.execute(ExpenseRollup.__table__.delete())
+    assert stored(env) == []
+    rebuild_rollups(env["engine"])
+    assert stored(env) == expected(env)
+
+    with env["engine"].begin() as conn:
+        conn.execute(ExpenseRollup.__table__.update().values(total=0))
+    rebuild_rollups(env["engine"], user_id=env["user_id"])
+    assert stored(env) == expected(env)
+
+
+def test_deleting_a_user_drops_their_rollups(env):
+    db = env["session"]()
+    try:
+        db.delete(db.get(User, env["user_id"]))
+        db.commit()
+    finally:
+        db.close()
+    assert expected(env) == []
+    assert stored(env) == []
+
+
+def test_deleting_a_category_drops_its_rollups_with_foreign_keys_enforced(env):
+    engine = env["engine"]
+    engine.dispose()
+    event.listen(
+        engine, "connect", lambda connection, record: connection.execute("PRAGMA foreign_keys=ON")
+    )
+    db = env["session"]()
+    try:
+        db.delete(db.get(Category, env["food"]))
+        db.commit()
+    finally:
+        db.close()
+    assert stored(env) == expected(env)
+    assert {key[3] for key, _, _ in stored(env)} == {env["travel"]}
+
+
+@pytest.fixture
+def breakdown_db(session_factory):
+    db = session_factory()
+    user = User(email="breakdown@example.com", hashed_password="x", is_active=True)
+    db.add(user)
+    db.commit()
+    food = Category(name="Food", color="#111111", user_id=user.id)
+    travel = Category(name="Travel", color="#222222", user_id=user.id)
+    db.add_all([food, travel])
+    db.commit()
+    db.add_all(
+        [
+            Expense(
+                amount=amount,
+                date=datetime(2024, month, 10),
+                user_id=user.id,
+                category_id=category.id,
+            )
+            for amount, month, category in [
+                (10, 1, food),
+                (20, 1, travel),
+                (5, 1, food),
+                (40, 3, travel),
+                (7, 3, food),
+                (100, 5, food),
+            ]
+        ]
+    )
+    db.add(Expense(amount=1000, date=datetime(2023, 3, 1), user_id=user.id, category_id=food.id))
+    db.commit()
+    yield db, user.id, food.id
+    db.close()
+
+
+@pytest.mark.parametrize("engine", BACKENDS, indirect=True)
+def test_period_breakdown_derives_all_totals_from_one_query(breakdown_db):
+    db, user_id, food_id = breakdown_db
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(Engine, "before_cursor_execute", record)
+    try:
+        breakdown = period_breakdown(db, user_id, 2024)
+    finally:
+        event.remove(Engine, "before_cursor_execute", record)
+
+    assert len(statements) == 1
+    food, travel = ("Food", "#111111"), ("Travel", "#222222")
+    assert breakdown.cells == {
+        (1, food): 15,
+        (1, travel): 20,
+        (3, food): 7,
+        (3, travel): 40,
+        (5, food): 100,
+    }
+    assert breakdown.by_month == [MonthTotal(1, 35), MonthTotal(3, 47), MonthTotal(5, 100)]
+    assert breakdown.by_category == [
+        CategoryTotal("Food", "#111111", 122),
+        CategoryTotal("Travel", "#222222", 60),
+    ]
+    assert breakdown.total == 182
+
+
+@pytest.mark.parametrize("engine", BACKENDS, indirect=True)
+def test_period_breakdown_filters(breakdown_db):
+    db, user_id, food_id = breakdown_db
+    march = period_breakdown(db, user_id, 2024, month=3)
+    assert march.by_month == [MonthTotal(3, 47)]
+    assert march.total == 47
+
+    food_only = period_breakdown(db, user_id, 2024, category_id=food_id)
+    assert [c.name for c in food_only.by_category] == ["Food"]
+    assert food_only.total == 122
+
+    empty = period_breakdown(db, user_id, 2022)
+    assert (empty.cells, empty.by_month, empty.by_category, empty.total) == ({}, [], [], 0)
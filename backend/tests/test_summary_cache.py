@@ -0,0 +1,321 @@
+import logging
+
+import pytest
+import threading
+import time
+from datetime import datetime
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+# Import the test configuration
+from test_config import get_auth_headers, setup_test_environment
+
+# Set up the test environment
+with setup_test_environment():
+    # Import the app with test settings
+    from app.main import app
+
+import app.core.cache as cache_module
+from app.core.cache import (
+    LRUCache,
+    MemoryBackend,
+    RedisBackend,
+    SummaryCache,
+    create_backend,
+    get_serializer,
+    make_key,
+    summary_cache,
+)
+from app.models.budget import Budget
+from app.models.category import Category
+from app.models.expense import Expense
+from app.models.user import User
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(cache_module.time, "monotonic", fake)
+    return fake
+
+
+def test_lru_evicts_least_recently_used_entry():
+    cache = LRUCache(max_entries=2, max_bytes=1000, ttl_seconds=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == (True, 1)
+    cache.set("c", 3)
+    assert cache.get("b") == (False, None)
+    assert cache.get("a") == (True, 1)
+    assert cache.get("c") == (True, 3)
+    assert cache.stats()["evictions"] == 1
+
+
+def test_lru_respects_byte_limit():
+    cache = LRUCache(max_entries=100, max_bytes=10, ttl_seconds=60)
+    cache.set("a", "x" * 4)  # 6 bytes as JSON
+    cache.set("b", "y" * 2)  # 4 bytes
+    assert cache.stats()["bytes"] == 10
+    cache.set("c", "z")
+    assert cache.get("a") == (False, None)
+    assert cache.stats()["bytes"] == 7
+    # Larger than the whole cache: not stored, nothing evicted
+    cache.set("d", "w" * 20)
+    assert cache.get("d") == (False, None)
+    assert cache.get("b") == (True, "yy")
+
+
+def test_lru_expires_entries(clock):
+    cache = LRUCache(max_entries=10, max_bytes=1000, ttl_seconds=5)
+    cache.set("a", 1)
+    clock.now += 4
+    assert cache.get("a") == (True, 1)
+    clock.now += 2
+    assert cache.get("a") == (False, None)
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["expirations"], stats["entries"]) == (1, 1, 1, 0)
+
+
+def test_disabled_cache_stores_nothing():
+    cache = LRUCache(max_entries=0, max_bytes=1000, ttl_seconds=60)
+    cache.set("a", 1)
+    assert cache.get("a") == (False, None)
+    assert cache.stats()["enabled"] is False
+
+
+def test_keys_are_namespaced_by_user_and_version():
+    assert make_key(3, 7, "budgets.stats", (2024, 1, None)) == "u3:v7:budgets.stats:(2024, 1, None)"
+
+
+@pytest.mark.parametrize("name", ["json", "msgpack"])
+def test_serializer_round_trip(name):
+    used, dumps, loads = get_serializer(name)
+    assert used == name
+    value = {"year": 2024, "categories": [{"name": "Food", "amount": 1.5}], "month": None,
+             "created_at": datetime(2024, 1, 2, 3, 4, 5)}
+    data = dumps(value)
+    assert isinstance(data, bytes)
+    assert loads(data) == {**value, "created_at": "2024-01-02T03:04:05"}
+
+
+def test_concurrent_misses_compute_once():
+    cache = SummaryCache(MemoryBackend(10, 10000, 60), lock_timeout=2, poll_interval=0.005)
+    calls = []
+    started = threading.Barrier(5)
+
+    def compute():
+        calls.append(1)
+        time.sleep(0.1)
+        return {"total": 42}
+
+    results = []
+
+    def worker():
+        started.wait()
+        results.append(cache.get_or_compute("u1:v0:summary:()", compute))
+
+    threads = [threading.Thread(target=worker) for _ in range(5)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 1
+    assert results == [{"total": 42}] * 5
+    stats = cache.stats()
+    assert stats["misses"] == 5
+    assert stats["waits"] == 4
+
+
+def test_waiters_compute_themselves_after_lock_timeout():
+    backend = MemoryBackend(10, 10000, 60)
+    cache = SummaryCache(backend, lock_timeout=0.05, poll_interval=0.01)
+    # A lock left behind by a crashed worker
+    assert backend.acquire("lock:u1:v0:summary:()", 0.05)
+    assert cache.get_or_compute("u1:v0:summary:()", lambda: 1) == 1
+    assert cache.stats()["lock_timeouts"] == 1
+
+
+class BrokenRedis:
+    def __getattr__(self, name):
+        def fail(*args, **kwargs):
+            raise ConnectionError("connection refused")
+        return fail
+
+
+def test_redis_backend_requires_the_redis_package(monkeypatch):
+    monkeypatch.setattr(cache_module.settings, "SUMMARY_CACHE_BACKEND", "redis")
+    monkeypatch.setattr(cache_module, "redis", None)
+    with pytest.raises(RuntimeError, match="redis package"):
+        create_backend()
+
+
+def test_unreachable_redis_is_logged(monkeypatch, caplog):
+    monkeypatch.setattr(cache_module.settings, "SUMMARY_CACHE_BACKEND", "redis")
+    monkeypatch.setattr(cache_module.settings, "SUMMARY_CACHE_REDIS_URL", "redis://127.0.0.1:1/0")
+    with caplog.at_level(logging.WARNING, logger="app.core.cache"):
+        backend = create_backend()
+    assert isinstance(backend, RedisBackend)
+    assert "unreachable" in caplog.text
+
+
+def test_missing_msgpack_is_logged(monkeypatch, caplog):
+    monkeypatch.setattr(cache_module, "msgpack", None)
+    with caplog.at_level(logging.WARNING, logger="app.core.cache"):
+        used, _, _ = get_serializer("msgpack")
+    assert used == "json"
+    assert "msgpack is not installed" in caplog.text
+
+
+def test_unreachable_redis_behaves_like_an_empty_cache():
+    backend = RedisBackend(BrokenRedis(), ttl_seconds=60, serializer="json")
+    cache = SummaryCache(backend, lock_timeout=1)
+    assert cache.get_or_compute("u1:v0:summary:()", lambda: {"total": 1}) == {"total": 1}
+    assert cache.get_or_compute("u1:v0:summary:()", lambda: {"total": 2}) == {"total": 2}
+    assert backend.errors > 0
+
+
+def test_redis_backend_is_shared_between_workers():
+    import fakeredis
+    server = fakeredis.FakeServer()
+    first = SummaryCache(RedisBackend(fakeredis.FakeRedis(server=server), 60), lock_timeout=1)
+    second = SummaryCache(RedisBackend(fakeredis.FakeRedis(server=server), 60), lock_timeout=1)
+
+    value = {"year": 2024, "total_amount": 10.0, "categories": [{"name": "Food", "amount": 10.0}]}
+    assert first.get_or_compute("u1:v0:summary:(2024,)", lambda: value) == value
+    assert second.get_or_compute("u1:v0:summary:(2024,)", lambda: pytest.fail("not shared")) == value
+    # A new data version is a new namespace
+    assert second.get_or_compute("u1:v1:summary:(2024,)", lambda: {"total_amount": 0}) == {"total_amount": 0}
+
+    lock = first.backend.acquire("lock:k", 1)
+    assert lock and second.backend.acquire("lock:k", 1) is None
+    first.backend.release("lock:k", lock)
+    assert second.backend.acquire("lock:k", 1)
+
+
+def test_undecodable_redis_values_are_misses():
+    import fakeredis
+    client = fakeredis.FakeRedis()
+    backend = RedisBackend(client, 60, serializer="json")
+    client.set(cache_module.KEY_PREFIX + "u1:v0:summary", b"\xc1 not json")
+
+    cache = SummaryCache(backend, lock_timeout=1)
+    assert cache.get_or_compute("u1:v0:summary", lambda: {"total_amount": 1}) == {"total_amount": 1}
+    assert backend.errors == 1
+    # The unreadable value was replaced
+    assert backend.get("u1:v0:summary") == (True, {"total_amount": 1})
+
+
+@pytest.fixture(scope="function")
+def env(session_factory, override_db):
+    db = session_factory()
+    user = User(email="cache@example.com", hashed_password="x", is_active=True)
+    admin = User(email="cache-admin@example.com", hashed_password="x", is_active=True, is_admin=True)
+    db.add_all([user, admin])
+    db.commit()
+    food = Category(name="Food", color="#111111", user_id=user.id)
+    db.add(food)
+    db.commit()
+    db.add(Expense(amount=10, date=datetime(2024, 1, 5), user_id=user.id, category_id=food.id))
+    db.add(Budget(amount=100, year=2024, month=1, category_id=food.id, user_id=user.id))
+    db.commit()
+    ids = {"user_id": user.id, "admin_id": admin.id, "food": food.id}
+    db.close()
+
+    yield {"client": TestClient(app), "headers": get_auth_headers(ids["user_id"]), **ids}
+
+
+def rollup_queries(env, url):
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if "expense_rollups" in statement.lower():
+            statements.append(statement)
+
+    event.listen(Engine, "before_cursor_execute", record)
+    try:
+        response = env["client"].get(url, headers=env["headers"])
+    finally:
+        event.remove(Engine, "before_cursor_execute", record)
+    assert response.status_code == 200
+    return response.json(), len(statements)
+
+
+@pytest.mark.parametrize("url", [
+    "/api/expenses/summary/monthly?year=2024&month=1",
+    "/api/reports/summary/annual?year=2024",
+    "/api/budgets/stats?year=2024&month=1",
+    "/api/budgets/overview/current",
+])
+def test_repeated_reads_are_served_from_cache(env, url):
+    first, first_queries = rollup_queries(env, url)
+    second, second_queries = rollup_queries(env, url)
+    assert first == second
+    assert first_queries >= 1
+    assert second_queries == 0
+    assert summary_cache.stats()["hits"] == 1
+
+
+def test_expense_write_invalidates_summaries(env):
+    client, headers = env["client"], env["headers"]
+    url = "/api/expenses/summary/monthly?year=2024&month=1"
+    assert client.get(url, headers=headers).json()["total_amount"] == 10
+    assert rollup_queries(env, "/api/budgets/stats?year=2024&month=1")[0][0]["spent_amount"] == 10
+
+    client.post(
+        "/api/expenses/",
+        json={"amount": 5, "date": "2024-01-20T00:00:00", "category_id": env["food"]},
+        headers=headers,
+    )
+    assert summary_cache.stats()["entries"] == 0
+    assert client.get(url, headers=headers).json()["total_amount"] == 15
+    assert rollup_queries(env, "/api/budgets/stats?year=2024&month=1")[0][0]["spent_amount"] == 15
+
+
+def test_category_and_budget_writes_invalidate_summaries(env):
+    client, headers = env["client"], env["headers"]
+    url = "/api/budgets/stats?year=2024&month=1"
+    assert client.get(url, headers=headers).json()[0]["category_name"] == "Food"
+
+    client.put(f"/api/categories/{env['food']}", json={"name": "Groceries"}, headers=headers)
+    assert client.get(url, headers=headers).json()[0]["category_name"] == "Groceries"
+
+    budget_id = client.get(url, headers=headers).json()[0]["id"]
+    client.put(f"/api/budgets/{budget_id}", json={"amount": 200}, headers=headers)
+    assert client.get(url, headers=headers).json()[0]["amount"] == 200
+
+
+def test_category_list_is_cached_until_a_category_write(env):
+    client, headers = env["client"], env["headers"]
+    first, _ = rollup_queries(env, "/api/categories/")
+    assert [c["name"] for c in first] == ["Food"]
+    assert client.get("/api/categories/", headers=headers).json() == first
+    assert summary_cache.stats()["hits"] == 1
+
+    client.post("/api/categories/", json={"name": "Travel"}, headers=headers)
+    listed = client.get("/api/categories/", headers=headers).json()
+    assert [c["name"] for c in listed] == ["Food", "Travel"]
+
+
+def test_cache_stats_endpoint_is_admin_only(env):
+    client = env["client"]
+    client.get("/api/expenses/summary/monthly?year=2024", headers=env["headers"])
+
+    assert client.get("/api/debug/cache", headers=env["headers"]).status_code == 403
+    response = client.get("/api/debug/cache", headers=get_auth_headers(env["admin_id"]))
+    assert response.status_code == 200
+    stats = response.json()
+    assert stats["misses"] == 1
+    assert stats["entries"] == 1
+    assert stats["backend"] == "memory"
+    assert {"hits", "waits", "evictions", "max_entries", "max_bytes", "ttl_seconds"} <= set(stats)
+    assert {"hits", "misses", "hit_rate", "evictions", "bytes"} <= set(stats["artifacts"])